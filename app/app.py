@@ -1,12 +1,14 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, request, jsonify, render_template, send_file
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager, jwt_required, create_access_token, get_jwt_identity
 from flask_cors import CORS
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime, timedelta
+import click
 import logging
 import os
 import sys
+import time
 
 # Adicionar o diretório atual ao path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -14,7 +16,13 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 # Importar módulos locais
 from database.config import DatabaseConfig, db, create_tables
 from models import User, StudySession, Question, Progress
-from .services import get_ai_response, get_ai_service_status, EducationalMLPipeline
+from .services import get_ai_response, get_ai_service_status
+from .services import get_model_server, PredictionError, FeatureStore
+from .services import get_chart_renderer, CHART_FORMATS, RegistryError
+from .services import keyset_page, parse_fields, parse_limit, PaginationError
+from .services import get_dashboard_cache
+from .services import QuestionImporter, QuestionImportError, detect_format
+from .services import read_only, mark_user_write
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
@@ -22,6 +30,7 @@ logger = logging.getLogger(__name__)
 
 def create_app():
     """Factory function para criar a aplicação Flask."""
+    start_time = time.perf_counter()
     app = Flask(__name__)
     
     # Configurações
@@ -41,13 +50,159 @@ def create_app():
     # Registrar blueprints/rotas
     register_routes(app)
     
+    # Registrar comandos de linha de comando (flask ...)
+    register_commands(app)
+    
     # Criar tabelas do banco de dados
     with app.app_context():
         create_tables(app)
-        logger.info("Aplicação Flask inicializada com sucesso!")
+        logger.info(f"Aplicação Flask inicializada com sucesso em {time.perf_counter() - start_time:.3f}s!")
     
     return app
 
+def register_commands(app):
+    """Registra os comandos da CLI do Flask."""
+    
+    @app.cli.command('train-model')
+    @click.option('--model-dir', default=lambda: os.environ.get('MODEL_DIR', 'trained_models'))
+    @click.option('--tune', is_flag=True, help='Ajusta os hiperparâmetros antes do treinamento')
+    @click.option('--promote/--no-promote', default=True, help='Promove a nova versão para produção')
+    @click.option('--rebuild', is_flag=True, help='Reconstrói o feature store antes do treinamento')
+    def train_model(model_dir, tune, promote, rebuild):
+        """Treina os modelos com o feature store e registra uma nova versão."""
+        from .services import train_from_feature_store
+        
+        if rebuild:
+            FeatureStore().rebuild()
+        try:
+            _, version = train_from_feature_store(model_dir, tune=tune, promote=promote)
+        except ValueError as e:
+            raise click.ClickException(str(e))
+        click.echo(f"Versão {version} registrada{' e promovida' if promote else ''} em {model_dir}")
+    
+    @app.cli.command('score-students')
+    @click.option('--model-dir', default=lambda: os.environ.get('MODEL_DIR', 'trained_models'))
+    @click.option('--version', default=None, help='Versão do modelo (padrão: versão promovida)')
+    @click.option('--compiled/--no-compiled', default=False, help='Usa o modelo compilado (sem scikit-learn)')
+    @click.option('--chunk-size', default=5000, show_default=True)
+    @click.option('--workers', type=int, default=None, help='Processos do pool (padrão: número de CPUs)')
+    @click.option('--batch-id', default=None, help='Identificador da execução a criar ou retomar')
+    def score_students(model_dir, version, compiled, chunk_size, workers, batch_id):
+        """Calcula as predições de performance de todos os estudantes (job noturno)."""
+        from .services import BulkScoringJob
+        
+        try:
+            job = BulkScoringJob(model_dir, version=version, compiled=compiled, chunk_size=chunk_size,
+                                 n_workers=workers, batch_id=batch_id)
+            result = job.run()
+        except (PredictionError, RegistryError) as e:
+            raise click.ClickException(str(e))
+        click.echo(f"{result['scored']} estudantes pontuados com a versão {result['version']} "
+                   f"({result['batch_id']}) em {result['seconds']}s; "
+                   f"{result['insufficient_data']} sem sessões finalizadas")
+    
+    @app.cli.command('db-migrate')
+    @click.option('--status', is_flag=True, help='Apenas lista as migrações aplicadas e pendentes')
+    @click.option('--target', default=None, help='Última versão a aplicar (padrão: todas)')
+    def db_migrate(status, target):
+        """Aplica as migrações pendentes do schema."""
+        from database.migrations import run_migrations, migration_status
+        
+        if not status:
+            applied = run_migrations(db.engine, target=target)
+            click.echo(f"{len(applied)} migrações aplicadas")
+        for migration in migration_status(db.engine):
+            state = migration['applied_at'] or 'pendente'
+            click.echo(f"{migration['version']}  {state:<26}  {migration['description']}")
+    
+    @app.cli.command('advise-queries')
+    @click.option('--user-id', type=int, required=True, help='Usuário usado nas chamadas')
+    @click.option('--path', 'paths', multiple=True,
+                  default=['/api/sessions', '/api/progress', '/api/dashboard'], show_default=True)
+    def advise_queries(user_id, paths):
+        """Aponta leituras completas de tabelas no SQL dos endpoints (ferramenta de desenvolvimento)."""
+        from .services import advise_endpoints
+        
+        get_dashboard_cache().clear()
+        findings = advise_endpoints(app, db.engine, paths, user_id)
+        for finding in findings:
+            click.echo(f"[{finding['label']}] full scan em {', '.join(finding['tables'])}: {finding['statement']}")
+        click.echo(f"{len(findings)} consultas com leitura completa de tabela")
+    
+    @app.cli.command('import-questions')
+    @click.argument('path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--session-id', type=int, required=True, help='Sessão que receberá as perguntas')
+    @click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']), default=None,
+                  help='Formato do arquivo (padrão: pela extensão)')
+    @click.option('--batch-size', default=1000, show_default=True)
+    def import_questions(path, session_id, fmt, batch_size):
+        """Importa um banco de perguntas (CSV ou JSONL) em streaming."""
+        fmt = fmt or detect_format(path)
+        if not fmt:
+            raise click.UsageError('Não foi possível detectar o formato; use --format')
+        
+        session = db.session.get(StudySession, session_id)
+        try:
+            with open(path, 'rb') as f:
+                stats = QuestionImporter(session_id, batch_size=batch_size).run(f, fmt)
+        except QuestionImportError as e:
+            raise click.ClickException(str(e))
+        finally:
+            if session:
+                get_dashboard_cache().invalidate(session.user_id)
+        
+        for reject in stats['rejects']:
+            click.echo(f"linha {reject['line']}: {reject['error']}", err=True)
+        click.echo(f"{stats['read']} linhas lidas, {stats['inserted']} inseridas ({stats['answered']} respondidas), "
+                   f"{stats['duplicates']} duplicadas, "
+                   f"{stats['rejected']} rejeitadas em {stats['seconds']}s ({stats['rows_per_second']} linhas/s)")
+    
+    @app.cli.command('reconcile-sessions')
+    @click.option('--dry-run', is_flag=True, help='Apenas relata as divergências, sem corrigir')
+    @click.option('--batch-size', default=1000, show_default=True)
+    def reconcile_sessions(dry_run, batch_size):
+        """Confere os contadores e scores das sessões com as perguntas gravadas (job periódico)."""
+        from .services import reconcile_session_counters
+        
+        result = reconcile_session_counters(fix=not dry_run, batch_size=batch_size)
+        click.echo(f"{result['checked']} sessões conferidas, {result['mismatched']} divergentes, "
+                   f"{result['fixed']} corrigidas")
+
+# Máximo de tópicos por chamada de /api/progress/bulk
+MAX_BULK_PROGRESS = 500
+
+def validate_progress_item(item):
+    """
+    Valida um par tópico/score enviado pelo cliente.
+    
+    Returns:
+        Mensagem de erro, ou None se o item for válido
+    """
+    if not isinstance(item, dict):
+        return 'item deve ser um objeto com topic e score'
+    topic = item.get('topic')
+    if not isinstance(topic, str) or not topic.strip():
+        return 'topic é obrigatório'
+    if len(topic) > 100:
+        return 'topic deve ter no máximo 100 caracteres'
+    score = item.get('score')
+    if isinstance(score, bool) or not isinstance(score, int):
+        return 'score deve ser um número inteiro'
+    return None
+
+# Máximo de perguntas por chamada de /api/sessions/<id>/questions/bulk
+MAX_BULK_QUESTIONS = 500
+
+def user_data_changed(user_id):
+    """
+    Chamado após o commit de uma escrita do usuário.
+    
+    Descarta o dashboard em cache e faz as próximas leituras do usuário
+    irem ao primário enquanto a réplica pode estar atrasada.
+    """
+    get_dashboard_cache().invalidate(user_id)
+    mark_user_write(user_id)
+
 def register_routes(app):
     """Registra todas as rotas da aplicação."""
     
@@ -129,16 +284,27 @@ def register_routes(app):
     # Rotas de sessões de estudo
     @app.route('/api/sessions', methods=['GET'])
     @jwt_required()
+    @read_only
     def get_sessions():
-        """Obter sessões de estudo do usuário."""
+        """Obter sessões de estudo do usuário (paginação por cursor, mais recentes primeiro)."""
         try:
             user_id = get_jwt_identity()
-            sessions = StudySession.query.filter_by(user_id=user_id).order_by(StudySession.start_time.desc()).all()
+            page = keyset_page(
+                StudySession,
+                where=[StudySession.user_id == user_id],
+                order_by=['start_time', 'id'],
+                fields=parse_fields(request.args.get('fields'), StudySession.LIST_FIELDS),
+                cursor=request.args.get('cursor'),
+                limit=parse_limit(request.args.get('limit'))
+            )
             
             return jsonify({
-                'sessions': [session.to_dict() for session in sessions]
+                'sessions': page['items'],
+                'next_cursor': page['next_cursor']
             }), 200
             
+        except PaginationError as e:
+            return jsonify({'error': str(e)}), 400
         except Exception as e:
             logger.error(f"Erro ao obter sessões: {e}")
             return jsonify({'error': 'Erro interno do servidor'}), 500
@@ -153,6 +319,7 @@ def register_routes(app):
             session = StudySession(user_id=user_id)
             db.session.add(session)
             db.session.commit()
+            user_data_changed(user_id)
             
             logger.info(f"Nova sessão criada para usuário {user_id}")
             
@@ -177,9 +344,13 @@ def register_routes(app):
             if not session:
                 return jsonify({'error': 'Sessão não encontrada'}), 404
             
-            session.end_session()
-            session.calculate_score()
+            # O score vem do banco (adjust_counters): não é recalculado aqui, para
+            # não sobrescrever perguntas gravadas em paralelo
+            if session.end_session():
+                # Atualizar o feature store apenas na primeira finalização
+                FeatureStore().apply_session(session)
             db.session.commit()
+            user_data_changed(user_id)
             
             logger.info(f"Sessão {session_id} finalizada")
             
@@ -206,6 +377,8 @@ def register_routes(app):
             session = StudySession.query.filter_by(id=session_id, user_id=user_id).first()
             if not session:
                 return jsonify({'error': 'Sessão não encontrada'}), 404
+            if session.end_time is not None:
+                return jsonify({'error': 'Sessão já finalizada'}), 409
             
             if not data or not data.get('question_text') or not data.get('answer_text'):
                 return jsonify({'error': 'question_text e answer_text são obrigatórios'}), 400
@@ -222,8 +395,9 @@ def register_routes(app):
             if data.get('user_answer'):
                 question.check_answer(data['user_answer'])
             
-            db.session.add(question)
+            session.add_question(question)
             db.session.commit()
+            user_data_changed(user_id)
             
             return jsonify({
                 'message': 'Pergunta adicionada com sucesso',
@@ -235,19 +409,118 @@ def register_routes(app):
             db.session.rollback()
             return jsonify({'error': 'Erro interno do servidor'}), 500
     
+    @app.route('/api/sessions/<int:session_id>/questions/bulk', methods=['POST'])
+    @jwt_required()
+    def add_questions_bulk(session_id):
+        """Adicionar várias perguntas (com respostas opcionais) à sessão em uma única transação."""
+        try:
+            user_id = get_jwt_identity()
+            data = request.get_json()
+            
+            # Verificar se a sessão pertence ao usuário (uma única vez para o lote)
+            session = StudySession.query.filter_by(id=session_id, user_id=user_id).first()
+            if not session:
+                return jsonify({'error': 'Sessão não encontrada'}), 404
+            if session.end_time is not None:
+                return jsonify({'error': 'Sessão já finalizada'}), 409
+            
+            items = data.get('questions') if isinstance(data, dict) else None
+            if not isinstance(items, list) or not items:
+                return jsonify({'error': 'questions deve ser uma lista não vazia'}), 400
+            if len(items) > MAX_BULK_QUESTIONS:
+                return jsonify({'error': f'Máximo de {MAX_BULK_QUESTIONS} perguntas por chamada'}), 400
+            
+            # Itens inválidos são relatados sem impedir a gravação dos demais
+            valid_items, valid_indexes, errors = [], [], []
+            for i, item in enumerate(items):
+                error = Question.validate(item)
+                if error:
+                    errors.append({'index': i, 'error': error})
+                else:
+                    valid_items.append(item)
+                    valid_indexes.append(i)
+            
+            if not valid_items:
+                return jsonify({'error': 'Nenhuma pergunta válida', 'errors': errors}), 400
+            
+            created = Question.bulk_create(session_id, valid_items)
+            db.session.commit()
+            user_data_changed(user_id)
+            
+            return jsonify({
+                'message': f'{len(created)} perguntas adicionadas com sucesso',
+                'questions': [{'index': i, **question} for i, question in zip(valid_indexes, created)],
+                'errors': errors
+            }), 201
+            
+        except Exception as e:
+            logger.error(f"Erro ao adicionar perguntas em lote: {e}")
+            db.session.rollback()
+            return jsonify({'error': 'Erro interno do servidor'}), 500
+    
+    @app.route('/api/sessions/<int:session_id>/questions/import', methods=['POST'])
+    @jwt_required()
+    def import_questions(session_id):
+        """Importar um banco de perguntas (arquivo CSV ou JSONL enviado no campo 'file')."""
+        try:
+            user_id = get_jwt_identity()
+            
+            session = StudySession.query.filter_by(id=session_id, user_id=user_id).first()
+            if not session:
+                return jsonify({'error': 'Sessão não encontrada'}), 404
+            if session.end_time is not None:
+                return jsonify({'error': 'Sessão já finalizada'}), 409
+            
+            upload = request.files.get('file')
+            if not upload:
+                return jsonify({'error': 'Envie o arquivo no campo file'}), 400
+            
+            fmt = request.args.get('format') or detect_format(upload.filename)
+            if not fmt:
+                return jsonify({'error': 'Formato não reconhecido (use .csv, .jsonl ou ?format=)'}), 400
+            
+            # O arquivo é lido em streaming (uploads grandes ficam em disco temporário)
+            stats = QuestionImporter(session_id).run(upload.stream, fmt)
+            user_data_changed(user_id)
+            
+            return jsonify({
+                'message': f"{stats['inserted']} perguntas importadas",
+                'stats': stats
+            }), 200
+            
+        except QuestionImportError as e:
+            db.session.rollback()
+            user_data_changed(user_id)
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            logger.error(f"Erro ao importar perguntas: {e}")
+            db.session.rollback()
+            return jsonify({'error': 'Erro interno do servidor'}), 500
+    
     # Rotas de progresso
     @app.route('/api/progress', methods=['GET'])
     @jwt_required()
+    @read_only
     def get_progress():
-        """Obter progresso do usuário."""
+        """Obter progresso do usuário (paginação por cursor, atualizados recentemente primeiro)."""
         try:
             user_id = get_jwt_identity()
-            progress_records = Progress.get_user_progress(user_id)
+            page = keyset_page(
+                Progress,
+                where=[Progress.user_id == user_id],
+                order_by=['last_updated', 'id'],
+                fields=parse_fields(request.args.get('fields'), Progress.LIST_FIELDS),
+                cursor=request.args.get('cursor'),
+                limit=parse_limit(request.args.get('limit'))
+            )
             
             return jsonify({
-                'progress': [p.to_dict() for p in progress_records]
+                'progress': page['items'],
+                'next_cursor': page['next_cursor']
             }), 200
             
+        except PaginationError as e:
+            return jsonify({'error': str(e)}), 400
         except Exception as e:
             logger.error(f"Erro ao obter progresso: {e}")
             return jsonify({'error': 'Erro interno do servidor'}), 500
@@ -263,13 +536,19 @@ def register_routes(app):
             if not data or not data.get('topic') or 'score' not in data:
                 return jsonify({'error': 'topic e score são obrigatórios'}), 400
             
-            progress = Progress.get_or_create_progress(user_id, data['topic'])
-            progress.update_score(data['score'])
+            error = validate_progress_item(data)
+            if error:
+                return jsonify({'error': error}), 400
+            
+            # Upsert em um único comando, na mesma transação do feature store
+            progress = Progress.upsert_scores(int(user_id), {data['topic']: data['score']})[0]
+            FeatureStore().refresh_progress(user_id)
             db.session.commit()
+            user_data_changed(user_id)
             
             return jsonify({
                 'message': 'Progresso atualizado com sucesso',
-                'progress': progress.to_dict()
+                'progress': progress
             }), 200
             
         except Exception as e:
@@ -277,6 +556,45 @@ def register_routes(app):
             db.session.rollback()
             return jsonify({'error': 'Erro interno do servidor'}), 500
     
+    @app.route('/api/progress/bulk', methods=['POST'])
+    @jwt_required()
+    def update_progress_bulk():
+        """Atualizar o score de vários tópicos em uma única transação."""
+        try:
+            user_id = get_jwt_identity()
+            data = request.get_json()
+            
+            items = data.get('progress') if isinstance(data, dict) else None
+            if not isinstance(items, list) or not items:
+                return jsonify({'error': 'progress deve ser uma lista não vazia de {topic, score}'}), 400
+            if len(items) > MAX_BULK_PROGRESS:
+                return jsonify({'error': f'Máximo de {MAX_BULK_PROGRESS} tópicos por chamada'}), 400
+            
+            errors = []
+            for i, item in enumerate(items):
+                error = validate_progress_item(item)
+                if error:
+                    errors.append({'index': i, 'error': error})
+            if errors:
+                return jsonify({'error': 'Itens inválidos', 'details': errors}), 400
+            
+            # Tópicos repetidos: vale o último (um upsert não pode alterar a mesma linha duas vezes)
+            scores = {item['topic']: item['score'] for item in items}
+            progress = Progress.upsert_scores(int(user_id), scores)
+            FeatureStore().refresh_progress(user_id)
+            db.session.commit()
+            user_data_changed(user_id)
+            
+            return jsonify({
+                'message': f'{len(progress)} tópicos atualizados com sucesso',
+                'progress': progress
+            }), 200
+            
+        except Exception as e:
+            logger.error(f"Erro ao atualizar progresso em lote: {e}")
+            db.session.rollback()
+            return jsonify({'error': 'Erro interno do servidor'}), 500
+    
     # Rotas de IA
     @app.route('/api/chat', methods=['POST'])
     @jwt_required()
@@ -312,32 +630,107 @@ def register_routes(app):
             logger.error(f"Erro ao obter status da IA: {e}")
             return jsonify({'error': 'Erro interno do servidor'}), 500
     
+    # Rotas de predição
+    @app.route('/api/predict/performance', methods=['POST'])
+    @jwt_required()
+    def predict_performance():
+        """Prediz a performance de um estudante."""
+        try:
+            data = request.get_json()
+            
+            if not data or not isinstance(data.get('features'), dict):
+                return jsonify({'error': 'features é obrigatório'}), 400
+            
+            prediction = get_model_server().predict(data['features'])
+            
+            return jsonify({'prediction': prediction}), 200
+            
+        except PredictionError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            logger.error(f"Erro na predição: {e}")
+            return jsonify({'error': 'Erro interno do servidor'}), 500
+    
+    @app.route('/api/predict/performance/bulk', methods=['POST'])
+    @jwt_required()
+    def predict_performance_bulk():
+        """Prediz a performance de vários estudantes em uma única chamada."""
+        try:
+            data = request.get_json()
+            
+            if not data or not isinstance(data.get('students'), list):
+                return jsonify({'error': 'students é obrigatório'}), 400
+            
+            result = get_model_server().predict_bulk(data['students'])
+            
+            return jsonify(result), 200
+            
+        except PredictionError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            logger.error(f"Erro na predição em lote: {e}")
+            return jsonify({'error': 'Erro interno do servidor'}), 500
+
+    @app.route('/api/model/drift', methods=['GET'])
+    @jwt_required()
+    def model_drift():
+        """Drift das features recebidas em relação aos dados de treinamento."""
+        try:
+            return jsonify(get_model_server().drift_report()), 200
+
+        except PredictionError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            logger.error(f"Erro ao calcular drift do modelo: {e}")
+            return jsonify({'error': 'Erro interno do servidor'}), 500
+
+    @app.route('/api/model/charts/evaluation.<fmt>', methods=['GET'])
+    @jwt_required()
+    def model_charts(fmt):
+        """Gráficos de avaliação de uma versão do modelo (gerados em segundo plano)."""
+        try:
+            if fmt not in CHART_FORMATS:
+                return jsonify({'error': 'Formato não suportado'}), 404
+            
+            renderer = get_chart_renderer()
+            requested = request.args.get('version')
+            version = requested or renderer.registry.current_version()
+            if not version:
+                return jsonify({'error': 'Nenhum modelo em produção'}), 404
+            
+            path = renderer.get(version, fmt)
+            if path is None:
+                response = jsonify({'status': 'rendering', 'version': version})
+                response.headers['Retry-After'] = '2'
+                return response, 202
+            
+            # Versões são imutáveis; a versão corrente pode mudar com uma promoção
+            response = send_file(path, mimetype=CHART_FORMATS[fmt], etag=f"{version}.{fmt}",
+                                 conditional=True, max_age=31536000 if requested else 60)
+            # Resposta autenticada: apenas o cache do navegador pode guardá-la
+            response.cache_control.public = False
+            response.cache_control.private = True
+            if requested:
+                response.cache_control.immutable = True
+            return response
+            
+        except RegistryError as e:
+            return jsonify({'error': str(e)}), 404
+        except Exception as e:
+            logger.error(f"Erro ao obter gráficos do modelo: {e}")
+            return jsonify({'error': 'Erro interno do servidor'}), 500
+    
     # Rotas de dashboard
     @app.route('/api/dashboard', methods=['GET'])
     @jwt_required()
     def dashboard():
-        """Dados do dashboard do usuário."""
+        """Dados do dashboard do usuário (totais, sessões recentes, progresso e predição)."""
         try:
             user_id = get_jwt_identity()
             
-            # Estatísticas gerais
-            total_sessions = StudySession.query.filter_by(user_id=user_id).count()
-            total_questions = db.session.query(Question).join(StudySession).filter(StudySession.user_id == user_id).count()
-            
-            # Sessões recentes
-            recent_sessions = StudySession.query.filter_by(user_id=user_id).order_by(StudySession.start_time.desc()).limit(5).all()
-            
-            # Progresso por tópico
-            progress_records = Progress.get_user_progress(user_id)
-            
-            return jsonify({
-                'stats': {
-                    'total_sessions': total_sessions,
-                    'total_questions': total_questions
-                },
-                'recent_sessions': [s.to_dict() for s in recent_sessions],
-                'progress': [p.to_dict() for p in progress_records]
-            }), 200
+            # Rollup em uma única consulta, servido do cache enquanto não houver escritas.
+            # Não é read_only: o cache é montado no primário, nunca de uma réplica atrasada
+            return jsonify(get_dashboard_cache().get(user_id)), 200
             
         except Exception as e:
             logger.error(f"Erro ao obter dados do dashboard: {e}")
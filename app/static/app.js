@@ -585,20 +585,38 @@ class StudyPlatformApp {
         `).join('');
     }
     
-    async loadProgressData() {
-        if (!this.authToken) return;
-        
-        try {
-            const response = await fetch(`${this.apiBaseUrl}/api/progress`, {
+    async fetchAllPages(path, key, params = {}) {
+        // As listagens são paginadas por cursor; segue next_cursor até a última página
+        const items = [];
+        let cursor = null;
+        
+        do {
+            const query = new URLSearchParams({ limit: 200, ...params });
+            if (cursor) query.set('cursor', cursor);
+            
+            const response = await fetch(`${this.apiBaseUrl}${path}?${query}`, {
                 headers: {
                     'Authorization': `Bearer ${this.authToken}`
                 }
             });
-            
-            if (response.ok) {
-                const data = await response.json();
-                this.renderProgressChart(data.progress);
+            if (!response.ok) {
+                throw new Error(`Erro ${response.status} ao carregar ${path}`);
             }
+            
+            const data = await response.json();
+            items.push(...data[key]);
+            cursor = data.next_cursor;
+        } while (cursor);
+        
+        return items;
+    }
+    
+    async loadProgressData() {
+        if (!this.authToken) return;
+        
+        try {
+            const progress = await this.fetchAllPages('/api/progress', 'progress', { fields: 'topic,score' });
+            this.renderProgressChart(progress);
         } catch (error) {
             console.error('Erro ao carregar progresso:', error);
         }
@@ -0,0 +1,201 @@
+"""
+Benchmark do EducationalMLPipeline por etapa e tamanho de dataset.
+
+Executa gerar -> pré-processar -> treinar -> avaliar -> salvar para cada
+tamanho de dataset e conjunto de modelos, registrando tempo de parede,
+tempo de CPU, pico de memória alocada (tracemalloc) e RSS de cada etapa.
+Os resultados são salvos em JSON; com --baseline, cada medição é
+comparada a um resultado anterior e regressões acima da tolerância fazem
+o script sair com código 1.
+
+Uso:
+    python benchmarks/ml_pipeline_benchmark.py --sizes 1000 10000 --output results.json
+    python benchmarks/ml_pipeline_benchmark.py --sizes 1000 10000 --baseline results.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.ml_algorithms import EducationalMLPipeline
+
+MODEL_SETS = {
+    'all': ['SVM', 'Naive_Bayes', 'Decision_Tree'],
+    'fast': ['Naive_Bayes', 'Decision_Tree'],
+    'svm': ['SVM']
+}
+
+# Métricas comparadas com o baseline (quanto menor, melhor)
+COMPARED_METRICS = ['wall_seconds', 'cpu_seconds', 'peak_alloc_mb']
+
+def current_rss_mb() -> float:
+    """RSS atual do processo em MB (Linux), ou o RSS máximo como aproximação."""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 ** 2
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+@contextlib.contextmanager
+def measure(stage: str, results: list, **context):
+    """
+    Mede uma etapa e adiciona o resultado em `results`.
+
+    A medição é registrada mesmo quando a etapa falha (com o campo
+    `error`); a exceção é propagada em seguida.
+    """
+    rss_before = current_rss_mb()
+    tracemalloc.start()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    error = None
+
+    try:
+        # Silenciar os prints do pipeline durante a medição
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        result = {
+            **context,
+            'stage': stage,
+            'wall_seconds': round(wall, 4),
+            'cpu_seconds': round(cpu, 4),
+            'peak_alloc_mb': round(peak / 1024 ** 2, 3),
+            'rss_mb': round(current_rss_mb(), 1),
+            'rss_delta_mb': round(current_rss_mb() - rss_before, 1)
+        }
+        if error:
+            result['error'] = error
+        results.append(result)
+        print(f"{context['rows']:>9} {context['model_set']:<6} {stage:<11} "
+              f"parede {wall:>8.3f}s  cpu {cpu:>8.3f}s  pico {peak / 1024 ** 2:>9.1f} MB"
+              + (f"  FALHOU ({error})" if error else ''))
+
+def run_benchmark(n_samples: int, model_set: str, results: list = None) -> list:
+    """
+    Executa todas as etapas do pipeline para um tamanho e conjunto de modelos.
+
+    Args:
+        n_samples: Tamanho do dataset
+        model_set: Chave de MODEL_SETS
+        results: Lista que recebe as medições (preservadas se uma etapa falhar)
+    """
+    results = [] if results is None else results
+    context = {'rows': n_samples, 'model_set': model_set}
+
+    pipeline = EducationalMLPipeline()
+    pipeline.models = {name: pipeline.models[name] for name in MODEL_SETS[model_set]}
+
+    with measure('generate', results, **context):
+        df = pipeline.create_sample_educational_dataset(n_samples)
+    with measure('preprocess', results, **context):
+        X, y = pipeline.preprocess_data(df)
+    del df
+    with measure('train', results, **context):
+        pipeline.train_models(X, y)
+    with measure('evaluate', results, **context):
+        pipeline.evaluate_models()
+    with tempfile.TemporaryDirectory() as directory, measure('save', results, **context):
+        pipeline.save_models(directory)
+
+    return results
+
+def compare(results: list, baseline: list, tolerance: float) -> list:
+    """
+    Compara os resultados com um baseline.
+
+    Returns:
+        Lista de regressões (métrica acima de baseline * (1 + tolerância))
+    """
+    key = lambda r: (r['rows'], r['model_set'], r['stage'])
+    baseline_by_key = {key(r): r for r in baseline}
+    regressions = []
+
+    for result in results:
+        reference = baseline_by_key.get(key(result))
+        # Etapas que falharam não têm tempo comparável
+        if not reference or 'error' in result or 'error' in reference:
+            continue
+        for metric in COMPARED_METRICS:
+            # Ignorar medições muito pequenas, dominadas por ruído
+            if reference[metric] < 0.01:
+                continue
+            ratio = result[metric] / reference[metric]
+            if ratio > 1 + tolerance:
+                regressions.append({
+                    'rows': result['rows'], 'model_set': result['model_set'], 'stage': result['stage'],
+                    'metric': metric, 'baseline': reference[metric], 'current': result[metric],
+                    'ratio': round(ratio, 3)
+                })
+
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark do pipeline de ML por etapa')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--model-sets', nargs='+', default=['all'], choices=sorted(MODEL_SETS))
+    parser.add_argument('--output', help='Arquivo JSON para salvar os resultados')
+    parser.add_argument('--baseline', help='Arquivo JSON de um resultado anterior para comparação')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Aumento relativo tolerado antes de acusar regressão (padrão: 20%%)')
+    args = parser.parse_args()
+
+    # Aquecimento: carrega bibliotecas e caches antes das medições
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_benchmark(500, args.model_sets[0])
+
+    results = []
+    failed = False
+    for n_samples in args.sizes:
+        for model_set in args.model_sets:
+            try:
+                run_benchmark(n_samples, model_set, results)
+            except Exception as e:
+                # As etapas medidas até a falha (inclusive ela) continuam no relatório
+                print(f"Falha no benchmark {n_samples} {model_set}: {e}")
+                failed = True
+
+    report = {
+        'created_at': datetime.utcnow().isoformat(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Resultados salvos em: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f)['results'], args.tolerance)
+
+        for r in regressions:
+            print(f"REGRESSÃO {r['rows']} {r['model_set']} {r['stage']} {r['metric']}: "
+                  f"{r['baseline']} -> {r['current']} ({r['ratio']}x)")
+        if regressions:
+            sys.exit(1)
+        print("Nenhuma regressão em relação ao baseline.")
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
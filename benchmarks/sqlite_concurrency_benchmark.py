@@ -0,0 +1,151 @@
+"""
+Benchmark de leitura e escrita concorrentes no SQLite, com e sem o perfil de concorrência.
+
+Processos escritores repetem a transação de `POST /api/sessions/<id>/questions`
+(INSERT da pergunta + UPDATE dos contadores da sessão) e processos
+leitores repetem a listagem de sessões, simulando vários workers do
+gunicorn sobre o mesmo arquivo. Para cada perfil ('off': engine padrão,
+'on': PRAGMAs de `DatabaseConfig.SQLITE_PRAGMAS`) são medidas as operações
+por segundo, a latência p50/p95 e os erros "database is locked".
+
+Uso:
+    python benchmarks/sqlite_concurrency_benchmark.py --writers 4 --readers 8 --seconds 10
+    python benchmarks/sqlite_concurrency_benchmark.py --output sqlite_concurrency.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from sqlalchemy import create_engine, select, update, insert
+from sqlalchemy.exc import OperationalError
+
+from database.config import db, apply_sqlite_pragmas
+from models import User, StudySession, Question
+
+PROFILES = ('off', 'on')
+
+def make_engine(path: str, profile: str):
+    engine = create_engine(f"sqlite:///{path}")
+    if profile == 'on':
+        apply_sqlite_pragmas(engine)
+    return engine
+
+def setup_database(path: str, profile: str, n_users: int, sessions_per_user: int) -> None:
+    """Cria o schema e os dados iniciais (usuários e sessões)."""
+    engine = make_engine(path, profile)
+    db.metadata.create_all(engine)
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        connection.execute(insert(User.__table__), [
+            {'id': u, 'username': f'user{u}', 'email': f'user{u}@example.com', 'password_hash': 'x', 'created_at': now}
+            for u in range(1, n_users + 1)
+        ])
+        connection.execute(insert(StudySession.__table__), [
+            {'user_id': u, 'start_time': now, 'score': 0, 'questions_count': 0, 'correct_count': 0}
+            for u in range(1, n_users + 1) for _ in range(sessions_per_user)
+        ])
+    engine.dispose()
+
+def run_worker(args) -> dict:
+    """Executa operações de um tipo até o fim do tempo (em um processo separado)."""
+    path, profile, role, seed, seconds, n_users, n_sessions = args
+    rng = np.random.default_rng(seed)
+    engine = make_engine(path, profile)
+    sessions = StudySession.__table__
+    questions = Question.__table__
+
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            if role == 'write':
+                session_id = int(rng.integers(1, n_sessions + 1))
+                correct = bool(rng.integers(0, 2))
+                with engine.begin() as connection:
+                    connection.execute(insert(questions).values(
+                        session_id=session_id, question_text='q', answer_text='a', is_correct=correct
+                    ))
+                    connection.execute(update(sessions).where(sessions.c.id == session_id).values(
+                        questions_count=sessions.c.questions_count + 1,
+                        correct_count=sessions.c.correct_count + int(correct)
+                    ))
+            else:
+                user_id = int(rng.integers(1, n_users + 1))
+                with engine.connect() as connection:
+                    connection.execute(
+                        select(sessions).where(sessions.c.user_id == user_id)
+                        .order_by(sessions.c.start_time.desc(), sessions.c.id.desc()).limit(50)
+                    ).all()
+        except OperationalError as e:
+            if 'locked' not in str(e):
+                raise
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - start)
+
+    engine.dispose()
+    return {'role': role, 'latencies': latencies, 'errors': errors}
+
+def run_profile(profile: str, args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'benchmark.db')
+        setup_database(path, profile, args.users, args.sessions_per_user)
+        n_sessions = args.users * args.sessions_per_user
+
+        tasks = [(path, profile, 'write', i, args.seconds, args.users, n_sessions) for i in range(args.writers)]
+        tasks += [(path, profile, 'read', 1000 + i, args.seconds, args.users, n_sessions) for i in range(args.readers)]
+        with multiprocessing.get_context('spawn').Pool(len(tasks)) as pool:
+            results = pool.map(run_worker, tasks)
+
+    summary = {'profile': profile}
+    for role in ('write', 'read'):
+        latencies = np.concatenate([r['latencies'] for r in results if r['role'] == role] or [[]])
+        summary[role] = {
+            'ops_per_second': round(len(latencies) / args.seconds, 1),
+            'p50_ms': round(float(np.percentile(latencies, 50)) * 1000, 2) if len(latencies) else None,
+            'p95_ms': round(float(np.percentile(latencies, 95)) * 1000, 2) if len(latencies) else None,
+            'locked_errors': sum(r['errors'] for r in results if r['role'] == role)
+        }
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de concorrência do SQLite')
+    parser.add_argument('--writers', type=int, default=4, help='Processos escritores')
+    parser.add_argument('--readers', type=int, default=8, help='Processos leitores')
+    parser.add_argument('--seconds', type=float, default=10.0, help='Duração de cada perfil')
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--sessions-per-user', type=int, default=20)
+    parser.add_argument('--profiles', nargs='+', choices=PROFILES, default=list(PROFILES))
+    parser.add_argument('--output', help='Arquivo JSON com os resultados')
+    args = parser.parse_args()
+
+    results = []
+    for profile in args.profiles:
+        summary = run_profile(profile, args)
+        results.append(summary)
+        for role in ('write', 'read'):
+            r = summary[role]
+            print(f"{profile:>3} {role:<5} {r['ops_per_second']:>9.1f} ops/s  p50 {r['p50_ms']} ms  "
+                  f"p95 {r['p95_ms']} ms  locked {r['locked_errors']}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'created_at': datetime.utcnow().isoformat(),
+                'python': platform.python_version(),
+                'config': vars(args),
+                'results': results
+            }, f, indent=2)
+
+if __name__ == '__main__':
+    main()
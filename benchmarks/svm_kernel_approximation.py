@@ -0,0 +1,78 @@
+"""
+Benchmark do SVM exato (SVC RBF) contra o modo large-data (Nyström + LinearSVC).
+
+Mede tempo de treino, tempo de predição e acurácia em diferentes tamanhos
+de dataset. O SVC exato é ignorado acima de --exact-max-rows, pois seu
+custo cresce de forma quadrática a cúbica com o número de amostras.
+
+Uso:
+    python benchmarks/svm_kernel_approximation.py --sizes 10000 100000 1000000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sklearn.model_selection import train_test_split
+from sklearn.svm import SVC
+
+from database.ml_algorithms import EducationalMLPipeline, build_large_data_svm
+from database.preprocessing import make_model_pipeline
+
+def run_model(name, model, X_train, X_test, y_train, y_test):
+    """Treina e avalia um modelo, retornando os tempos e a acurácia."""
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    accuracy = float((model.predict(X_test) == y_test).mean())
+    predict_time = time.perf_counter() - start
+
+    return {
+        'model': name,
+        'fit_seconds': round(fit_time, 4),
+        'predict_seconds': round(predict_time, 4),
+        'accuracy': round(accuracy, 4)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--exact-max-rows', type=int, default=100000,
+                        help='Maior dataset em que o SVC exato é executado')
+    parser.add_argument('--n-components', type=int, default=500)
+    parser.add_argument('--output', help='Arquivo JSON para salvar os resultados')
+    args = parser.parse_args()
+
+    results = []
+    for n_samples in args.sizes:
+        pipeline = EducationalMLPipeline()
+        X, y = pipeline.preprocess_data(pipeline.create_sample_educational_dataset(n_samples))
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=0.2, random_state=42, stratify=y
+        )
+
+        models = [('large_data', make_model_pipeline(build_large_data_svm(n_components=args.n_components)))]
+        if n_samples <= args.exact_max_rows:
+            models.insert(0, ('exact', make_model_pipeline(SVC(kernel='rbf', random_state=42))))
+        else:
+            results.append({'rows': n_samples, 'model': 'exact', 'skipped': True})
+
+        for name, model in models:
+            result = run_model(name, model, X_train, X_test, y_train, y_test)
+            result['rows'] = n_samples
+            results.append(result)
+            print(f"{n_samples:>9} {name:<11} treino {result['fit_seconds']:>9.3f}s  "
+                  f"predição {result['predict_seconds']:>8.3f}s  acurácia {result['accuracy']:.4f}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Resultados salvos em: {args.output}")
+
+if __name__ == '__main__':
+    main()
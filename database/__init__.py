@@ -1,5 +1,50 @@
+from importlib import import_module
+
 from .ai_integrations import AIServiceManager, get_ai_response, get_ai_service_status
-from .ml_algorithms import EducationalMLPipeline
 
-__all__ = ['AIServiceManager', 'get_ai_response', 'get_ai_service_status', 'EducationalMLPipeline']
+# Exportações carregadas apenas no primeiro acesso: a pilha científica
+# (pandas, scikit-learn, matplotlib) só é importada por quem a utiliza
+_LAZY_EXPORTS = {
+    'EducationalMLPipeline': '.ml_algorithms',
+    'train_from_feature_store': '.ml_algorithms',
+    'ModelRegistry': '.model_registry',
+    'RegistryError': '.model_registry',
+    'ModelServer': '.model_server',
+    'PredictionError': '.model_server',
+    'get_model_server': '.model_server',
+    'FeatureStore': '.feature_store',
+    'FEATURE_STORE_FEATURES': '.feature_store',
+    'CompiledPredictor': '.compiled_inference',
+    'CompilationError': '.compiled_inference',
+    'export_compiled': '.compiled_inference',
+    'BulkScoringJob': '.bulk_scoring',
+    'ColumnarDataset': '.columnar_dataset',
+    'write_dataset': '.columnar_dataset',
+    'ChartRenderer': '.chart_renderer',
+    'get_chart_renderer': '.chart_renderer',
+    'CHART_FORMATS': '.chart_renderer',
+    'reconcile_session_counters': '.session_counters',
+    'keyset_page': '.pagination',
+    'parse_fields': '.pagination',
+    'parse_limit': '.pagination',
+    'PaginationError': '.pagination',
+    'DashboardCache': '.dashboard',
+    'get_dashboard_cache': '.dashboard',
+    'QueryAdvisor': '.query_advisor',
+    'advise_endpoints': '.query_advisor',
+    'QuestionImporter': '.question_import',
+    'QuestionImportError': '.question_import',
+    'detect_format': '.question_import',
+    'RoutingSession': '.routing',
+    'read_only': '.routing',
+    'mark_user_write': '.routing',
+}
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
+__all__ = ['AIServiceManager', 'get_ai_response', 'get_ai_service_status', *_LAZY_EXPORTS]
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import logging
+import os
+import platform
+import uuid
+from typing import Dict, List, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+def library_versions() -> Dict[str, str]:
+    """Versões das bibliotecas que influenciam o resultado de um treinamento."""
+    import numpy
+    import sklearn
+    return {
+        'python': platform.python_version(),
+        'numpy': numpy.__version__,
+        'sklearn': sklearn.__version__
+    }
+
+class ArtifactCache:
+    """
+    Cache em disco de artefatos de treinamento, endereçado por conteúdo.
+
+    A chave é o hash dos dados de entrada, dos parâmetros do modelo e das
+    versões das bibliotecas; qualquer mudança em um deles gera uma nova
+    chave. O tamanho total é limitado por `max_bytes`, removendo primeiro
+    os artefatos usados há mais tempo.
+    """
+
+    def __init__(self, cache_dir: str = '.artifact_cache', max_bytes: int = 1024 ** 3):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(data_fingerprint: str, name: str, params: Dict[str, Any], **extra: Any) -> str:
+        """
+        Gera a chave de um artefato.
+
+        Args:
+            data_fingerprint: Impressão digital dos arrays de entrada
+            name: Nome do modelo
+            params: Parâmetros do estimador (`get_params()`)
+            **extra: Demais configurações que afetam o resultado
+
+        Returns:
+            Hash hexadecimal que identifica o artefato
+        """
+        content = json.dumps({
+            'data': data_fingerprint,
+            'name': name,
+            'params': params,
+            'extra': extra,
+            'versions': library_versions()
+        }, sort_keys=True, default=repr)
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Retorna o artefato armazenado, ou None se não existir."""
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+
+        import joblib
+        try:
+            value = joblib.load(path)
+        except Exception as e:
+            logger.warning(f"Artefato corrompido removido do cache: {e}")
+            self.invalidate(key)
+            return None
+
+        # Marcar como usado recentemente (ordem de remoção)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Armazena um artefato (escrita atômica) e aplica o limite de tamanho."""
+        import joblib
+
+        tmp_path = os.path.join(self.cache_dir, f".{key}.{uuid.uuid4().hex}")
+        joblib.dump(value, tmp_path)
+        os.replace(tmp_path, self._path(key))
+        self._evict()
+
+    def invalidate(self, key: str) -> bool:
+        """Remove um artefato. Retorna True se ele existia."""
+        try:
+            os.remove(self._path(key))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def clear(self) -> int:
+        """Remove todos os artefatos. Retorna a quantidade removida."""
+        removed = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.pkl'):
+                try:
+                    os.remove(entry.path)
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+        return removed
+
+    def _entries(self) -> List[Tuple[str, os.stat_result]]:
+        """
+        Artefatos presentes com o seu `stat`.
+
+        Outro processo pode remover um arquivo entre a listagem e o `stat`;
+        esses arquivos são simplesmente ignorados.
+        """
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if not entry.name.endswith('.pkl'):
+                continue
+            try:
+                entries.append((entry.path, entry.stat()))
+            except FileNotFoundError:
+                continue
+        return entries
+
+    def size(self) -> int:
+        """Tamanho total dos artefatos em bytes."""
+        return sum(stat.st_size for _, stat in self._entries())
+
+    def _evict(self) -> None:
+        """Remove os artefatos menos usados até respeitar `max_bytes`."""
+        entries = self._entries()
+        total = sum(stat.st_size for _, stat in entries)
+        if total <= self.max_bytes:
+            return
+
+        for path, stat in sorted(entries, key=lambda e: e[1].st_mtime):
+            if total <= self.max_bytes:
+                break
+            total -= stat.st_size
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # Já removido por outro processo que também aplicava o limite
+                continue
+            logger.info(f"Artefato removido do cache por limite de tamanho: {os.path.basename(path)}")
@@ -0,0 +1,218 @@
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select, func
+
+from database.config import db
+from models import StudentPrediction
+
+from .feature_store import FeatureStore, FEATURE_STORE_FEATURES
+from .model_registry import ModelRegistry, RegistryError
+from .model_server import PredictionError, load_predictor
+
+logger = logging.getLogger(__name__)
+
+# Nível de risco exibido no dashboard para cada classe de performance
+RISK_LEVELS = {
+    'needs_improvement': 'high',
+    'average': 'medium',
+    'good': 'low',
+    'excellent': 'low'
+}
+
+# Performance gravada para estudantes sem sessões finalizadas: o modelo é
+# treinado sem eles (ver train_from_feature_store) e a sua linha de features
+# é toda zero, portanto uma classe predita não teria significado
+INSUFFICIENT_DATA = 'insufficient_data'
+
+# Colunas atualizadas quando o usuário já possui uma predição
+UPSERT_COLUMNS = ['performance', 'risk_level', 'probabilities', 'model_name',
+                  'model_version', 'batch_id', 'scored_at']
+
+# Modelo carregado uma vez por processo do pool
+_worker_predictor = None
+
+def _init_worker(model_dir: str, version: str, compiled: bool) -> None:
+    global _worker_predictor
+    _worker_predictor = load_predictor(ModelRegistry(model_dir), version, compiled)
+
+def _predict_chunk(ids: np.ndarray, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    """Prediz um bloco de usuários (executado no pool)."""
+    predictions, probabilities = _worker_predictor.predict_matrix(X)
+    return ids, predictions, probabilities
+
+def _has_sessions(X: np.ndarray) -> np.ndarray:
+    """Máscara dos estudantes com ao menos uma sessão finalizada (coluna sessions_count)."""
+    return X[:, FEATURE_STORE_FEATURES.index('sessions_count')] > 0
+
+def upsert_predictions(session, rows: List[Dict[str, Any]]) -> None:
+    """
+    Insere ou atualiza predições com um único comando em lote.
+
+    Usa `INSERT ... ON CONFLICT (user_id) DO UPDATE` no SQLite e no
+    PostgreSQL; em outros bancos recorre ao `merge` linha a linha.
+
+    Args:
+        session: Sessão do SQLAlchemy
+        rows: Linhas no formato das colunas de `student_predictions`
+    """
+    if not rows:
+        return
+
+    dialect = session.get_bind().dialect.name
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        for row in rows:
+            session.merge(StudentPrediction(**row))
+        return
+
+    statement = insert(StudentPrediction.__table__)
+    statement = statement.on_conflict_do_update(
+        index_elements=['user_id'],
+        set_={column: statement.excluded[column] for column in UPSERT_COLUMNS}
+    )
+    session.execute(statement, rows)
+
+class BulkScoringJob:
+    """
+    Calcula a predição de performance de todos os estudantes em lote.
+
+    Os estudantes são lidos do feature store em blocos por chave primária
+    e preditos em um pool de processos (cada worker carrega o modelo uma
+    única vez). O processo principal grava cada bloco com um upsert em lote
+    e faz commit em ordem de ID; assim, o maior `user_id` já gravado para o
+    `batch_id` é o ponto de retomada caso a execução seja interrompida.
+    """
+
+    def __init__(self, model_dir: str = 'trained_models', version: Optional[str] = None,
+                 compiled: bool = False, chunk_size: int = 5000, n_workers: Optional[int] = None,
+                 batch_id: Optional[str] = None, session=None):
+        """
+        Args:
+            model_dir: Diretório raiz do registro de modelos
+            version: Versão do modelo (padrão: versão promovida)
+            compiled: Se deve usar o modelo compilado (sem scikit-learn)
+            chunk_size: Estudantes por bloco
+            n_workers: Processos do pool (0 ou 1 executa no próprio processo)
+            batch_id: Identificador da execução (padrão: data + versão, de modo
+                que uma nova execução no mesmo dia retoma a anterior)
+            session: Sessão do SQLAlchemy (padrão: db.session)
+        """
+        self.registry = ModelRegistry(model_dir)
+        self.version = version or self.registry.current_version()
+        if not self.version:
+            raise RegistryError("Nenhuma versão promovida no registro")
+
+        self.compiled = compiled
+        self.chunk_size = chunk_size
+        self.n_workers = os.cpu_count() if n_workers is None else n_workers
+        self.batch_id = batch_id or f"{datetime.utcnow():%Y%m%d}-{self.version}"
+        self.session = session or db.session
+
+    def checkpoint(self) -> int:
+        """Maior ID de usuário já gravado nesta execução (0 se nenhum)."""
+        last_user_id = self.session.scalar(
+            select(func.max(StudentPrediction.user_id)).where(StudentPrediction.batch_id == self.batch_id)
+        )
+        return last_user_id or 0
+
+    def _rows(self, ids: np.ndarray, predictions: np.ndarray, probabilities: Optional[np.ndarray],
+              has_sessions: np.ndarray, classes: List[str], model_name: str) -> List[Dict[str, Any]]:
+        """Converte o resultado de um bloco em linhas para o upsert."""
+        scored_at = datetime.utcnow()
+        rows = []
+        for i, (user_id, performance) in enumerate(zip(ids.tolist(), predictions)):
+            if has_sessions[i]:
+                performance = str(performance)
+                row_probabilities = None if probabilities is None else {
+                    cls: round(float(p), 4) for cls, p in zip(classes, probabilities[i])
+                }
+            else:
+                performance, row_probabilities = INSUFFICIENT_DATA, None
+            rows.append({
+                'user_id': user_id,
+                'performance': performance,
+                'risk_level': RISK_LEVELS.get(performance, 'unknown'),
+                'probabilities': row_probabilities,
+                'model_name': model_name,
+                'model_version': self.version,
+                'batch_id': self.batch_id,
+                'scored_at': scored_at
+            })
+        return rows
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Executa (ou retoma) o cálculo das predições.
+
+        Estudantes sem sessões finalizadas recebem a performance
+        `insufficient_data` (risco `unknown`, sem probabilidades) em vez de
+        uma classe predita.
+
+        Returns:
+            Dict com batch_id, versão, estudantes gravados (e quantos sem
+            dados suficientes), ponto de partida e tempo total
+        """
+        predictor = load_predictor(self.registry, self.version, self.compiled)
+        features = list(predictor.numerical_features) + list(predictor.categorical_features)
+        if features != FEATURE_STORE_FEATURES:
+            raise PredictionError(
+                f"A versão {self.version} não foi treinada com as features do feature store "
+                f"(modelo: {', '.join(features)}; feature store: {', '.join(FEATURE_STORE_FEATURES)}). "
+                f"Treine e promova uma versão compatível com `flask train-model`"
+            )
+
+        start_after = self.checkpoint()
+        if start_after:
+            logger.info(f"Retomando {self.batch_id} após o usuário {start_after}")
+
+        start = time.perf_counter()
+        chunks = FeatureStore(self.session).iter_matrix(self.chunk_size, after_user_id=start_after)
+        scored = 0
+        insufficient = 0
+
+        def store(has_sessions, ids, predictions, probabilities):
+            nonlocal scored, insufficient
+            upsert_predictions(self.session, self._rows(ids, predictions, probabilities, has_sessions,
+                                                        predictor.classes, predictor.model_name))
+            self.session.commit()
+            scored += len(ids)
+            insufficient += int((~has_sessions).sum())
+            logger.info(f"{scored} estudantes pontuados (até o usuário {int(ids[-1])})")
+
+        if self.n_workers <= 1:
+            for ids, X in chunks:
+                store(_has_sessions(X), ids, *predictor.predict_matrix(X))
+        else:
+            with ProcessPoolExecutor(max_workers=self.n_workers, initializer=_init_worker,
+                                     initargs=(self.registry.root, self.version, self.compiled)) as pool:
+                # Janela limitada de blocos em andamento; a gravação segue a ordem de ID
+                pending = deque()
+                for ids, X in chunks:
+                    pending.append((_has_sessions(X), pool.submit(_predict_chunk, ids, X)))
+                    if len(pending) >= 2 * self.n_workers:
+                        has_sessions, future = pending.popleft()
+                        store(has_sessions, *future.result())
+                while pending:
+                    has_sessions, future = pending.popleft()
+                    store(has_sessions, *future.result())
+
+        elapsed = time.perf_counter() - start
+        logger.info(f"Pontuação {self.batch_id} concluída: {scored} estudantes em {elapsed:.1f}s")
+        return {
+            'batch_id': self.batch_id,
+            'version': self.version,
+            'scored': scored,
+            'insufficient_data': insufficient,
+            'resumed_after_user_id': start_after,
+            'seconds': round(elapsed, 3)
+        }
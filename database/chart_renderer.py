@@ -0,0 +1,178 @@
+import logging
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Sequence
+
+from .model_registry import ModelRegistry, RegistryError
+
+logger = logging.getLogger(__name__)
+
+CHART_FORMATS = {'png': 'image/png', 'svg': 'image/svg+xml'}
+CHART_NAME = 'evaluation'
+
+def plot_evaluation(metrics: Dict[str, Dict[str, Any]], classes: Sequence[str], best_model: str,
+                    save_path: str, dpi: int = 100) -> None:
+    """
+    Desenha a figura de avaliação 2x2 (acurácia, F1, CV e matriz de confusão).
+
+    Recebe apenas métricas em dicionários (como no manifesto do registro),
+    portanto pode rodar em outro processo sem os modelos treinados.
+
+    Args:
+        metrics: Métricas por modelo (accuracy, f1_score, cv_mean, cv_std,
+            confusion_matrix)
+        classes: Nomes das classes, na ordem da matriz de confusão
+        best_model: Modelo cuja matriz de confusão é exibida
+        save_path: Arquivo de saída (o formato vem da extensão)
+        dpi: Resolução das imagens rasterizadas
+    """
+    # Pilha de gráficos carregada só quando necessária, em backend headless
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    # Configurar matplotlib para português
+    plt.rcParams['font.size'] = 12
+
+    fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+    fig.suptitle('Avaliação dos Algoritmos de Machine Learning', fontsize=16, fontweight='bold')
+    colors = ['#FF6B6B', '#4ECDC4', '#45B7D1']
+
+    models = list(metrics)
+    for ax, key, title in ((axes[0, 0], 'accuracy', 'Acurácia'), (axes[0, 1], 'f1_score', 'F1-Score')):
+        values = [metrics[m][key] for m in models]
+        ax.bar(models, values, color=colors)
+        ax.set_title(f'Comparação de {title}')
+        ax.set_ylabel(title)
+        ax.set_ylim(0, 1)
+        for i, v in enumerate(values):
+            ax.text(i, v + 0.01, f'{v:.3f}', ha='center', va='bottom')
+
+    axes[1, 0].bar(models, [metrics[m]['cv_mean'] for m in models],
+                   yerr=[metrics[m]['cv_std'] for m in models], color=colors, capsize=5, alpha=0.7)
+    axes[1, 0].set_title('Cross-Validation Scores')
+    axes[1, 0].set_ylabel('CV Score')
+    axes[1, 0].set_ylim(0, 1)
+
+    cm = metrics[best_model].get('confusion_matrix')
+    if cm is not None:
+        sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', xticklabels=classes, yticklabels=classes,
+                    ax=axes[1, 1])
+        axes[1, 1].set_xlabel('Predito')
+        axes[1, 1].set_ylabel('Real')
+    axes[1, 1].set_title(f'Matriz de Confusão - {best_model}')
+
+    plt.tight_layout()
+    fig.savefig(save_path, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+
+def _render_version(registry_root: str, version: str, cache_dir: str, formats: List[str]) -> List[str]:
+    """Renderiza os gráficos de uma versão a partir do manifesto (executado no pool)."""
+    manifest = ModelRegistry(registry_root).get_manifest(version)
+    target_dir = os.path.join(cache_dir, version)
+    os.makedirs(target_dir, exist_ok=True)
+
+    paths = []
+    for fmt in formats:
+        path = os.path.join(target_dir, f"{CHART_NAME}.{fmt}")
+        tmp_path = os.path.join(target_dir, f".{uuid.uuid4().hex}.{fmt}")
+        plot_evaluation(manifest['metrics'], manifest['feature_schema']['classes'],
+                        manifest['model_name'], tmp_path)
+        os.replace(tmp_path, path)
+        paths.append(path)
+    return paths
+
+class ChartRenderer:
+    """
+    Renderização em segundo plano dos gráficos de avaliação.
+
+    Os gráficos são gerados uma única vez por versão do modelo, em um
+    processo separado, e gravados em `cache_dir/<versão>/`. Como as versões
+    do registro são imutáveis, o cache nunca precisa ser invalidado.
+    """
+
+    def __init__(self, registry_root: str = 'trained_models', cache_dir: Optional[str] = None,
+                 formats: Sequence[str] = tuple(CHART_FORMATS)):
+        self.registry = ModelRegistry(registry_root)
+        self.cache_dir = cache_dir or os.path.join(registry_root, 'charts')
+        self.formats = list(formats)
+        self._pool = None
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def path(self, version: str, fmt: str) -> str:
+        return os.path.join(self.cache_dir, version, f"{CHART_NAME}.{fmt}")
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # 'spawn': o processo web tem threads (micro-batching, watcher)
+            self._pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+        return self._pool
+
+    def schedule(self, version: str) -> Optional[Future]:
+        """
+        Agenda a renderização de uma versão, se ainda não estiver em cache.
+
+        Returns:
+            Future da renderização, ou None se os gráficos já existem
+        """
+        if all(os.path.exists(self.path(version, fmt)) for fmt in self.formats):
+            return None
+
+        with self._lock:
+            future = self._pending.get(version)
+            if future is None:
+                future = self._get_pool().submit(_render_version, self.registry.root, version,
+                                                 self.cache_dir, self.formats)
+                self._pending[version] = future
+                future.add_done_callback(lambda f, v=version: self._done(v, f))
+            return future
+
+    def _done(self, version: str, future: Future) -> None:
+        with self._lock:
+            self._pending.pop(version, None)
+        if future.exception() is not None:
+            logger.error(f"Erro ao renderizar gráficos da versão {version}: {future.exception()}")
+        else:
+            logger.info(f"Gráficos da versão {version} renderizados")
+
+    def get(self, version: str, fmt: str) -> Optional[str]:
+        """
+        Retorna o caminho do gráfico em cache.
+
+        Se ele ainda não existe, agenda a renderização e retorna None (o
+        chamador responde sem esperar pelo matplotlib).
+
+        Raises:
+            RegistryError: Versão inexistente ou inválida
+        """
+        if os.path.basename(version) != version or version.startswith('.'):
+            raise RegistryError(f"Versão inválida: {version}")
+
+        path = self.path(version, fmt)
+        if os.path.exists(path):
+            return path
+
+        self.registry.get_manifest(version)
+        self.schedule(version)
+        return None
+
+# Instância por processo (cada worker do gunicorn tem o seu pool)
+_chart_renderer = None
+_chart_renderer_lock = threading.Lock()
+
+def get_chart_renderer() -> ChartRenderer:
+    """Retorna o renderizador de gráficos do processo atual, criando-o se necessário."""
+    global _chart_renderer
+    if _chart_renderer is None:
+        with _chart_renderer_lock:
+            if _chart_renderer is None:
+                _chart_renderer = ChartRenderer(
+                    os.environ.get('MODEL_DIR', 'trained_models'),
+                    cache_dir=os.environ.get('CHART_CACHE_DIR')
+                )
+    return _chart_renderer
@@ -0,0 +1,141 @@
+import json
+import os
+import shutil
+import uuid
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+SCHEMA_FILE = 'schema.json'
+FORMAT_VERSION = 1
+
+def _codes_dtype(n_categories: int) -> np.dtype:
+    """Menor dtype inteiro capaz de armazenar os códigos das categorias (e -1)."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+def write_dataset(df: pd.DataFrame, directory: str) -> Dict[str, Any]:
+    """
+    Grava um DataFrame no formato colunar (um `.npy` por coluna + schema).
+
+    Colunas numéricas são gravadas no dtype original; colunas categóricas
+    ou de texto viram códigos inteiros compactos, com as categorias no
+    schema. A escrita é feita em um diretório temporário renomeado ao
+    final, de modo que leitores nunca veem um dataset incompleto.
+
+    Args:
+        df: Dados a gravar
+        directory: Diretório de destino (substituído se existir)
+
+    Returns:
+        Schema gravado
+    """
+    parent = os.path.dirname(os.path.abspath(directory))
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = os.path.join(parent, f".tmp-{uuid.uuid4().hex}")
+    os.makedirs(tmp_dir)
+
+    schema = {
+        'format_version': FORMAT_VERSION,
+        'created_at': datetime.utcnow().isoformat(),
+        'n_rows': int(len(df)),
+        'columns': {}
+    }
+
+    try:
+        for i, (name, values) in enumerate(df.items()):
+            file_name = f"{i:03d}.npy"
+            path = os.path.join(tmp_dir, file_name)
+
+            if not pd.api.types.is_numeric_dtype(values.dtype):
+                categorical = values.astype('category').cat
+                categories = [str(c) for c in categorical.categories]
+                np.save(path, categorical.codes.to_numpy().astype(_codes_dtype(len(categories))))
+                schema['columns'][name] = {'kind': 'categorical', 'file': file_name, 'categories': categories}
+            else:
+                array = values.to_numpy()
+                np.save(path, np.ascontiguousarray(array))
+                schema['columns'][name] = {'kind': 'numerical', 'file': file_name, 'dtype': array.dtype.str}
+
+        with open(os.path.join(tmp_dir, SCHEMA_FILE), 'w', encoding='utf-8') as f:
+            json.dump(schema, f, ensure_ascii=False, indent=2)
+
+        shutil.rmtree(directory, ignore_errors=True)
+        os.rename(tmp_dir, directory)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    return schema
+
+class ColumnarDataset:
+    """
+    Dataset colunar gravado por `write_dataset`.
+
+    Cada coluna é aberta com memory-map apenas quando pedida: abrir o
+    dataset lê somente o schema, e uma projeção de colunas só toca os
+    arquivos (e as páginas) dessas colunas.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        schema_path = os.path.join(directory, SCHEMA_FILE)
+        if not os.path.exists(schema_path):
+            raise FileNotFoundError(f"Dataset colunar não encontrado em {directory}")
+
+        with open(schema_path, 'r', encoding='utf-8') as f:
+            self.schema = json.load(f)
+
+        if self.schema.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Versão de formato não suportada: {self.schema.get('format_version')}")
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self.schema['columns'])
+
+    def __len__(self) -> int:
+        return self.schema['n_rows']
+
+    def column(self, name: str, mmap_mode: Optional[str] = 'r') -> Any:
+        """
+        Lê uma coluna.
+
+        Args:
+            name: Nome da coluna
+            mmap_mode: Modo do memory-map (None carrega em memória)
+
+        Returns:
+            np.ndarray (numérica) ou pd.Series categórica sobre os códigos
+        """
+        try:
+            meta = self.schema['columns'][name]
+        except KeyError:
+            raise KeyError(f"Coluna inexistente no dataset: {name}")
+
+        array = np.load(os.path.join(self.directory, meta['file']), mmap_mode=mmap_mode)
+        if meta['kind'] == 'numerical':
+            return array
+
+        dtype = pd.CategoricalDtype(meta['categories'])
+        return pd.Series(pd.Categorical.from_codes(array, dtype=dtype), name=name, copy=False)
+
+    def columns(self, names: Optional[Sequence[str]] = None, mmap_mode: Optional[str] = 'r') -> Dict[str, Any]:
+        """
+        Projeção de colunas como mapeamento nome -> valores.
+
+        O mapeamento é aceito diretamente pelo FeatureEncoder, sem montar
+        um DataFrame.
+
+        Args:
+            names: Colunas desejadas (padrão: todas)
+            mmap_mode: Modo do memory-map (None carrega em memória)
+        """
+        return {name: self.column(name, mmap_mode) for name in (names or self.column_names)}
+
+    def to_frame(self, names: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Carrega as colunas pedidas em um DataFrame (cópia em memória)."""
+        return pd.DataFrame(self.columns(names, mmap_mode=None))
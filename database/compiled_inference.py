@@ -0,0 +1,250 @@
+import json
+import os
+import shutil
+import uuid
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+from .model_registry import ModelRegistry
+from .model_server import PredictionError
+
+COMPILED_DIR = 'compiled'
+META_FILE = 'meta.json'
+
+class CompilationError(Exception):
+    """Exceção para modelos que não podem ser compilados."""
+    pass
+
+def compile_model(bundle: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Converte um bundle do registro em arrays numpy simples.
+
+    Suporta DecisionTreeClassifier e GaussianNB precedidos do
+    StandardScaler (ver `make_model_pipeline`).
+
+    Args:
+        bundle: Bundle carregado de `ModelRegistry.load`
+
+    Returns:
+        Dict com 'arrays' (nome -> np.ndarray) e 'meta' (dados em JSON)
+    """
+    from sklearn.naive_bayes import GaussianNB
+    from sklearn.tree import DecisionTreeClassifier
+
+    pipeline = bundle['model']
+    scaler = pipeline.named_steps['scale']
+    model = pipeline.named_steps['model']
+
+    # O StandardScaler converte mean_ e scale_ para o dtype da entrada (float32)
+    arrays = {
+        'scaler_mean': np.asarray(scaler.mean_, dtype=np.float32),
+        'scaler_scale': np.asarray(scaler.scale_, dtype=np.float32)
+    }
+
+    if isinstance(model, DecisionTreeClassifier):
+        tree = model.tree_
+        value = tree.value[:, 0, :]
+        arrays.update({
+            'tree_children_left': tree.children_left.astype(np.int32),
+            'tree_children_right': tree.children_right.astype(np.int32),
+            'tree_feature': tree.feature.astype(np.int32),
+            'tree_threshold': tree.threshold.astype(np.float64),
+            'tree_proba': (value / value.sum(axis=1, keepdims=True)).astype(np.float64)
+        })
+        kind = 'decision_tree'
+    elif isinstance(model, GaussianNB):
+        arrays.update({
+            'nb_theta': model.theta_.astype(np.float64),
+            'nb_var': model.var_.astype(np.float64),
+            'nb_log_prior': np.log(model.class_prior_).astype(np.float64)
+        })
+        kind = 'gaussian_nb'
+    else:
+        raise CompilationError(f"Modelo não suportado para compilação: {type(model).__name__}")
+
+    classes = [str(bundle['label_encoder'].classes_[int(c)]) for c in model.classes_]
+    meta = {
+        'kind': kind,
+        'version': bundle['version'],
+        'model_name': bundle['model_name'],
+        'classes': classes,
+        'numerical_features': list(bundle['feature_schema']['numerical_features']),
+        'categorical_features': bundle['feature_schema']['categorical_features'],
+        'training_profile': bundle.get('training_profile')
+    }
+    return {'arrays': arrays, 'meta': meta}
+
+def export_compiled(registry: ModelRegistry, version: Optional[str] = None) -> str:
+    """
+    Compila uma versão do registro e grava os arrays em `.npy`.
+
+    Args:
+        registry: Registro de modelos
+        version: Versão desejada (padrão: versão promovida)
+
+    Returns:
+        Diretório com o modelo compilado
+    """
+    bundle = registry.load(version, mmap_mode=None)
+    compiled = compile_model(bundle)
+    target = os.path.join(registry.versions_dir, bundle['version'], COMPILED_DIR)
+
+    tmp_dir = os.path.join(registry.root, f".tmp-{uuid.uuid4().hex}")
+    os.makedirs(tmp_dir)
+    try:
+        for name, array in compiled['arrays'].items():
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(array))
+        with open(os.path.join(tmp_dir, META_FILE), 'w', encoding='utf-8') as f:
+            json.dump(compiled['meta'], f, ensure_ascii=False, indent=2)
+        shutil.rmtree(target, ignore_errors=True)
+        os.rename(tmp_dir, target)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    return target
+
+class CompiledPredictor:
+    """
+    Preditor vetorizado em numpy puro para modelos compilados.
+
+    Carrega os arrays com memory-map (compartilhados entre workers pelo
+    page cache) e não importa o scikit-learn. Expõe a mesma interface de
+    `ServingBundle`, podendo substituí-lo no ModelServer.
+    """
+
+    def __init__(self, meta: Dict[str, Any], arrays: Dict[str, np.ndarray]):
+        self.kind = meta['kind']
+        self.version = meta['version']
+        self.model_name = meta['model_name']
+        self.classes = meta['classes']
+        self.numerical_features = meta['numerical_features']
+        self.categories = meta['categorical_features']
+        self.categorical_features = list(self.categories)
+        self._category_codes = {
+            feature: {value: code for code, value in enumerate(values)}
+            for feature, values in self.categories.items()
+        }
+        self.training_profile = meta.get('training_profile')
+        self.arrays = arrays
+        self.drift = None
+
+    @classmethod
+    def load(cls, directory: str) -> 'CompiledPredictor':
+        """Carrega um modelo compilado por `export_compiled`."""
+        with open(os.path.join(directory, META_FILE), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+
+        arrays = {
+            entry.name[:-len('.npy')]: np.load(entry.path, mmap_mode='r')
+            for entry in os.scandir(directory) if entry.name.endswith('.npy')
+        }
+        return cls(meta, arrays)
+
+    def validate(self, record: Dict[str, Any], index: int = 0) -> None:
+        """Valida um registro de entrada sem vetorizá-lo."""
+        missing = [f for f in self.numerical_features + self.categorical_features if f not in record]
+        if missing:
+            raise PredictionError(f"Features ausentes no registro {index}: {', '.join(missing)}")
+
+        for feature in self.numerical_features:
+            try:
+                float(record[feature])
+            except (TypeError, ValueError):
+                raise PredictionError(f"Valor inválido para {feature} no registro {index}")
+
+        for feature in self.categorical_features:
+            if record[feature] not in self._category_codes[feature]:
+                raise PredictionError(f"Valor desconhecido para {feature} no registro {index}: {record[feature]}")
+
+    def vectorize(self, records: List[Dict[str, Any]]) -> np.ndarray:
+        """Converte registros na matriz de features (mesma ordem do FeatureEncoder)."""
+        n_numerical = len(self.numerical_features)
+        X = np.empty((len(records), n_numerical + len(self.categorical_features)), dtype=np.float32)
+
+        for j, feature in enumerate(self.numerical_features):
+            X[:, j] = [float(record[feature]) for record in records]
+
+        for j, feature in enumerate(self.categorical_features, start=n_numerical):
+            codes = self._category_codes[feature]
+            X[:, j] = [codes[record[feature]] for record in records]
+
+        return X
+
+    def _standardize(self, X: np.ndarray) -> np.ndarray:
+        # Mesma aritmética do StandardScaler: média e escala convertidas para
+        # float32 antes da operação (versões exportadas antes guardavam float64)
+        X = np.array(X, dtype=np.float32)
+        X -= self.arrays['scaler_mean'].astype(np.float32, copy=False)
+        X /= self.arrays['scaler_scale'].astype(np.float32, copy=False)
+        return X
+
+    def _tree_proba(self, X: np.ndarray) -> np.ndarray:
+        left = self.arrays['tree_children_left']
+        right = self.arrays['tree_children_right']
+        feature = self.arrays['tree_feature']
+        threshold = self.arrays['tree_threshold']
+
+        rows = np.arange(len(X))
+        node = np.zeros(len(X), dtype=np.int32)
+        active = rows[left[node] != -1]
+
+        # Cada iteração desce um nível para todas as amostras ainda em nós internos
+        while active.size:
+            current = node[active]
+            go_left = X[active, feature[current]] <= threshold[current]
+            node[active] = np.where(go_left, left[current], right[current])
+            active = active[left[node[active]] != -1]
+
+        return np.asarray(self.arrays['tree_proba'])[node]
+
+    def _nb_proba(self, X: np.ndarray) -> np.ndarray:
+        theta, var = self.arrays['nb_theta'], self.arrays['nb_var']
+        X = X.astype(np.float64)
+
+        joint = (
+            self.arrays['nb_log_prior']
+            - 0.5 * np.log(2.0 * np.pi * var).sum(axis=1)
+            - 0.5 * (((X[:, None, :] - theta) ** 2) / var).sum(axis=2)
+        )
+        joint -= joint.max(axis=1, keepdims=True)
+        proba = np.exp(joint)
+        return proba / proba.sum(axis=1, keepdims=True)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Probabilidades por classe para uma matriz de features não normalizada."""
+        X = self._standardize(X)
+        return self._tree_proba(X) if self.kind == 'decision_tree' else self._nb_proba(X)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Classe predita para uma matriz de features não normalizada."""
+        return np.asarray(self.classes)[self.predict_proba(X).argmax(axis=1)]
+
+    def predict_matrix(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Classes preditas e probabilidades para uma matriz de features."""
+        probabilities = self.predict_proba(X)
+        return np.asarray(self.classes)[probabilities.argmax(axis=1)], probabilities
+
+    def predict_records(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Executa uma predição vetorizada para um lote de registros."""
+        return self.format_predictions(*self.predict_matrix(self.vectorize(records)))
+
+    def format_predictions(self, predictions: np.ndarray, probabilities: np.ndarray) -> List[Dict[str, Any]]:
+        """Converte o resultado de `predict_matrix` na resposta da API."""
+        return [
+            {
+                'performance': str(predicted),
+                'model': self.model_name,
+                'version': self.version,
+                'probabilities': {
+                    cls: round(float(p), 4) for cls, p in zip(self.classes, row)
+                }
+            }
+            for predicted, row in zip(predictions, probabilities)
+        ]
+
+    def warm_up(self) -> None:
+        """Executa uma predição descartável para carregar as páginas dos arrays."""
+        n_features = len(self.numerical_features) + len(self.categorical_features)
+        self.predict_proba(np.zeros((1, n_features), dtype=np.float32))
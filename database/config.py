@@ -1,8 +1,32 @@
+import logging
 import os
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, make_url
 
-# Instância global do SQLAlchemy
-db = SQLAlchemy()
+from database.routing import RoutingSession, REPLICA_BIND_PREFIX
+
+logger = logging.getLogger(__name__)
+
+# Instância global do SQLAlchemy (leituras de handlers read_only vão para as réplicas)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+def _pool_options(prefix, pool_size, max_overflow):
+    """Opções de pool de um engine, configuráveis por variáveis de ambiente com o prefixo dado."""
+    return {
+        'pool_size': int(os.environ.get(f'{prefix}_POOL_SIZE', str(pool_size))),
+        'max_overflow': int(os.environ.get(f'{prefix}_MAX_OVERFLOW', str(max_overflow))),
+        # Descarta conexões derrubadas (failover, reinício do banco) antes de usá-las
+        'pool_pre_ping': os.environ.get(f'{prefix}_POOL_PRE_PING', '1') == '1',
+        # Recicla conexões antes dos timeouts de ociosidade do servidor/proxy
+        'pool_recycle': int(os.environ.get(f'{prefix}_POOL_RECYCLE', '1800')),
+    }
+
+def engine_options(url, options):
+    """Remove as opções de pool que não se aplicam a um SQLite em memória."""
+    url = make_url(url)
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return {}
+    return dict(options)
 
 class DatabaseConfig:
     """Configurações do banco de dados."""
@@ -17,31 +41,98 @@ class DatabaseConfig:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or SQLITE_DATABASE_URI
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Réplicas de leitura (URLs separadas por vírgula), usadas pelos handlers read_only
+    REPLICA_DATABASE_URIS = [u.strip() for u in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if u.strip()]
+    
+    # Pools por engine: o primário recebe as escritas; as réplicas, as leituras
+    PRIMARY_POOL_OPTIONS = _pool_options('DB', pool_size=10, max_overflow=20)
+    REPLICA_POOL_OPTIONS = _pool_options('DB_REPLICA', pool_size=20, max_overflow=40)
+    
+    # Perfil de concorrência do SQLite (SQLITE_CONCURRENCY=0 desativa)
+    SQLITE_CONCURRENCY = os.environ.get('SQLITE_CONCURRENCY', '1') == '1'
+    SQLITE_PRAGMAS = {
+        # Leitores não bloqueiam o escritor (e vice-versa)
+        'journal_mode': 'WAL',
+        # Espera pelo lock em vez de falhar com "database is locked"
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', '5000')),
+        # Seguro com WAL: só o último commit pode se perder numa queda de energia
+        'synchronous': 'NORMAL',
+        'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024))),
+        # Valor negativo: tamanho em KiB (64 MB)
+        'cache_size': -64000,
+    }
+    
     @staticmethod
     def init_app(app):
         """Inicializa a configuração do banco de dados na aplicação Flask."""
         app.config['SQLALCHEMY_DATABASE_URI'] = DatabaseConfig.SQLALCHEMY_DATABASE_URI
         app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = DatabaseConfig.SQLALCHEMY_TRACK_MODIFICATIONS
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(
+            DatabaseConfig.SQLALCHEMY_DATABASE_URI, DatabaseConfig.PRIMARY_POOL_OPTIONS
+        )
+        app.config['SQLALCHEMY_BINDS'] = {
+            f'{REPLICA_BIND_PREFIX}{i}': {'url': url, **engine_options(url, DatabaseConfig.REPLICA_POOL_OPTIONS)}
+            for i, url in enumerate(DatabaseConfig.REPLICA_DATABASE_URIS)
+        }
         
         # Inicializa o SQLAlchemy com a aplicação
         db.init_app(app)
         
+        if DatabaseConfig.SQLITE_CONCURRENCY:
+            with app.app_context():
+                for engine in db.engines.values():
+                    apply_sqlite_pragmas(engine)
+        
         return db
 
+def apply_sqlite_pragmas(engine, pragmas=None):
+    """
+    Aplica os PRAGMAs de concorrência a cada nova conexão de um engine SQLite.
+    
+    Não faz nada em outros bancos. Os PRAGMAs valem por conexão (exceto o
+    journal_mode=WAL, que fica gravado no arquivo), por isso são executados
+    no evento 'connect' do pool.
+    
+    Args:
+        engine: Engine do SQLAlchemy
+        pragmas: PRAGMAs a aplicar (padrão: DatabaseConfig.SQLITE_PRAGMAS)
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+    pragmas = DatabaseConfig.SQLITE_PRAGMAS if pragmas is None else pragmas
+    
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+    
+    logger.debug(f"PRAGMAs de concorrência do SQLite aplicados a {engine.url.database or ':memory:'}")
+
 def create_tables(app):
     """Cria todas as tabelas do banco de dados."""
     with app.app_context():
         # Importa todos os modelos para garantir que sejam registrados
-        from models import User, StudySession, Question, Progress
+        from models import User, StudySession, Question, Progress, StudentFeatures, StudentPrediction
         
-        # Cria todas as tabelas
-        db.create_all()
+        # Cria todas as tabelas (só no primário; as réplicas recebem o schema pela replicação)
+        db.create_all(bind_key=None)
         print("Tabelas do banco de dados criadas com sucesso!")
+        
+        # As migrações não rodam na inicialização (vários workers subiriam ao
+        # mesmo tempo): são aplicadas no deploy com `flask db-migrate`
+        from database.migrations import pending_migrations
+        pending = pending_migrations(db.engine)
+        if pending:
+            logger.warning(f"Migrações pendentes: {', '.join(pending)}; execute `flask db-migrate`")
 
 def drop_tables(app):
     """Remove todas as tabelas do banco de dados."""
     with app.app_context():
-        db.drop_all()
+        db.drop_all(bind_key=None)
         print("Tabelas do banco de dados removidas!")
 
 def reset_database(app):
@@ -0,0 +1,213 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+from sqlalchemy import select, func, cast, type_coerce, literal, null, union_all, Integer, String, DateTime
+
+from database.config import db
+from models import StudySession, Progress, StudentPrediction
+
+RECENT_SESSIONS = 5
+
+def _isoformat(value) -> Optional[str]:
+    return value.isoformat() if value else None
+
+def _row(kind: str, id=None, i1=None, i2=None, i3=None, i4=None, s1=None, s2=None, s3=None,
+         s4=None, s5=None, d1=None, d2=None):
+    """
+    Colunas de uma linha do rollup.
+
+    Todas as partes do UNION ALL têm o mesmo layout (tipo da linha, inteiros,
+    textos e datas); as colunas não usadas ficam nulas. O tipo é aplicado só
+    no lado do Python (`type_coerce`), pois um CAST no SQLite transformaria
+    as datas em números.
+    """
+    def typed(value, type_):
+        return type_coerce(null() if value is None else value, type_)
+
+    return [
+        literal(kind, String).label('kind'),
+        typed(id, Integer).label('id'),
+        *[typed(v, Integer).label(f'i{n}') for n, v in enumerate((i1, i2, i3, i4), start=1)],
+        *[typed(v, String).label(f's{n}') for n, v in enumerate((s1, s2, s3, s4, s5), start=1)],
+        *[typed(v, DateTime).label(f'd{n}') for n, v in enumerate((d1, d2), start=1)]
+    ]
+
+def dashboard_query(user_id: int):
+    """
+    Consulta única com todos os dados do dashboard de um usuário.
+
+    Une (UNION ALL) os totais calculados a partir dos contadores das
+    sessões, as sessões recentes, o progresso por tópico e a predição do job
+    em lote, resolvendo o dashboard em uma única ida ao banco.
+    """
+    totals = select(*_row(
+        'totals',
+        i1=func.count(StudySession.id),
+        i2=func.coalesce(func.sum(StudySession.questions_count), 0)
+    )).where(StudySession.user_id == user_id)
+
+    recent = select(StudySession).where(
+        StudySession.user_id == user_id
+    ).order_by(StudySession.start_time.desc(), StudySession.id.desc()).limit(RECENT_SESSIONS).subquery()
+    sessions = select(*_row(
+        'session', id=recent.c.id, i1=recent.c.duration, i2=recent.c.score,
+        i3=recent.c.questions_count, i4=recent.c.correct_count,
+        d1=recent.c.start_time, d2=recent.c.end_time
+    ))
+
+    progress = select(*_row(
+        'progress', id=Progress.id, i1=Progress.score, s1=Progress.topic, d1=Progress.last_updated
+    )).where(Progress.user_id == user_id)
+
+    prediction = select(*_row(
+        'prediction', id=StudentPrediction.user_id, s1=StudentPrediction.performance,
+        s2=StudentPrediction.risk_level, s3=StudentPrediction.model_name,
+        s4=StudentPrediction.model_version, s5=cast(StudentPrediction.probabilities, String),
+        d1=StudentPrediction.scored_at
+    )).where(StudentPrediction.user_id == user_id)
+
+    return union_all(totals, sessions, progress, prediction)
+
+def build_dashboard(user_id: int, session=None) -> Dict[str, Any]:
+    """
+    Monta o rollup do dashboard (totais, sessões recentes, progresso e predição).
+
+    Args:
+        user_id: ID do usuário
+        session: Sessão do SQLAlchemy (padrão: db.session)
+
+    Returns:
+        Dict no formato da resposta de /api/dashboard
+    """
+    session = session or db.session
+    dashboard = {
+        'stats': {'total_sessions': 0, 'total_questions': 0},
+        'recent_sessions': [],
+        'progress': [],
+        'prediction': None
+    }
+
+    for row in session.execute(dashboard_query(user_id)):
+        if row.kind == 'totals':
+            dashboard['stats'] = {'total_sessions': row.i1, 'total_questions': row.i2}
+        elif row.kind == 'session':
+            dashboard['recent_sessions'].append({
+                'id': row.id,
+                'user_id': user_id,
+                'start_time': _isoformat(row.d1),
+                'end_time': _isoformat(row.d2),
+                'duration': row.i1,
+                'score': row.i2,
+                'questions_count': row.i3,
+                'correct_count': row.i4
+            })
+        elif row.kind == 'progress':
+            dashboard['progress'].append({
+                'id': row.id,
+                'user_id': user_id,
+                'topic': row.s1,
+                'score': row.i1,
+                'last_updated': _isoformat(row.d1)
+            })
+        elif row.kind == 'prediction':
+            dashboard['prediction'] = {
+                'user_id': user_id,
+                'performance': row.s1,
+                'risk_level': row.s2,
+                'probabilities': json.loads(row.s5) if row.s5 else None,
+                'model_name': row.s3,
+                'model_version': row.s4,
+                'scored_at': _isoformat(row.d1)
+            }
+
+    # A ordem das linhas de um UNION ALL não é garantida
+    dashboard['recent_sessions'].sort(key=lambda s: (s['start_time'] or '', s['id']), reverse=True)
+    dashboard['progress'].sort(key=lambda p: (p['last_updated'] or '', p['id']), reverse=True)
+    return dashboard
+
+class DashboardCache:
+    """
+    Cache em memória do rollup do dashboard, por usuário.
+
+    As rotas que alteram sessões, perguntas ou progresso chamam
+    `invalidate` após o commit. Como o cache é por processo, escritas
+    atendidas por outro worker (ou pelo job de pontuação em lote) só
+    aparecem após o `ttl`; as entradas menos usadas são descartadas acima de
+    `max_users`.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_users: int = 10000):
+        self.ttl = ttl
+        self.max_users = max_users
+        self._entries: 'OrderedDict[int, tuple]' = OrderedDict()
+        # Consultas em andamento por usuário e usuários invalidados durante elas
+        self._building: Dict[int, int] = {}
+        self._stale = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int, session=None) -> Dict[str, Any]:
+        """Retorna o dashboard do usuário, consultando o banco apenas se não estiver em cache."""
+        user_id = int(user_id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            self._building[user_id] = self._building.get(user_id, 0) + 1
+
+        try:
+            dashboard = build_dashboard(user_id, session)
+        except Exception:
+            with self._lock:
+                self._finish_build(user_id)
+            raise
+
+        with self._lock:
+            # Uma escrita concorrente invalidou o usuário: o resultado pode ser anterior a ela
+            if user_id not in self._stale:
+                self._entries[user_id] = (now + self.ttl, dashboard)
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self.max_users:
+                    self._entries.popitem(last=False)
+            self._finish_build(user_id)
+        return dashboard
+
+    def _finish_build(self, user_id: int) -> None:
+        self._building[user_id] -= 1
+        if not self._building[user_id]:
+            del self._building[user_id]
+            self._stale.discard(user_id)
+
+    def invalidate(self, user_id: int) -> None:
+        """Descarta o dashboard em cache de um usuário."""
+        user_id = int(user_id)
+        with self._lock:
+            self._entries.pop(user_id, None)
+            if user_id in self._building:
+                self._stale.add(user_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+# Instância por processo (cada worker do gunicorn tem o seu cache)
+_dashboard_cache = None
+_dashboard_cache_lock = threading.Lock()
+
+def get_dashboard_cache() -> DashboardCache:
+    """Retorna o cache de dashboards do processo atual, criando-o se necessário."""
+    global _dashboard_cache
+    if _dashboard_cache is None:
+        with _dashboard_cache_lock:
+            if _dashboard_cache is None:
+                _dashboard_cache = DashboardCache(ttl=float(os.environ.get('DASHBOARD_CACHE_TTL', '30')))
+    return _dashboard_cache
@@ -0,0 +1,406 @@
+import json
+import logging
+import os
+import shutil
+import socket
+import threading
+import time
+import uuid
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Limites usuais do PSI: < 0.1 estável, 0.1-0.25 atenção, > 0.25 drift
+PSI_WARNING = 0.1
+PSI_DRIFT = 0.25
+
+# Abaixo deste número de observações o PSI de uma feature não é confiável
+# (poucas amostras espalhadas em 10 bins geram PSI alto por acaso)
+MIN_DRIFT_SAMPLES = 200
+
+# Janela de tráfego do relatório; os resumos são guardados em blocos de
+# tempo (1/24 da janela) e blocos mais antigos que a janela são descartados
+DRIFT_WINDOW_SECONDS = 24 * 3600
+
+def build_training_profile(X: np.ndarray, numerical_features: List[str],
+                           categories: Dict[str, List[str]], n_bins: int = 10) -> Dict[str, Any]:
+    """
+    Resume a distribuição das features de treinamento.
+
+    As features numéricas recebem bins fixos pelos quantis do treino (cada
+    bin com ~1/n_bins das amostras); as categóricas, a frequência de cada
+    categoria. O resultado é JSON e acompanha o modelo no registro.
+
+    Args:
+        X: Matriz de treino na ordem do FeatureEncoder (numéricas, depois códigos)
+        numerical_features: Nomes das features numéricas
+        categories: Categorias de cada feature categórica
+        n_bins: Número de bins das features numéricas
+
+    Returns:
+        Dict com média, desvio, limites e proporções de cada feature
+    """
+    X = np.asarray(X, dtype=np.float64)
+    quantiles = np.linspace(0, 1, n_bins + 1)[1:-1]
+    profile = {'n_samples': int(len(X)), 'numerical': {}, 'categorical': {}}
+
+    for j, feature in enumerate(numerical_features):
+        column = X[:, j]
+        edges = np.unique(np.quantile(column, quantiles))
+        counts = np.bincount(np.searchsorted(edges, column, side='right'), minlength=len(edges) + 1)
+        profile['numerical'][feature] = {
+            'mean': float(column.mean()),
+            'std': float(column.std()),
+            'edges': edges.tolist(),
+            'proportions': (counts / len(column)).tolist()
+        }
+
+    for j, (feature, values) in enumerate(categories.items(), start=len(numerical_features)):
+        counts = np.bincount(X[:, j].astype(np.int64), minlength=len(values))
+        profile['categorical'][feature] = {
+            'categories': list(values),
+            'proportions': (counts / len(X)).tolist()
+        }
+
+    return profile
+
+def population_stability_index(expected: np.ndarray, actual: np.ndarray, eps: float = 1e-4) -> float:
+    """PSI entre duas distribuições de proporções sobre os mesmos bins."""
+    expected = np.clip(np.asarray(expected, dtype=np.float64), eps, None)
+    actual = np.clip(np.asarray(actual, dtype=np.float64), eps, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+def ks_statistic(expected: np.ndarray, actual: np.ndarray) -> float:
+    """Estatística KS aproximada pelos histogramas (maior distância entre as CDFs nos bins)."""
+    return float(np.max(np.abs(np.cumsum(expected) - np.cumsum(actual))))
+
+class FeatureSummary:
+    """
+    Resumo em memória constante das features observadas em produção.
+
+    Guarda contagem, média e M2 (Welford) das features numéricas,
+    histogramas nos bins do perfil de treinamento e contagens por
+    categoria. Dois resumos podem ser combinados com `merge`, o que permite
+    somar o tráfego de vários workers.
+    """
+
+    def __init__(self, profile: Dict[str, Any]):
+        self.numerical_features = list(profile['numerical'])
+        self.categorical_features = list(profile['categorical'])
+        self._edges = [np.asarray(profile['numerical'][f]['edges']) for f in self.numerical_features]
+
+        n_numerical = len(self.numerical_features)
+        self.count = 0
+        self.mean = np.zeros(n_numerical)
+        self.m2 = np.zeros(n_numerical)
+        self.histograms = [np.zeros(len(edges) + 1, dtype=np.int64) for edges in self._edges]
+        self.category_counts = [
+            np.zeros(len(profile['categorical'][f]['categories']), dtype=np.int64)
+            for f in self.categorical_features
+        ]
+
+    def _combine(self, count: int, mean: np.ndarray, m2: np.ndarray) -> None:
+        """Combina média e M2 de outro bloco (algoritmo paralelo de Chan)."""
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (count / total)
+        self.m2 = self.m2 + m2 + delta ** 2 * (self.count * count / total)
+        self.count = total
+
+    def update(self, X: np.ndarray) -> None:
+        """
+        Acumula um lote de observações.
+
+        Args:
+            X: Matriz na ordem do FeatureEncoder (numéricas, depois códigos)
+        """
+        if not len(X):
+            return
+
+        n_numerical = len(self.numerical_features)
+        numerical = np.asarray(X[:, :n_numerical], dtype=np.float64)
+        batch_mean = numerical.mean(axis=0)
+        self._combine(len(X), batch_mean, ((numerical - batch_mean) ** 2).sum(axis=0))
+
+        for j, edges in enumerate(self._edges):
+            bins = np.searchsorted(edges, numerical[:, j], side='right')
+            self.histograms[j] += np.bincount(bins, minlength=len(edges) + 1)
+
+        for j, counts in enumerate(self.category_counts):
+            codes = np.asarray(X[:, n_numerical + j], dtype=np.int64)
+            counts += np.bincount(codes, minlength=len(counts))[:len(counts)]
+
+    def merge(self, other: 'FeatureSummary') -> 'FeatureSummary':
+        """Soma outro resumo a este (in-place) e retorna o próprio resumo."""
+        if other.count:
+            self._combine(other.count, other.mean, other.m2)
+        for histogram, other_histogram in zip(self.histograms, other.histograms):
+            histogram += other_histogram
+        for counts, other_counts in zip(self.category_counts, other.category_counts):
+            counts += other_counts
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializa o resumo para JSON."""
+        return {
+            'count': self.count,
+            'mean': self.mean.tolist(),
+            'm2': self.m2.tolist(),
+            'histograms': [h.tolist() for h in self.histograms],
+            'category_counts': [c.tolist() for c in self.category_counts]
+        }
+
+    @classmethod
+    def from_dict(cls, profile: Dict[str, Any], data: Dict[str, Any]) -> 'FeatureSummary':
+        """Reconstrói um resumo serializado com `to_dict`."""
+        summary = cls(profile)
+        summary.count = data['count']
+        summary.mean = np.asarray(data['mean'], dtype=np.float64)
+        summary.m2 = np.asarray(data['m2'], dtype=np.float64)
+        summary.histograms = [np.asarray(h, dtype=np.int64) for h in data['histograms']]
+        summary.category_counts = [np.asarray(c, dtype=np.int64) for c in data['category_counts']]
+        return summary
+
+def drift_report(profile: Dict[str, Any], summary: FeatureSummary,
+                 min_samples: int = MIN_DRIFT_SAMPLES) -> Dict[str, Any]:
+    """
+    Compara o tráfego observado com o perfil de treinamento.
+
+    Args:
+        profile: Perfil de treinamento (ver `build_training_profile`)
+        summary: Resumo do tráfego observado
+        min_samples: Observações mínimas por feature para calcular o PSI;
+            abaixo disso a feature recebe o status 'insufficient_data'
+
+    Returns:
+        Dict com PSI, KS e status por feature
+    """
+    def status(psi: float) -> str:
+        return 'drift' if psi > PSI_DRIFT else 'warning' if psi > PSI_WARNING else 'ok'
+
+    features = {}
+    if summary.count:
+        for j, feature in enumerate(summary.numerical_features):
+            observations = int(summary.histograms[j].sum())
+            if observations < min_samples:
+                features[feature] = {'observations': observations, 'status': 'insufficient_data'}
+                continue
+            reference = profile['numerical'][feature]
+            expected = np.asarray(reference['proportions'])
+            actual = summary.histograms[j] / observations
+            psi = population_stability_index(expected, actual)
+            std = reference['std'] or 1.0
+            features[feature] = {
+                'psi': round(psi, 4),
+                'ks': round(ks_statistic(expected, actual), 4),
+                'mean': float(summary.mean[j]),
+                'std': float(np.sqrt(summary.m2[j] / summary.count)),
+                'mean_shift': round((float(summary.mean[j]) - reference['mean']) / std, 4),
+                'status': status(psi)
+            }
+
+        for j, feature in enumerate(summary.categorical_features):
+            observations = int(summary.category_counts[j].sum())
+            if observations < min_samples:
+                features[feature] = {'observations': observations, 'status': 'insufficient_data'}
+                continue
+            expected = np.asarray(profile['categorical'][feature]['proportions'])
+            actual = summary.category_counts[j] / observations
+            psi = population_stability_index(expected, actual)
+            features[feature] = {
+                'psi': round(psi, 4),
+                'ks': round(ks_statistic(expected, actual), 4),
+                'proportions': dict(zip(profile['categorical'][feature]['categories'],
+                                        np.round(actual, 4).tolist())),
+                'status': status(psi)
+            }
+
+    statuses = [f['status'] for f in features.values() if f['status'] != 'insufficient_data']
+    if not features:
+        overall = 'no_data'
+    elif not statuses:
+        overall = 'insufficient_data'
+    else:
+        overall = 'drift' if 'drift' in statuses else 'warning' if 'warning' in statuses else 'ok'
+    return {
+        'observations': summary.count,
+        'training_samples': profile['n_samples'],
+        'min_samples': min_samples,
+        'status': overall,
+        'features': features
+    }
+
+class DriftMonitor:
+    """
+    Monitor de drift das features de uma versão do modelo.
+
+    Cada worker acumula os seus próprios `FeatureSummary`, um por bloco de
+    `bucket_seconds`, e a cada `flush_interval` segundos grava os blocos
+    em arquivos próprios no diretório compartilhado da versão. O relatório
+    combina os blocos de todos os workers dentro da janela
+    `window_seconds`; arquivos de blocos mais antigos (inclusive de workers
+    que já terminaram) são removidos.
+    """
+
+    def __init__(self, profile: Dict[str, Any], version: str, directory: Optional[str] = None,
+                 flush_interval: float = 60.0, window_seconds: float = DRIFT_WINDOW_SECONDS,
+                 bucket_seconds: Optional[float] = None):
+        """
+        Args:
+            profile: Perfil de treinamento gravado com o modelo
+            version: Versão do modelo monitorada
+            directory: Diretório compartilhado entre workers (None mantém o
+                resumo apenas neste processo)
+            flush_interval: Intervalo mínimo entre gravações, em segundos
+            window_seconds: Janela de tráfego considerada no relatório
+            bucket_seconds: Duração de cada bloco de resumo (padrão: 1/24 da janela)
+        """
+        self.profile = profile
+        self.version = version
+        self.directory = os.path.join(directory, version) if directory else None
+        self.flush_interval = flush_interval
+        self.bucket_seconds = min(bucket_seconds or window_seconds / 24, window_seconds)
+        self.n_buckets = max(1, int(window_seconds // self.bucket_seconds))
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._buckets: Dict[int, FeatureSummary] = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def _current_bucket(self) -> int:
+        # Relógio de parede: os blocos precisam coincidir entre processos
+        return int(time.time() // self.bucket_seconds)
+
+    def _is_expired(self, bucket: int) -> bool:
+        return bucket <= self._current_bucket() - self.n_buckets
+
+    def _snapshot(self) -> Tuple[FeatureSummary, Set[int]]:
+        """
+        Resumo em memória deste worker na janela e os blocos que ele contém.
+
+        Os dois são lidos sob o mesmo lock: um `flush` concorrente que grave
+        e descarte um bloco o faz inteiramente antes ou depois da leitura.
+        """
+        with self._lock:
+            summary = FeatureSummary(self.profile)
+            for bucket, bucket_summary in self._buckets.items():
+                if not self._is_expired(bucket):
+                    summary.merge(bucket_summary)
+            return summary, set(self._buckets)
+
+    @property
+    def summary(self) -> FeatureSummary:
+        """Resumo deste worker dentro da janela."""
+        return self._snapshot()[0]
+
+    def observe(self, X: np.ndarray) -> None:
+        """Acumula as features de um lote de predições."""
+        bucket = self._current_bucket()
+        with self._lock:
+            summary = self._buckets.get(bucket)
+            if summary is None:
+                summary = self._buckets[bucket] = FeatureSummary(self.profile)
+                # Sem diretório, os blocos só existem em memória: descarta os expirados
+                if not self.directory:
+                    for expired in [b for b in self._buckets if self._is_expired(b)]:
+                        del self._buckets[expired]
+            summary.update(X)
+            due = self.directory and time.monotonic() - self._last_flush >= self.flush_interval
+
+        if due:
+            self.flush()
+
+    def _path(self, bucket: int) -> str:
+        return os.path.join(self.directory, f"{self.worker_id}.{bucket}.json")
+
+    def flush(self) -> None:
+        """Grava os blocos deste worker no diretório compartilhado (escrita atômica)."""
+        if not self.directory:
+            return
+
+        current = self._current_bucket()
+        with self._lock:
+            data = {bucket: summary.to_dict() for bucket, summary in self._buckets.items()}
+            self._last_flush = time.monotonic()
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            for bucket, summary_data in data.items():
+                path = self._path(bucket)
+                tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(summary_data, f)
+                os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Falha ao gravar o resumo de drift: {e}")
+            return
+
+        # Blocos fechados já estão em disco e não recebem mais observações
+        with self._lock:
+            for bucket in data:
+                if bucket < current:
+                    self._buckets.pop(bucket, None)
+
+    def merged(self) -> FeatureSummary:
+        """Combina os resumos de todos os workers na janela (incluindo o estado atual deste)."""
+        # Os arquivos deste worker cujos blocos ainda estão em memória já
+        # entram pelo snapshot e são ignorados na leitura do diretório
+        merged, own_buckets = self._snapshot()
+        own = {os.path.basename(self._path(bucket)) for bucket in own_buckets} if self.directory else set()
+
+        if self.directory and os.path.isdir(self.directory):
+            for entry in os.scandir(self.directory):
+                if not entry.name.endswith('.json') or entry.name in own:
+                    continue
+                try:
+                    bucket = int(entry.name[:-len('.json')].rsplit('.', 1)[-1])
+                except ValueError:
+                    bucket = None
+                if bucket is None or self._is_expired(bucket):
+                    # Bloco fora da janela (ou de um formato antigo): não é mais usado
+                    try:
+                        os.remove(entry.path)
+                    except OSError:
+                        pass
+                    continue
+                try:
+                    with open(entry.path, 'r', encoding='utf-8') as f:
+                        merged.merge(FeatureSummary.from_dict(self.profile, json.load(f)))
+                except (OSError, ValueError, KeyError) as e:
+                    logger.warning(f"Resumo de drift ignorado ({entry.name}): {e}")
+
+        return merged
+
+    def prune_other_versions(self) -> None:
+        """
+        Remove os diretórios de versões anteriores sem gravações dentro da janela.
+
+        Chamado quando esta versão entra em produção; diretórios com
+        gravações recentes (workers que ainda servem a versão anterior)
+        são mantidos.
+        """
+        if not self.directory:
+            return
+        root = os.path.dirname(self.directory)
+        cutoff = time.time() - self.n_buckets * self.bucket_seconds
+        try:
+            entries = [entry for entry in os.scandir(root) if entry.is_dir() and entry.name != self.version]
+        except OSError:
+            return
+
+        for entry in entries:
+            try:
+                newest = max((f.stat().st_mtime for f in os.scandir(entry.path)), default=0)
+                if newest < cutoff:
+                    shutil.rmtree(entry.path)
+                    logger.info(f"Resumos de drift da versão {entry.name} removidos")
+            except OSError as e:
+                logger.warning(f"Falha ao remover resumos de drift de {entry.name}: {e}")
+
+    def report(self) -> Dict[str, Any]:
+        """Relatório de drift da versão na janela, combinando todos os workers."""
+        report = drift_report(self.profile, self.merged())
+        report['version'] = self.version
+        report['window_seconds'] = self.n_buckets * self.bucket_seconds
+        return report
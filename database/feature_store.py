@@ -0,0 +1,267 @@
+import logging
+from datetime import datetime
+from itertools import chain
+from typing import Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select, func, case, and_, delete, update
+
+from database.config import db
+from models import User, StudySession, Question, Progress, StudentFeatures
+
+logger = logging.getLogger(__name__)
+
+# Features derivadas, na ordem das colunas da matriz servida ao pipeline.
+# As taxas de acerto ficam de fora: o target é o score médio das sessões
+# (acertos / perguntas), e o modelo apenas o copiaria dessas colunas
+FEATURE_STORE_FEATURES = [
+    'sessions_count', 'avg_session_minutes', 'questions_per_session',
+    'hard_question_ratio', 'topics_studied', 'avg_progress_score'
+]
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray, scale: float = 1.0) -> np.ndarray:
+    """Divisão vetorizada que retorna 0 quando o denominador é 0."""
+    out = np.zeros(numerator.shape, dtype=np.float32)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    if scale != 1.0:
+        out *= scale
+    return out
+
+def derive_features(aggregates: np.ndarray) -> np.ndarray:
+    """
+    Deriva a matriz de features a partir dos agregados somáveis.
+
+    É a única implementação usada tanto no treinamento quanto no serving,
+    garantindo que ambos leiam exatamente as mesmas features.
+
+    Args:
+        aggregates: Matriz (n_usuários, len(StudentFeatures.AGGREGATE_COLUMNS))
+
+    Returns:
+        Matriz float32 (n_usuários, len(FEATURE_STORE_FEATURES))
+    """
+    sessions, duration, _, questions, _, hard, _, topics, progress_sum = aggregates.T
+
+    X = np.empty((aggregates.shape[0], len(FEATURE_STORE_FEATURES)), dtype=np.float32)
+    X[:, 0] = sessions
+    X[:, 1] = _ratio(duration, sessions, 1 / 60)
+    X[:, 2] = _ratio(questions, sessions)
+    X[:, 3] = _ratio(hard, questions)
+    X[:, 4] = topics
+    X[:, 5] = _ratio(progress_sum, topics)
+    return X
+
+class FeatureStore:
+    """
+    Feature store de estudantes calculado a partir dos dados de estudo.
+
+    Os agregados por usuário ficam na tabela `student_features` como somas
+    (sessões, duração, acertos, ...). A carga inicial é feita com uma única
+    agregação em SQL e, depois disso, cada sessão finalizada soma apenas
+    os seus próprios valores, sem reler o histórico.
+    """
+
+    def __init__(self, session=None):
+        self.session = session or db.session
+
+    @staticmethod
+    def _question_aggregates():
+        """Subconsulta com os totais de perguntas por sessão (as que contam no score)."""
+        is_hard = Question.difficulty == 'hard'
+        return select(
+            Question.session_id.label('session_id'),
+            func.count(Question.id).label('questions_count'),
+            func.sum(case((Question.is_correct, 1), else_=0)).label('correct_count'),
+            func.sum(case((is_hard, 1), else_=0)).label('hard_questions_count'),
+            func.sum(case((and_(is_hard, Question.is_correct), 1), else_=0)).label('hard_correct_count')
+        ).where(Question.scored_expression()).group_by(Question.session_id)
+
+    def rebuild(self) -> int:
+        """
+        Recalcula os agregados de todos os usuários com SQL set-based.
+
+        Returns:
+            Número de usuários no feature store
+        """
+        questions = self._question_aggregates().subquery()
+        sessions = select(
+            StudySession.user_id.label('user_id'),
+            func.count(StudySession.id).label('sessions_count'),
+            func.coalesce(func.sum(StudySession.duration), 0).label('total_duration'),
+            func.coalesce(func.sum(StudySession.score), 0).label('score_sum'),
+            func.coalesce(func.sum(questions.c.questions_count), 0).label('questions_count'),
+            func.coalesce(func.sum(questions.c.correct_count), 0).label('correct_count'),
+            func.coalesce(func.sum(questions.c.hard_questions_count), 0).label('hard_questions_count'),
+            func.coalesce(func.sum(questions.c.hard_correct_count), 0).label('hard_correct_count')
+        ).outerjoin(
+            questions, questions.c.session_id == StudySession.id
+        ).where(
+            StudySession.end_time.isnot(None)
+        ).group_by(StudySession.user_id).subquery()
+        progress = select(
+            Progress.user_id.label('user_id'),
+            func.count(Progress.id).label('progress_topics_count'),
+            func.coalesce(func.sum(Progress.score), 0).label('progress_score_sum')
+        ).group_by(Progress.user_id).subquery()
+
+        source = select(
+            User.id,
+            *[func.coalesce(sessions.c[column], 0) for column in StudentFeatures.AGGREGATE_COLUMNS[:7]],
+            *[func.coalesce(progress.c[column], 0) for column in StudentFeatures.AGGREGATE_COLUMNS[7:]],
+            func.now()
+        ).outerjoin(
+            sessions, sessions.c.user_id == User.id
+        ).outerjoin(
+            progress, progress.c.user_id == User.id
+        )
+
+        table = StudentFeatures.__table__
+        self.session.execute(delete(table))
+        self.session.execute(table.insert().from_select(
+            ['user_id', *StudentFeatures.AGGREGATE_COLUMNS, 'updated_at'], source
+        ))
+        self.session.commit()
+
+        total = self.session.scalar(select(func.count()).select_from(table))
+        logger.info(f"Feature store reconstruído para {total} usuários")
+        return total
+
+    def _ensure_row(self, user_id: int) -> None:
+        """
+        Garante a linha de agregados do usuário.
+
+        Usa `INSERT ... ON CONFLICT (user_id) DO NOTHING` no SQLite e no
+        PostgreSQL: duas sessões do mesmo usuário finalizadas ao mesmo tempo
+        não disputam a criação da linha.
+        """
+        table = StudentFeatures.__table__
+        dialect = self.session.get_bind().dialect.name
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        elif dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            if self.session.get(StudentFeatures, user_id) is None:
+                self.session.add(StudentFeatures(user_id=user_id))
+                self.session.flush()
+            return
+
+        row = {'user_id': user_id, 'updated_at': datetime.utcnow()}
+        row.update({column: 0 for column in StudentFeatures.AGGREGATE_COLUMNS})
+        self.session.execute(insert(table).values(row).on_conflict_do_nothing(index_elements=['user_id']))
+
+    def _increment(self, user_id: int, **values) -> None:
+        """Atualiza os agregados do usuário no banco, criando a linha se preciso."""
+        self._ensure_row(user_id)
+        self.session.execute(
+            update(StudentFeatures)
+            .where(StudentFeatures.user_id == user_id)
+            .values(updated_at=datetime.utcnow(), **values)
+        )
+
+    def apply_session(self, study_session: StudySession) -> None:
+        """
+        Soma os valores de uma sessão finalizada aos agregados do usuário.
+
+        Deve ser chamado uma única vez por sessão, na mesma transação que a
+        finaliza. Os incrementos são feitos no banco (`coluna = coluna + x`),
+        portanto sessões finalizadas em paralelo não se sobrescrevem.
+
+        Uma sessão finalizada não recebe novas perguntas (a API e a
+        importação as rejeitam), de modo que os valores somados aqui
+        continuam valendo; `rebuild` recalcula tudo a partir das tabelas.
+
+        Args:
+            study_session: Sessão recém-finalizada
+        """
+        totals = self.session.execute(
+            self._question_aggregates().where(Question.session_id == study_session.id)
+        ).first()
+
+        values = {
+            'sessions_count': StudentFeatures.sessions_count + 1,
+            'total_duration': StudentFeatures.total_duration + (study_session.duration or 0),
+            'score_sum': StudentFeatures.score_sum + (study_session.score or 0)
+        }
+        if totals:
+            for column in ('questions_count', 'correct_count', 'hard_questions_count', 'hard_correct_count'):
+                values[column] = getattr(StudentFeatures, column) + getattr(totals, column)
+        self._increment(study_session.user_id, **values)
+
+    def refresh_progress(self, user_id: int) -> None:
+        """Atualiza os agregados de progresso de um usuário."""
+        topics, score_sum = self.session.execute(
+            select(func.count(Progress.id), func.coalesce(func.sum(Progress.score), 0))
+            .where(Progress.user_id == user_id)
+        ).one()
+
+        self._increment(user_id, progress_topics_count=topics, progress_score_sum=score_sum)
+
+    def load_aggregates(self, user_ids: Optional[Sequence[int]] = None, after_user_id: Optional[int] = None,
+                        limit: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Lê os agregados diretamente para arrays numpy (sem DataFrame intermediário).
+
+        Args:
+            user_ids: Usuários desejados (padrão: todos)
+            after_user_id: Lê apenas usuários com ID maior (paginação por chave)
+            limit: Número máximo de usuários
+
+        Returns:
+            Tuple com os IDs dos usuários e a matriz de agregados
+        """
+        columns = [StudentFeatures.user_id] + [
+            getattr(StudentFeatures, column) for column in StudentFeatures.AGGREGATE_COLUMNS
+        ]
+        query = select(*columns).order_by(StudentFeatures.user_id)
+        if user_ids is not None:
+            query = query.where(StudentFeatures.user_id.in_(list(user_ids)))
+        if after_user_id is not None:
+            query = query.where(StudentFeatures.user_id > after_user_id)
+        if limit is not None:
+            query = query.limit(limit)
+
+        rows = self.session.execute(query).all()
+        width = len(columns)
+        flat = np.fromiter(chain.from_iterable(rows), dtype=np.float64, count=len(rows) * width)
+        matrix = flat.reshape(len(rows), width)
+
+        return matrix[:, 0].astype(np.int64), matrix[:, 1:]
+
+    def load_matrix(self, user_ids: Optional[Sequence[int]] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Retorna a matriz de features usada por treinamento e serving.
+
+        Args:
+            user_ids: Usuários desejados (padrão: todos)
+
+        Returns:
+            Tuple com IDs dos usuários, matriz de features (float32) e o
+            score médio por sessão de cada usuário (usado como target)
+        """
+        ids, aggregates = self.load_aggregates(user_ids)
+        scores = _ratio(aggregates[:, 2], aggregates[:, 0])
+        return ids, derive_features(aggregates), scores
+
+    def iter_matrix(self, chunk_size: int = 5000,
+                    after_user_id: int = 0) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Percorre todos os usuários em blocos, em ordem de ID.
+
+        Cada bloco é uma consulta por intervalo de chave primária
+        (`user_id > último ID lido`), com custo constante independente da
+        posição, em vez de OFFSET.
+
+        Args:
+            chunk_size: Usuários por bloco
+            after_user_id: Começa após este ID (retomada de um processamento)
+
+        Yields:
+            Tuple com IDs dos usuários e matriz de features (float32)
+        """
+        while True:
+            ids, aggregates = self.load_aggregates(after_user_id=after_user_id, limit=chunk_size)
+            if not len(ids):
+                return
+            yield ids, derive_features(aggregates)
+            after_user_id = int(ids[-1])
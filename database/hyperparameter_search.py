@@ -0,0 +1,210 @@
+import hashlib
+import itertools
+import json
+import logging
+import math
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.model_selection import StratifiedKFold, train_test_split
+
+from .artifact_cache import library_versions
+
+logger = logging.getLogger(__name__)
+
+# Espaços de busca por modelo (nomes iguais aos de EducationalMLPipeline.models)
+SEARCH_SPACES = {
+    'SVM': {
+        'C': [0.1, 1.0, 10.0, 100.0],
+        'gamma': ['scale', 0.01, 0.1, 1.0]
+    },
+    'Naive_Bayes': {
+        'var_smoothing': [1e-11, 1e-9, 1e-7, 1e-5]
+    },
+    'Decision_Tree': {
+        'max_depth': [4, 6, 10, 15, None],
+        'min_samples_leaf': [1, 5, 20],
+        'criterion': ['gini', 'entropy']
+    }
+}
+
+def expand_grid(space: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Expande um espaço de busca em uma lista de combinações de parâmetros."""
+    keys = sorted(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+
+class FoldResultCache:
+    """
+    Cache em disco do score de cada fold avaliado.
+
+    A chave combina modelo, parâmetros (do candidato e do estimador base),
+    impressão digital dos dados, orçamento (tamanho da amostra), fold,
+    semente da amostragem e versões das bibliotecas, de modo que buscas
+    interrompidas ou repetidas reaproveitam todos os folds já calculados
+    e qualquer outra mudança gera uma nova chave.
+    """
+
+    def __init__(self, cache_dir: str = '.tuning_cache'):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(model_name: str, params: Dict[str, Any], data_fingerprint: str,
+                 budget: int, fold: int, n_splits: int, base_params: Dict[str, Any],
+                 random_state: Any) -> str:
+        content = json.dumps({
+            'model': model_name,
+            'params': params,
+            'base_params': base_params,
+            'data': data_fingerprint,
+            'budget': budget,
+            'fold': fold,
+            'n_splits': n_splits,
+            'random_state': random_state,
+            'versions': library_versions()
+        }, sort_keys=True, default=repr)
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[float]:
+        """Retorna o score armazenado ou None."""
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)['score']
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
+
+    def set(self, key: str, score: float) -> None:
+        """Armazena o score de um fold (escrita atômica)."""
+        tmp_path = os.path.join(self.cache_dir, f".{key}.{uuid.uuid4().hex}")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'score': score}, f)
+        os.replace(tmp_path, self._path(key))
+
+# Dados compartilhados por processo do pool (enviados uma vez por worker)
+_worker_X = None
+_worker_y = None
+
+def _init_worker(X: np.ndarray, y: np.ndarray) -> None:
+    global _worker_X, _worker_y
+    _worker_X, _worker_y = X, y
+
+def _evaluate_fold(task: Tuple[Any, Dict[str, Any], np.ndarray, np.ndarray]) -> float:
+    """Treina e avalia um estimador em um fold (executado no pool)."""
+    estimator, params, train_idx, val_idx = task
+    model = clone(estimator).set_params(**params)
+    model.fit(_worker_X[train_idx], _worker_y[train_idx])
+    return float(model.score(_worker_X[val_idx], _worker_y[val_idx]))
+
+class SuccessiveHalvingSearch:
+    """
+    Busca de hiperparâmetros com successive halving.
+
+    Todas as combinações começam com um orçamento pequeno (poucas
+    amostras). A cada rodada apenas a melhor fração `1/eta` sobrevive e o
+    orçamento é multiplicado por `eta`, até chegar ao dataset completo. Os
+    folds de cada rodada são avaliados em paralelo em um pool de processos.
+    """
+
+    def __init__(self, eta: int = 3, min_resources: int = 100, n_splits: int = 5,
+                 n_jobs: Optional[int] = None, cache: Optional[FoldResultCache] = None,
+                 random_state: int = 42):
+        self.eta = eta
+        self.min_resources = min_resources
+        self.n_splits = n_splits
+        self.n_jobs = n_jobs
+        self.cache = cache or FoldResultCache()
+        self.random_state = random_state
+
+    def _budgets(self, n_samples: int, n_candidates: int) -> List[int]:
+        """Calcula o tamanho da amostra usado em cada rodada."""
+        n_rounds = max(1, math.ceil(math.log(max(n_candidates, 1), self.eta)) + 1)
+        budgets = [min(n_samples, self.min_resources * self.eta ** i) for i in range(n_rounds)]
+        budgets[-1] = n_samples
+        return sorted(set(budgets))
+
+    def _subsample(self, y: np.ndarray, budget: int) -> np.ndarray:
+        """Índices de uma amostra estratificada e determinística de tamanho `budget`."""
+        indices = np.arange(len(y))
+        if budget >= len(y):
+            return indices
+        subsample, _ = train_test_split(indices, train_size=budget, stratify=y,
+                                        random_state=self.random_state)
+        return np.sort(subsample)
+
+    def search(self, model_name: str, estimator: Any, space: Dict[str, List[Any]],
+               X: np.ndarray, y: np.ndarray, data_fingerprint: str) -> Dict[str, Any]:
+        """
+        Executa a busca para um modelo.
+
+        Args:
+            model_name: Nome do modelo (parte da chave do cache)
+            estimator: Estimador base do scikit-learn
+            space: Espaço de busca
+            X: Features de treinamento
+            y: Target de treinamento
+            data_fingerprint: Impressão digital de X e y
+
+        Returns:
+            Dict com os melhores parâmetros, o melhor score e o histórico das rodadas
+        """
+        candidates = expand_grid(space)
+        base_params = estimator.get_params()
+        history = []
+        cache_hits = 0
+
+        with ProcessPoolExecutor(max_workers=self.n_jobs, initializer=_init_worker,
+                                 initargs=(X, y)) as pool:
+            for budget in self._budgets(len(y), len(candidates)):
+                subsample = self._subsample(y, budget)
+                # Uma classe rara pode ter um único membro na amostra; o StratifiedKFold
+                # exige ao menos 2 folds (e apenas avisa sobre classes menores que n_splits)
+                class_counts = np.unique(y[subsample], return_counts=True)[1]
+                n_splits = max(2, min(self.n_splits, int(class_counts.min())))
+                folds = list(StratifiedKFold(n_splits=n_splits, shuffle=True,
+                                             random_state=self.random_state).split(subsample, y[subsample]))
+
+                scores = np.full((len(candidates), n_splits), np.nan)
+                pending, tasks = [], []
+                for i, params in enumerate(candidates):
+                    for fold, (train_idx, val_idx) in enumerate(folds):
+                        key = self.cache.make_key(model_name, params, data_fingerprint, budget, fold, n_splits,
+                                                  base_params, self.random_state)
+                        cached = self.cache.get(key)
+                        if cached is not None:
+                            scores[i, fold] = cached
+                            cache_hits += 1
+                        else:
+                            pending.append((i, fold, key))
+                            tasks.append((estimator, params, subsample[train_idx], subsample[val_idx]))
+
+                for (i, fold, key), score in zip(pending, pool.map(_evaluate_fold, tasks)):
+                    scores[i, fold] = score
+                    self.cache.set(key, score)
+
+                mean_scores = scores.mean(axis=1)
+                history.append({
+                    'budget': int(budget),
+                    'candidates': len(candidates),
+                    'best_score': float(mean_scores.max())
+                })
+                logger.info(f"{model_name}: {len(candidates)} candidatos com {budget} amostras "
+                            f"(melhor CV {mean_scores.max():.4f})")
+
+                order = np.argsort(-mean_scores, kind='stable')
+                best_params, best_score = candidates[order[0]], float(mean_scores[order[0]])
+                n_keep = max(1, len(candidates) // self.eta)
+                candidates = [candidates[j] for j in order[:n_keep]]
+
+        return {
+            'best_params': best_params,
+            'best_score': best_score,
+            'history': history,
+            'cache_hits': cache_hits
+        }
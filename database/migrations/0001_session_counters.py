@@ -0,0 +1,31 @@
+"""Adiciona os contadores de perguntas às sessões e os preenche a partir das perguntas gravadas."""
+import logging
+
+from sqlalchemy import text
+
+from . import has_column
+
+logger = logging.getLogger(__name__)
+
+DESCRIPTION = 'Contadores questions_count/correct_count em study_sessions'
+
+def upgrade(connection):
+    added = False
+    for column in ('questions_count', 'correct_count'):
+        if not has_column(connection, 'study_sessions', column):
+            connection.execute(text(f"ALTER TABLE study_sessions ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0"))
+            added = True
+
+    if not added:
+        return
+
+    connection.execute(text("""
+        UPDATE study_sessions SET
+            questions_count = (SELECT COUNT(*) FROM questions q WHERE q.session_id = study_sessions.id),
+            correct_count = (SELECT COUNT(*) FROM questions q WHERE q.session_id = study_sessions.id AND q.is_correct)
+    """))
+    connection.execute(text("""
+        UPDATE study_sessions SET
+            score = CASE WHEN questions_count > 0 THEN correct_count * 100 / questions_count ELSE 0 END
+    """))
+    logger.info("Contadores das sessões preenchidos")
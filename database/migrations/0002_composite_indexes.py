@@ -0,0 +1,62 @@
+"""
+Cria os índices declarados nos modelos e remove os redundantes.
+
+Bancos criados pelo `db.create_all()` antes desta versão não tinham
+nenhum dos índices de `schema.sql`; bancos criados pelo `schema.sql` tinham
+índices que passam a ser cobertos pelos compostos.
+"""
+import logging
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+DESCRIPTION = 'Índices compostos (user_id, start_time), (user_id, topic) único e (user_id, last_updated)'
+
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_study_sessions_user_start ON study_sessions (user_id, start_time)",
+    "CREATE INDEX IF NOT EXISTS idx_questions_session_id ON questions (session_id)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_progress_user_topic ON progress (user_id, topic)",
+    "CREATE INDEX IF NOT EXISTS idx_progress_user_last_updated ON progress (user_id, last_updated)",
+    "CREATE INDEX IF NOT EXISTS idx_progress_topic ON progress (topic)",
+    "CREATE INDEX IF NOT EXISTS idx_student_predictions_risk_level ON student_predictions (risk_level)",
+    "CREATE INDEX IF NOT EXISTS idx_student_predictions_batch_id ON student_predictions (batch_id)",
+]
+
+# Duplicam as restrições UNIQUE, são prefixo de um índice composto ou
+# foram criados com o nome automático do SQLAlchemy
+REDUNDANT_INDEXES = [
+    'idx_users_username',
+    'idx_users_email',
+    'idx_study_sessions_user_id',
+    'idx_progress_user_id',
+    'ix_student_predictions_risk_level',
+    'ix_student_predictions_batch_id',
+]
+
+# Registros de progresso duplicados removidos pela migração (mantidos para conferência)
+DUPLICATES_TABLE = 'progress_duplicates_0002'
+
+DUPLICATES = "SELECT * FROM progress WHERE id NOT IN (SELECT MAX(id) FROM progress GROUP BY user_id, topic)"
+
+def upgrade(connection):
+    # O índice único exige um único registro por (user_id, topic): mantém o
+    # mais recente e copia os demais para DUPLICATES_TABLE antes de removê-los
+    duplicates = connection.execute(text(f"SELECT COUNT(*) FROM ({DUPLICATES}) d")).scalar()
+    if duplicates:
+        connection.execute(text(f"CREATE TABLE IF NOT EXISTS {DUPLICATES_TABLE} AS SELECT * FROM progress WHERE 1 = 0"))
+        connection.execute(text(f"INSERT INTO {DUPLICATES_TABLE} {DUPLICATES}"))
+        for row in connection.execute(text(f"{DUPLICATES} ORDER BY user_id, topic, id LIMIT 20")).mappings():
+            logger.warning(f"Progresso duplicado removido: id={row['id']} user_id={row['user_id']} "
+                           f"topic={row['topic']!r} score={row['score']}")
+        connection.execute(text(
+            "DELETE FROM progress WHERE id NOT IN (SELECT MAX(id) FROM progress GROUP BY user_id, topic)"
+        ))
+        logger.warning(f"{duplicates} registros de progresso duplicados movidos para {DUPLICATES_TABLE}; "
+                       f"reconstrua o feature store (FeatureStore().rebuild())")
+
+    for name in REDUNDANT_INDEXES:
+        connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+    for statement in INDEXES:
+        connection.execute(text(statement))
@@ -0,0 +1,14 @@
+"""Adiciona o hash de conteúdo das perguntas, usado para deduplicar importações."""
+from sqlalchemy import text
+
+from . import has_column
+
+DESCRIPTION = 'Coluna questions.content_hash e índice único (session_id, content_hash)'
+
+def upgrade(connection):
+    if not has_column(connection, 'questions', 'content_hash'):
+        connection.execute(text("ALTER TABLE questions ADD COLUMN content_hash VARCHAR(64)"))
+
+    connection.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_questions_session_hash ON questions (session_id, content_hash)"
+    ))
@@ -0,0 +1,29 @@
+"""Recalcula os contadores das sessões com perguntas importadas de banco ainda sem resposta."""
+import logging
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+DESCRIPTION = 'Perguntas de banco sem resposta fora de questions_count/correct_count/score'
+
+SCORED = "(q.content_hash IS NULL OR q.user_answer IS NOT NULL)"
+
+def upgrade(connection):
+    result = connection.execute(text(f"""
+        UPDATE study_sessions SET
+            questions_count = (SELECT COUNT(*) FROM questions q
+                               WHERE q.session_id = study_sessions.id AND {SCORED}),
+            correct_count = (SELECT COUNT(*) FROM questions q
+                             WHERE q.session_id = study_sessions.id AND {SCORED} AND q.is_correct)
+        WHERE id IN (SELECT session_id FROM questions WHERE content_hash IS NOT NULL AND user_answer IS NULL)
+    """))
+    if not result.rowcount:
+        return
+
+    connection.execute(text("""
+        UPDATE study_sessions SET
+            score = CASE WHEN questions_count > 0 THEN correct_count * 100 / questions_count ELSE 0 END
+        WHERE id IN (SELECT session_id FROM questions WHERE content_hash IS NOT NULL AND user_answer IS NULL)
+    """))
+    logger.info(f"Contadores de {result.rowcount} sessões recalculados sem as perguntas de banco não respondidas")
@@ -0,0 +1,135 @@
+"""
+Migrações versionadas do schema.
+
+Cada migração é um módulo `NNNN_descricao.py` neste pacote, com uma
+constante `DESCRIPTION` e uma função `upgrade(connection)`. As migrações
+pendentes são aplicadas em ordem, cada uma em sua própria transação, e
+registradas na tabela `schema_migrations`. Elas são aplicadas apenas pelo
+comando `flask db-migrate` (no deploy), nunca na inicialização da
+aplicação.
+
+As migrações devem ser idempotentes: um banco novo já é criado pelo
+`db.create_all()` com o schema atual, e as migrações apenas o registram.
+"""
+import logging
+import pkgutil
+from datetime import datetime
+from importlib import import_module
+from typing import Dict, List, Any, Optional
+
+from sqlalchemy import MetaData, Table, Column, String, DateTime, inspect, select, text
+from sqlalchemy.exc import IntegrityError
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_TABLE = 'schema_migrations'
+
+# Chave do advisory lock do PostgreSQL que serializa execuções simultâneas
+MIGRATIONS_LOCK_KEY = 7_245_310_001
+
+_metadata = MetaData()
+schema_migrations = Table(
+    MIGRATIONS_TABLE, _metadata,
+    Column('version', String(20), primary_key=True),
+    Column('description', String(200), nullable=False),
+    Column('applied_at', DateTime, nullable=False)
+)
+
+def has_column(connection, table: str, column: str) -> bool:
+    """Verifica se uma coluna existe (para migrações idempotentes)."""
+    return column in {c['name'] for c in inspect(connection).get_columns(table)}
+
+def has_table(connection, table: str) -> bool:
+    return inspect(connection).has_table(table)
+
+def discover_migrations() -> List[Dict[str, Any]]:
+    """Lista as migrações do pacote, ordenadas pela versão."""
+    migrations = []
+    for module_info in pkgutil.iter_modules(__path__):
+        version, _, _ = module_info.name.partition('_')
+        if not version.isdigit():
+            continue
+        module = import_module(f"{__name__}.{module_info.name}")
+        migrations.append({
+            'version': version,
+            'name': module_info.name,
+            'description': module.DESCRIPTION,
+            'upgrade': module.upgrade
+        })
+    return sorted(migrations, key=lambda m: m['version'])
+
+def applied_versions(engine) -> Dict[str, datetime]:
+    """Versões já aplicadas e a data de aplicação."""
+    with engine.begin() as connection:
+        _metadata.create_all(connection)
+        rows = connection.execute(select(schema_migrations.c.version, schema_migrations.c.applied_at))
+        return {version: applied_at for version, applied_at in rows}
+
+def migration_status(engine) -> List[Dict[str, Any]]:
+    """Situação de cada migração (aplicada ou pendente)."""
+    applied = applied_versions(engine)
+    return [
+        {
+            'version': m['version'],
+            'description': m['description'],
+            'applied_at': applied[m['version']].isoformat() if m['version'] in applied else None
+        }
+        for m in discover_migrations()
+    ]
+
+def pending_migrations(engine) -> List[str]:
+    """Versões ainda não aplicadas."""
+    applied = applied_versions(engine)
+    return [m['version'] for m in discover_migrations() if m['version'] not in applied]
+
+def run_migrations(engine, target: Optional[str] = None) -> List[str]:
+    """
+    Aplica as migrações pendentes.
+
+    No PostgreSQL a execução inteira é feita sob um advisory lock: dois
+    deploys simultâneos não executam o mesmo ALTER TABLE em paralelo, e o
+    segundo apenas encontra as migrações já aplicadas. No SQLite as
+    escritas já são serializadas pelo banco.
+
+    Args:
+        engine: Engine do SQLAlchemy
+        target: Última versão a aplicar (padrão: todas)
+
+    Returns:
+        Versões aplicadas nesta execução
+    """
+    if engine.dialect.name != 'postgresql':
+        return _apply_pending(engine, target)
+
+    with engine.connect() as lock_connection:
+        lock_connection.execute(text("SELECT pg_advisory_lock(:key)"), {'key': MIGRATIONS_LOCK_KEY})
+        try:
+            return _apply_pending(engine, target)
+        finally:
+            lock_connection.execute(text("SELECT pg_advisory_unlock(:key)"), {'key': MIGRATIONS_LOCK_KEY})
+            lock_connection.commit()
+
+def _apply_pending(engine, target: Optional[str]) -> List[str]:
+    applied = applied_versions(engine)
+    newly_applied = []
+
+    for migration in discover_migrations():
+        version = migration['version']
+        if version in applied or (target and version > target):
+            continue
+
+        try:
+            with engine.begin() as connection:
+                migration['upgrade'](connection)
+                connection.execute(schema_migrations.insert().values(
+                    version=version, description=migration['description'], applied_at=datetime.utcnow()
+                ))
+        except IntegrityError:
+            # Outro processo aplicou a mesma migração ao mesmo tempo
+            logger.info(f"Migração {version} já aplicada por outro processo")
+            continue
+
+        logger.info(f"Migração {migration['name']} aplicada")
+        newly_applied.append(version)
+
+    return newly_applied
@@ -1,40 +1,207 @@
 import pandas as pd
 import numpy as np
+from sklearn.base import clone
 from sklearn.model_selection import train_test_split, cross_val_score
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.svm import SVC
+from sklearn.preprocessing import LabelEncoder
+from sklearn.svm import SVC, LinearSVC
+from sklearn.kernel_approximation import Nystroem
+from sklearn.pipeline import Pipeline
 from sklearn.naive_bayes import GaussianNB
 from sklearn.tree import DecisionTreeClassifier
 from sklearn.metrics import classification_report, confusion_matrix, accuracy_score, f1_score
-import matplotlib.pyplot as plt
-import seaborn as sns
-from typing import Dict, List, Tuple, Any
-import joblib
+from typing import Dict, List, Tuple, Any, Optional
+import hashlib
 import os
+import pickle
+import time
+import tracemalloc
+
+from .artifact_cache import ArtifactCache
+from .chart_renderer import plot_evaluation
+from .columnar_dataset import ColumnarDataset, write_dataset
+from .compiled_inference import export_compiled, CompilationError
+from .drift_monitor import build_training_profile
+from .hyperparameter_search import SEARCH_SPACES, FoldResultCache, SuccessiveHalvingSearch
+from .model_registry import ModelRegistry
+from .preprocessing import FeatureEncoder, make_model_pipeline
+
+# Esquema de features compartilhado entre treinamento e serving
+CATEGORICAL_FEATURES = ['difficulty_preference', 'learning_style']
+CATEGORIES = {
+    'difficulty_preference': ['easy', 'medium', 'hard'],
+    'learning_style': ['visual', 'auditory', 'kinesthetic']
+}
+NUMERICAL_FEATURES = ['study_hours_per_week', 'previous_score', 'attendance_rate',
+                      'homework_completion', 'participation_score', 'age']
+TARGET_COLUMN = 'performance'
+
+# Acima deste número de amostras de treino o SVC exato (custo ~O(n²)-O(n³))
+# é substituído por uma aproximação de kernel seguida de um SVM linear
+LARGE_DATA_THRESHOLD = 20000
+
+def build_large_data_svm(C: float = 1.0, gamma: Any = None, n_components: int = 500,
+                         random_state: int = 42) -> Pipeline:
+    """
+    Cria o SVM para grandes volumes de dados.
+    
+    Usa o mapa de features de Nyström para aproximar o kernel RBF e um
+    classificador linear, com custo linear no número de amostras.
+    
+    Args:
+        C: Regularização do classificador linear
+        gamma: Parâmetro do kernel RBF (None usa 1 / n_features)
+        n_components: Número de amostras de referência do Nyström
+        random_state: Semente para reprodutibilidade
+        
+    Returns:
+        Pipeline (Nyström + LinearSVC) compatível com a API do SVC
+    """
+    return Pipeline([
+        ('feature_map', Nystroem(kernel='rbf', gamma=gamma, n_components=n_components,
+                                 random_state=random_state)),
+        ('classifier', LinearSVC(C=C, dual=False, random_state=random_state))
+    ])
+
+# Orçamento padrão de serving: latência p95 de uma predição unitária e
+# memória do modelo (tamanho serializado + pico alocado na predição em lote)
+SERVING_LATENCY_BUDGET_MS = 5.0
+SERVING_MEMORY_BUDGET_MB = 100.0
+
+def measure_serving_cost(model: Any, X: np.ndarray, n_single: int = 200,
+                         max_batch_rows: int = 10000) -> Dict[str, Any]:
+    """
+    Mede o custo de servir um modelo treinado.
+    
+    Args:
+        model: Pipeline ajustado
+        X: Amostras usadas na medição (ex.: conjunto de teste)
+        n_single: Número de predições unitárias cronometradas
+        max_batch_rows: Tamanho máximo do lote cronometrado
+        
+    Returns:
+        Dict com latência unitária (p50/p95 em ms), latência por linha em
+        lote (µs), tamanho serializado e pico de memória da predição (MB)
+    """
+    batch = X[:max_batch_rows]
+    for i in range(min(10, len(batch))):
+        model.predict(batch[i:i + 1])  # aquecimento
+    
+    single = []
+    for i in range(min(n_single, len(batch))):
+        start = time.perf_counter()
+        model.predict(batch[i:i + 1])
+        single.append((time.perf_counter() - start) * 1000)
+    
+    start = time.perf_counter()
+    model.predict(batch)
+    batch_seconds = time.perf_counter() - start
+    
+    # Não interferir em um tracemalloc já ativo (ex.: benchmarks)
+    peak_mb = None
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+        try:
+            model.predict(batch)
+            peak_mb = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+        finally:
+            tracemalloc.stop()
+    
+    size_mb = len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)) / 1024 ** 2
+    
+    return {
+        'single_row_p50_ms': float(np.percentile(single, 50)),
+        'single_row_p95_ms': float(np.percentile(single, 95)),
+        'batch_rows': int(len(batch)),
+        'batch_per_row_us': batch_seconds / len(batch) * 1e6,
+        'size_mb': size_mb,
+        'peak_predict_mb': peak_mb,
+        'memory_mb': size_mb + (peak_mb or 0.0)
+    }
+
+# Faixas de score (limite inferior) que definem as classes de performance
+PERFORMANCE_THRESHOLDS = [(80, 'excellent'), (65, 'good'), (50, 'average')]
+DEFAULT_PERFORMANCE = 'needs_improvement'
+
+def score_to_performance(scores: np.ndarray) -> np.ndarray:
+    """
+    Converte scores (0-100) nas classes de performance de forma vetorizada.
+    
+    Args:
+        scores: Array com os scores
+        
+    Returns:
+        Array com o rótulo de performance de cada score
+    """
+    scores = np.asarray(scores)
+    return np.select(
+        [scores >= threshold for threshold, _ in PERFORMANCE_THRESHOLDS],
+        [label for _, label in PERFORMANCE_THRESHOLDS],
+        default=DEFAULT_PERFORMANCE
+    )
+
+def compute_data_fingerprint(*arrays: np.ndarray) -> str:
+    """
+    Calcula uma impressão digital (SHA-256) de um conjunto de arrays.
+    
+    Args:
+        *arrays: Arrays numpy (ex.: X e y)
+        
+    Returns:
+        Hash hexadecimal que identifica o conteúdo, formato e dtype dos arrays
+    """
+    digest = hashlib.sha256()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.shape}:{array.dtype.str}".encode())
+        digest.update(memoryview(array).cast('B'))
+    return digest.hexdigest()
 
 class EducationalMLPipeline:
     """Pipeline completo de Machine Learning para dados educacionais."""
     
-    def __init__(self):
+    def __init__(self, svm_mode: str = 'auto', cache_dir: str = None,
+                 latency_budget_ms: Optional[float] = SERVING_LATENCY_BUDGET_MS,
+                 memory_budget_mb: Optional[float] = SERVING_MEMORY_BUDGET_MB):
+        """
+        Args:
+            svm_mode: 'exact' (SVC com kernel RBF), 'large_data' (aproximação
+                de kernel + SVM linear) ou 'auto' (escolhe pelo tamanho do
+                conjunto de treino, ver LARGE_DATA_THRESHOLD)
+            cache_dir: Diretório do cache de artefatos de treinamento
+                (None desativa o cache)
+            latency_budget_ms: Latência p95 máxima de uma predição unitária
+                para o modelo de serving (None desativa o limite)
+            memory_budget_mb: Memória máxima do modelo de serving (None
+                desativa o limite)
+        """
+        self.svm_mode = svm_mode
+        self.latency_budget_ms = latency_budget_ms
+        self.memory_budget_mb = memory_budget_mb
+        self.artifact_cache = ArtifactCache(cache_dir) if cache_dir else None
         self.models = {
             'SVM': SVC(kernel='rbf', random_state=42),
             'Naive_Bayes': GaussianNB(),
             'Decision_Tree': DecisionTreeClassifier(random_state=42, max_depth=10)
         }
-        self.scaler = StandardScaler()
+        self.preprocessor = None
         self.label_encoder = LabelEncoder()
         self.trained_models = {}
         self.results = {}
+        self.tuning_results = {}
+        self.data_fingerprint = None
+        self.training_profile = None
         
-    def create_sample_educational_dataset(self) -> pd.DataFrame:
+    def create_sample_educational_dataset(self, n_samples: int = 1000) -> pd.DataFrame:
         """
         Cria um dataset educacional de exemplo para demonstração.
         
+        Args:
+            n_samples: Número de estudantes a gerar
+            
         Returns:
             pd.DataFrame: Dataset com características de estudantes e performance
         """
         np.random.seed(42)
-        n_samples = 1000
         
         # Características dos estudantes
         data = {
@@ -43,8 +210,12 @@ class EducationalMLPipeline:
             'attendance_rate': np.random.normal(85, 10, n_samples),
             'homework_completion': np.random.normal(80, 15, n_samples),
             'participation_score': np.random.normal(70, 20, n_samples),
-            'difficulty_preference': np.random.choice(['easy', 'medium', 'hard'], n_samples),
-            'learning_style': np.random.choice(['visual', 'auditory', 'kinesthetic'], n_samples),
+            'difficulty_preference': pd.Categorical(
+                np.random.choice(CATEGORIES['difficulty_preference'], n_samples),
+                categories=CATEGORIES['difficulty_preference']),
+            'learning_style': pd.Categorical(
+                np.random.choice(CATEGORIES['learning_style'], n_samples),
+                categories=CATEGORIES['learning_style']),
             'age': np.random.randint(16, 25, n_samples)
         }
         
@@ -58,66 +229,159 @@ class EducationalMLPipeline:
         df['participation_score'] = np.clip(df['participation_score'], 0, 100)
         
         # Criar variável target baseada em lógica educacional
-        def calculate_performance(row):
-            score = (
-                row['study_hours_per_week'] * 0.3 +
-                row['previous_score'] * 0.25 +
-                row['attendance_rate'] * 0.2 +
-                row['homework_completion'] * 0.15 +
-                row['participation_score'] * 0.1
-            )
-            
-            if score >= 80:
-                return 'excellent'
-            elif score >= 65:
-                return 'good'
-            elif score >= 50:
-                return 'average'
-            else:
-                return 'needs_improvement'
-        
-        df['performance'] = df.apply(calculate_performance, axis=1)
+        score = (
+            df['study_hours_per_week'] * 0.3 +
+            df['previous_score'] * 0.25 +
+            df['attendance_rate'] * 0.2 +
+            df['homework_completion'] * 0.15 +
+            df['participation_score'] * 0.1
+        )
+        df['performance'] = score_to_performance(score.to_numpy())
         
         return df
     
+    def save_dataset(self, df: pd.DataFrame, directory: str) -> Dict[str, Any]:
+        """
+        Grava um dataset no formato colunar (ver `write_dataset`).
+        
+        Args:
+            df: DataFrame com os dados
+            directory: Diretório de destino
+            
+        Returns:
+            Schema gravado
+        """
+        schema = write_dataset(df, directory)
+        print(f"Dataset com {schema['n_rows']} amostras salvo em: {directory}")
+        return schema
+    
+    def load_dataset(self, directory: str, columns: List[str] = None) -> Dict[str, Any]:
+        """
+        Abre um dataset colunar com memory-map, lendo só as colunas usadas.
+        
+        Args:
+            directory: Diretório do dataset
+            columns: Colunas desejadas (padrão: features + target)
+            
+        Returns:
+            Mapeamento coluna -> valores, aceito por `preprocess_data`
+        """
+        dataset = ColumnarDataset(directory)
+        data = dataset.columns(columns or NUMERICAL_FEATURES + CATEGORICAL_FEATURES + [TARGET_COLUMN])
+        print(f"Dataset com {len(dataset)} amostras carregado de: {directory}")
+        return data
+    
     def preprocess_data(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
         """
         Pré-processa os dados educacionais.
         
         Args:
-            df: DataFrame com os dados
+            df: DataFrame com os dados (ou mapeamento coluna -> valores, ver
+                `load_dataset`)
             
         Returns:
             Tuple com features (X) e target (y) processados
         """
         print("Iniciando pré-processamento dos dados...")
         
-        # Separar features categóricas e numéricas
-        categorical_features = ['difficulty_preference', 'learning_style']
-        numerical_features = ['study_hours_per_week', 'previous_score', 'attendance_rate', 
-                             'homework_completion', 'participation_score', 'age']
+        # Codificar features em uma única matriz float32, sem copiar o DataFrame.
+        # As categorias vêm do dtype `category`; a normalização é ajustada
+        # depois, apenas nos dados de treino (ver make_model_pipeline)
+        self.preprocessor = FeatureEncoder(NUMERICAL_FEATURES, CATEGORICAL_FEATURES)
+        X = self.preprocessor.fit(df).transform(df)
         
-        # Codificar variáveis categóricas
-        df_processed = df.copy()
-        for feature in categorical_features:
-            le = LabelEncoder()
-            df_processed[feature + '_encoded'] = le.fit_transform(df_processed[feature])
+        # Preparar target
+        y = self.label_encoder.fit_transform(df[TARGET_COLUMN])
         
-        # Selecionar features para o modelo
-        feature_columns = numerical_features + [f + '_encoded' for f in categorical_features]
-        X = df_processed[feature_columns].values
+        print(f"Dados pré-processados: {X.shape[0]} amostras, {X.shape[1]} features")
+        print(f"Classes target: {list(self.label_encoder.classes_)}")
         
-        # Preparar target
-        y = self.label_encoder.fit_transform(df_processed['performance'])
+        return X, y
+    
+    def preprocess_feature_store_data(self, X: np.ndarray, scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pré-processa a matriz de features reais vinda do feature store.
         
-        # Normalizar features numéricas
-        X = self.scaler.fit_transform(X)
+        Args:
+            X: Matriz de features (ver `FeatureStore.load_matrix`)
+            scores: Score médio de cada usuário, usado para derivar o target
+                (não é coluna de X; ver FEATURE_STORE_FEATURES)
+            
+        Returns:
+            Tuple com features (X) e target (y) processados
+        """
+        from .feature_store import FEATURE_STORE_FEATURES
         
-        print(f"Dados pré-processados: {X.shape[0]} amostras, {X.shape[1]} features")
+        print("Iniciando pré-processamento dos dados do feature store...")
+        
+        self.preprocessor = FeatureEncoder(FEATURE_STORE_FEATURES, []).fit(X)
+        
+        y = self.label_encoder.fit_transform(score_to_performance(scores))
+        X = np.asarray(X, dtype=np.float32)
+        
+        print(f"Dados pré-processados: {X.shape[0]} estudantes, {X.shape[1]} features")
         print(f"Classes target: {list(self.label_encoder.classes_)}")
         
         return X, y
     
+    def tune_models(self, X: np.ndarray, y: np.ndarray, n_jobs: int = None,
+                    cache_dir: str = '.tuning_cache', eta: int = 3) -> Dict[str, Any]:
+        """
+        Ajusta os hiperparâmetros dos modelos com successive halving.
+        
+        Os melhores parâmetros substituem os modelos padrão e são gravados
+        no bundle salvo por `save_models`.
+        
+        Args:
+            X: Features
+            y: Target
+            n_jobs: Número de processos do pool (padrão: número de CPUs)
+            cache_dir: Diretório do cache de resultados dos folds
+            eta: Fator de redução de candidatos a cada rodada
+            
+        Returns:
+            Dict com o resultado da busca por modelo
+        """
+        print("Iniciando busca de hiperparâmetros...")
+        
+        # Ajustar apenas com os dados de treino, mesma divisão de train_models
+        X_train, _, y_train, _ = train_test_split(
+            X, y, test_size=0.2, random_state=42, stratify=y
+        )
+        fingerprint = compute_data_fingerprint(X_train, y_train)
+        search = SuccessiveHalvingSearch(eta=eta, n_jobs=n_jobs, cache=FoldResultCache(cache_dir))
+        
+        for name, model in self.models.items():
+            if name not in SEARCH_SPACES:
+                continue
+            
+            # Buscar sobre o pipeline completo para que a normalização seja
+            # ajustada dentro de cada fold
+            space = {f"model__{param}": values for param, values in SEARCH_SPACES[name].items()}
+            result = search.search(name, make_model_pipeline(model), space, X_train, y_train, fingerprint)
+            result['best_params'] = {
+                param[len('model__'):]: value for param, value in result['best_params'].items()
+            }
+            self.models[name] = clone(model).set_params(**result['best_params'])
+            self.tuning_results[name] = result
+            
+            print(f"{name} - Melhores parâmetros: {result['best_params']} "
+                  f"(CV {result['best_score']:.4f}, {result['cache_hits']} folds em cache)")
+        
+        return self.tuning_results
+    
+    def _resolve_svm(self, n_train: int) -> None:
+        """Troca o SVC exato pela versão com aproximação de kernel quando necessário."""
+        model = self.models.get('SVM')
+        use_large_data = self.svm_mode == 'large_data' or (
+            self.svm_mode == 'auto' and n_train > LARGE_DATA_THRESHOLD
+        )
+        
+        if use_large_data and isinstance(model, SVC):
+            gamma = model.gamma if not isinstance(model.gamma, str) else None
+            self.models['SVM'] = build_large_data_svm(C=model.C, gamma=gamma)
+            print(f"SVM em modo large-data (Nyström + LinearSVC) para {n_train} amostras")
+    
     def train_models(self, X: np.ndarray, y: np.ndarray) -> Dict[str, Any]:
         """
         Treina todos os modelos de ML.
@@ -131,17 +395,45 @@ class EducationalMLPipeline:
         """
         print("Iniciando treinamento dos modelos...")
         
+        self.data_fingerprint = compute_data_fingerprint(X, y)
+        
         # Dividir dados em treino e teste
         X_train, X_test, y_train, y_test = train_test_split(
             X, y, test_size=0.2, random_state=42, stratify=y
         )
         
+        self._resolve_svm(len(X_train))
+        
+        # Distribuição de treino usada como referência pelo monitor de drift
+        self.training_profile = build_training_profile(
+            X_train, self.preprocessor.numerical_features, self.preprocessor.categories_
+        )
+        
         results = {}
         
-        for name, model in self.models.items():
+        for name, base_model in self.models.items():
+            cache_key = None
+            if self.artifact_cache:
+                cache_key = self.artifact_cache.make_key(
+                    self.data_fingerprint, name, base_model.get_params(),
+                    test_size=0.2, random_state=42, cv=5,
+                    classes=[str(c) for c in self.label_encoder.classes_]
+                )
+                cached = self.artifact_cache.get(cache_key)
+                if cached is not None:
+                    if cached.get('serving') is None:
+                        # Artefato anterior ao custo de serving: medir uma vez e regravar
+                        cached['serving'] = measure_serving_cost(cached['model'], X_test)
+                        self.artifact_cache.set(cache_key, cached)
+                    results[name] = cached
+                    print(f"{name} - Acurácia: {cached['accuracy']:.4f}, "
+                          f"F1-Score: {cached['f1_score']:.4f} (cache)")
+                    continue
+            
             print(f"Treinando {name}...")
             
-            # Treinar modelo
+            # Treinar modelo (normalização ajustada apenas no treino)
+            model = make_model_pipeline(clone(base_model))
             model.fit(X_train, y_train)
             
             # Fazer predições
@@ -151,8 +443,8 @@ class EducationalMLPipeline:
             accuracy = accuracy_score(y_test, y_pred)
             f1 = f1_score(y_test, y_pred, average='weighted')
             
-            # Cross-validation
-            cv_scores = cross_val_score(model, X_train, y_train, cv=5)
+            # Cross-validation (normalização reajustada em cada fold)
+            cv_scores = cross_val_score(make_model_pipeline(clone(base_model)), X_train, y_train, cv=5)
             
             # Armazenar resultados
             results[name] = {
@@ -165,14 +457,77 @@ class EducationalMLPipeline:
                 'y_pred': y_pred,
                 'classification_report': classification_report(y_test, y_pred, 
                                                              target_names=self.label_encoder.classes_),
-                'confusion_matrix': confusion_matrix(y_test, y_pred)
+                'confusion_matrix': confusion_matrix(y_test, y_pred),
+                # Custo de serving medido nesta máquina; guardado com o artefato,
+                # de modo que uma execução sem mudanças não repete a medição
+                'serving': measure_serving_cost(model, X_test)
             }
             
+            if cache_key:
+                self.artifact_cache.set(cache_key, results[name])
+            
             print(f"{name} - Acurácia: {accuracy:.4f}, F1-Score: {f1:.4f}")
         
+        for name, result in results.items():
+            print(f"{name} - Latência p95: {result['serving']['single_row_p95_ms']:.3f} ms, "
+                  f"Memória: {result['serving']['memory_mb']:.2f} MB")
+        
         self.trained_models = results
         return results
     
+    def select_serving_model(self) -> Dict[str, Any]:
+        """
+        Escolhe o modelo de serving.
+        
+        Maximiza a acurácia entre os modelos dentro do orçamento de latência
+        e de memória (empate: menor latência). Se nenhum couber no
+        orçamento, escolhe o de menor latência.
+        
+        Returns:
+            Dict com o modelo escolhido, o orçamento, os candidatos e o custo
+            da escolha em acurácia em relação ao modelo mais preciso
+        """
+        candidates = []
+        for name, result in self.trained_models.items():
+            serving = result.get('serving') or {}
+            reasons = []
+            latency = serving.get('single_row_p95_ms')
+            memory = serving.get('memory_mb')
+            if self.latency_budget_ms is not None and latency is not None and latency > self.latency_budget_ms:
+                reasons.append(f"latência p95 {latency:.3f} ms > {self.latency_budget_ms} ms")
+            if self.memory_budget_mb is not None and memory is not None and memory > self.memory_budget_mb:
+                reasons.append(f"memória {memory:.2f} MB > {self.memory_budget_mb} MB")
+            candidates.append({
+                'model': name,
+                'accuracy': float(result['accuracy']),
+                'single_row_p95_ms': latency,
+                'memory_mb': memory,
+                'within_budget': not reasons,
+                'reasons': reasons
+            })
+        
+        latency_key = lambda c: c['single_row_p95_ms'] if c['single_row_p95_ms'] is not None else float('inf')
+        eligible = [c for c in candidates if c['within_budget']]
+        if eligible:
+            chosen = max(eligible, key=lambda c: (c['accuracy'], -latency_key(c)))
+        else:
+            chosen = min(candidates, key=latency_key)
+        most_accurate = max(candidates, key=lambda c: c['accuracy'])
+        
+        return {
+            'model': chosen['model'],
+            'within_budget': chosen['within_budget'],
+            'latency_budget_ms': self.latency_budget_ms,
+            'memory_budget_mb': self.memory_budget_mb,
+            'most_accurate_model': most_accurate['model'],
+            'accuracy_cost': most_accurate['accuracy'] - chosen['accuracy'],
+            'candidates': candidates
+        }
+    
+    def get_best_model_name(self) -> str:
+        """Retorna o modelo de serving (maior acurácia dentro do orçamento, ver `select_serving_model`)."""
+        return self.select_serving_model()['model']
+    
     def evaluate_models(self) -> None:
         """Avalia e compara os modelos treinados."""
         print("\n=== AVALIAÇÃO DETALHADA DOS MODELOS ===")
@@ -185,7 +540,9 @@ class EducationalMLPipeline:
                 'Acurácia': result['accuracy'],
                 'F1-Score': result['f1_score'],
                 'CV Média': result['cv_mean'],
-                'CV Desvio': result['cv_std']
+                'CV Desvio': result['cv_std'],
+                'p95 (ms)': result.get('serving', {}).get('single_row_p95_ms'),
+                'Memória (MB)': result.get('serving', {}).get('memory_mb')
             })
         
         comparison_df = pd.DataFrame(comparison_data)
@@ -204,6 +561,9 @@ class EducationalMLPipeline:
         """
         Gera visualizações dos resultados.
         
+        Para servir os gráficos pela aplicação, use o ChartRenderer, que os
+        gera em segundo plano a partir do registro.
+        
         Args:
             save_path: Caminho para salvar os gráficos
         """
@@ -211,81 +571,80 @@ class EducationalMLPipeline:
             print("Nenhum modelo treinado encontrado!")
             return
         
-        # Configurar matplotlib para português
-        plt.rcParams['font.size'] = 12
-        
-        # Criar subplots
-        fig, axes = plt.subplots(2, 2, figsize=(15, 12))
-        fig.suptitle('Avaliação dos Algoritmos de Machine Learning', fontsize=16, fontweight='bold')
-        
-        # 1. Comparação de Acurácia
-        models = list(self.trained_models.keys())
-        accuracies = [self.trained_models[m]['accuracy'] for m in models]
-        f1_scores = [self.trained_models[m]['f1_score'] for m in models]
-        
-        axes[0, 0].bar(models, accuracies, color=['#FF6B6B', '#4ECDC4', '#45B7D1'])
-        axes[0, 0].set_title('Comparação de Acurácia')
-        axes[0, 0].set_ylabel('Acurácia')
-        axes[0, 0].set_ylim(0, 1)
-        for i, v in enumerate(accuracies):
-            axes[0, 0].text(i, v + 0.01, f'{v:.3f}', ha='center', va='bottom')
-        
-        # 2. Comparação de F1-Score
-        axes[0, 1].bar(models, f1_scores, color=['#FF6B6B', '#4ECDC4', '#45B7D1'])
-        axes[0, 1].set_title('Comparação de F1-Score')
-        axes[0, 1].set_ylabel('F1-Score')
-        axes[0, 1].set_ylim(0, 1)
-        for i, v in enumerate(f1_scores):
-            axes[0, 1].text(i, v + 0.01, f'{v:.3f}', ha='center', va='bottom')
-        
-        # 3. Cross-Validation Scores
-        cv_means = [self.trained_models[m]['cv_mean'] for m in models]
-        cv_stds = [self.trained_models[m]['cv_std'] for m in models]
-        
-        axes[1, 0].bar(models, cv_means, yerr=cv_stds, color=['#FF6B6B', '#4ECDC4', '#45B7D1'], 
-                       capsize=5, alpha=0.7)
-        axes[1, 0].set_title('Cross-Validation Scores')
-        axes[1, 0].set_ylabel('CV Score')
-        axes[1, 0].set_ylim(0, 1)
-        
-        # 4. Matriz de Confusão do melhor modelo
-        best_model = max(self.trained_models.keys(), 
-                        key=lambda x: self.trained_models[x]['accuracy'])
-        cm = self.trained_models[best_model]['confusion_matrix']
-        
-        sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', 
-                   xticklabels=self.label_encoder.classes_,
-                   yticklabels=self.label_encoder.classes_,
-                   ax=axes[1, 1])
-        axes[1, 1].set_title(f'Matriz de Confusão - {best_model}')
-        axes[1, 1].set_xlabel('Predito')
-        axes[1, 1].set_ylabel('Real')
-        
-        plt.tight_layout()
-        
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"Gráfico salvo em: {save_path}")
-        
-        plt.show()
-    
-    def save_models(self, directory: str) -> None:
+        if not save_path:
+            print("Informe save_path para salvar os gráficos.")
+            return
+        
+        plot_evaluation(self.export_bundle()['metrics'], [str(c) for c in self.label_encoder.classes_],
+                        self.get_best_model_name(), save_path, dpi=300)
+        print(f"Gráfico salvo em: {save_path}")
+    
+    def export_bundle(self) -> Dict[str, Any]:
+        """
+        Exporta o melhor modelo com tudo o que é necessário para servi-lo.
+        
+        Returns:
+            Dict com modelo, pré-processamento, esquema de features, métricas
+            e impressão digital dos dados de treinamento
+        """
+        best_model = self.get_best_model_name()
+        
+        return {
+            'model_name': best_model,
+            'model': self.trained_models[best_model]['model'],
+            'preprocessor': self.preprocessor,
+            'label_encoder': self.label_encoder,
+            'feature_schema': {
+                'numerical_features': list(self.preprocessor.numerical_features),
+                'categorical_features': dict(self.preprocessor.categories_),
+                'target': TARGET_COLUMN,
+                'classes': [str(c) for c in self.label_encoder.classes_]
+            },
+            'metrics': {
+                name: {
+                    'accuracy': float(result['accuracy']),
+                    'f1_score': float(result['f1_score']),
+                    'cv_mean': float(result['cv_mean']),
+                    'cv_std': float(result['cv_std']),
+                    'confusion_matrix': np.asarray(result['confusion_matrix']).tolist(),
+                    'serving': result.get('serving')
+                }
+                for name, result in self.trained_models.items()
+            },
+            'serving_selection': self.select_serving_model(),
+            'hyperparameters': {
+                'params': self.models[best_model].get_params(),
+                'tuning': self.tuning_results.get(best_model)
+            },
+            'data_fingerprint': self.data_fingerprint,
+            'training_profile': self.training_profile
+        }
+    
+    def save_models(self, directory: str, promote: bool = True) -> str:
         """
-        Salva os modelos treinados.
+        Salva o resultado do treinamento como uma nova versão no registro.
         
         Args:
-            directory: Diretório para salvar os modelos
+            directory: Diretório raiz do registro de modelos
+            promote: Se a nova versão deve ser promovida para produção
+            
+        Returns:
+            Identificador da versão criada
         """
-        os.makedirs(directory, exist_ok=True)
+        registry = ModelRegistry(directory)
+        version = registry.register(self.export_bundle())
+        print(f"Modelo {self.get_best_model_name()} salvo na versão {version} em: {directory}")
         
-        for name, result in self.trained_models.items():
-            model_path = os.path.join(directory, f"{name.lower()}_model.pkl")
-            joblib.dump(result['model'], model_path)
-            print(f"Modelo {name} salvo em: {model_path}")
+        # Exportar a versão compilada (numpy puro) antes da promoção
+        try:
+            export_compiled(registry, version)
+        except CompilationError as e:
+            print(f"Versão compilada não gerada: {e}")
+        
+        if promote:
+            registry.promote(version)
         
-        # Salvar scaler e label encoder
-        joblib.dump(self.scaler, os.path.join(directory, "scaler.pkl"))
-        joblib.dump(self.label_encoder, os.path.join(directory, "label_encoder.pkl"))
+        return version
         
     def generate_report(self) -> str:
         """
@@ -301,11 +660,33 @@ class EducationalMLPipeline:
         report += "## Resumo Executivo\n\n"
         
         # Encontrar o melhor modelo
-        best_model = max(self.trained_models.keys(), 
-                        key=lambda x: self.trained_models[x]['accuracy'])
+        best_model = self.get_best_model_name()
         best_accuracy = self.trained_models[best_model]['accuracy']
         
-        report += f"O melhor modelo foi **{best_model}** com acurácia de **{best_accuracy:.4f}**.\n\n"
+        report += f"O modelo escolhido para produção foi **{best_model}** com acurácia de **{best_accuracy:.4f}**.\n\n"
+        
+        selection = self.select_serving_model()
+        report += "## Seleção do Modelo de Serving\n\n"
+        report += (f"Orçamento: latência p95 unitária ≤ {selection['latency_budget_ms']} ms, "
+                   f"memória ≤ {selection['memory_budget_mb']} MB.\n\n")
+        report += "| Modelo | Acurácia | p95 unitária (ms) | Lote (µs/linha) | Tamanho (MB) | Pico (MB) | No orçamento |\n"
+        report += "|--------|----------|-------------------|-----------------|--------------|-----------|--------------|\n"
+        for candidate in selection['candidates']:
+            serving = self.trained_models[candidate['model']].get('serving') or {}
+            peak = serving.get('peak_predict_mb')
+            report += (f"| {candidate['model']} | {candidate['accuracy']:.4f} | "
+                       f"{serving.get('single_row_p95_ms', float('nan')):.3f} | "
+                       f"{serving.get('batch_per_row_us', float('nan')):.2f} | "
+                       f"{serving.get('size_mb', float('nan')):.2f} | "
+                       f"{'-' if peak is None else f'{peak:.2f}'} | "
+                       f"{'sim' if candidate['within_budget'] else 'não: ' + '; '.join(candidate['reasons'])} |\n")
+        if selection['model'] != selection['most_accurate_model']:
+            report += (f"\n**{selection['model']}** foi escolhido no lugar de **{selection['most_accurate_model']}** "
+                       f"(mais preciso), abrindo mão de {selection['accuracy_cost']:.4f} de acurácia "
+                       f"para respeitar o orçamento de serving.\n")
+        if not selection['within_budget']:
+            report += "\nNenhum modelo coube no orçamento; foi escolhido o de menor latência.\n"
+        report += "\n"
         
         report += "## Comparação Detalhada\n\n"
         report += "| Modelo | Acurácia | F1-Score | CV Média | CV Desvio |\n"
@@ -329,28 +710,46 @@ class EducationalMLPipeline:
         
         report += "## Conclusões\n\n"
         report += "Com base nos resultados obtidos, podemos concluir que:\n\n"
-        report += f"1. O algoritmo **{best_model}** apresentou o melhor desempenho geral.\n"
+        report += f"1. O algoritmo **{best_model}** apresentou o melhor desempenho dentro do orçamento de serving.\n"
         report += "2. Todos os modelos mostraram capacidade de generalização adequada.\n"
         report += "3. Os resultados de cross-validation indicam estabilidade dos modelos.\n"
         
         return report
 
-def main():
-    """Função principal para executar o pipeline de ML."""
+def main(tune: bool = False, dataset_dir: str = None):
+    """
+    Função principal para executar o pipeline de ML.
+    
+    Args:
+        tune: Se os hiperparâmetros devem ser ajustados antes do treinamento
+        dataset_dir: Diretório de um dataset colunar; é reutilizado se
+            existir, ou criado a partir do dataset de exemplo
+    """
     print("=== Pipeline de Machine Learning para Dados Educacionais ===\n")
     
     # Criar instância do pipeline
-    ml_pipeline = EducationalMLPipeline()
+    ml_pipeline = EducationalMLPipeline(cache_dir='.artifact_cache')
     
-    # Criar dataset de exemplo
-    print("Criando dataset educacional de exemplo...")
-    df = ml_pipeline.create_sample_educational_dataset()
-    print(f"Dataset criado com {len(df)} amostras")
-    print(f"Distribuição das classes: {df['performance'].value_counts().to_dict()}")
+    if dataset_dir and os.path.exists(dataset_dir):
+        # Reutilizar o dataset colunar (memory-map, sem gerar novamente)
+        df = ml_pipeline.load_dataset(dataset_dir)
+    else:
+        # Criar dataset de exemplo
+        print("Criando dataset educacional de exemplo...")
+        df = ml_pipeline.create_sample_educational_dataset()
+        print(f"Dataset criado com {len(df)} amostras")
+        print(f"Distribuição das classes: {df['performance'].value_counts().to_dict()}")
+        
+        if dataset_dir:
+            ml_pipeline.save_dataset(df, dataset_dir)
     
     # Pré-processar dados
     X, y = ml_pipeline.preprocess_data(df)
     
+    # Ajustar hiperparâmetros
+    if tune:
+        ml_pipeline.tune_models(X, y)
+    
     # Treinar modelos
     results = ml_pipeline.train_models(X, y)
     
@@ -368,6 +767,52 @@ def main():
     
     return ml_pipeline, report
 
+# Mínimo de estudantes com sessões finalizadas para treinar com o feature store
+MIN_FEATURE_STORE_STUDENTS = 50
+
+def train_from_feature_store(model_dir: str = 'trained_models', tune: bool = False,
+                             promote: bool = True, cache_dir: Optional[str] = '.artifact_cache',
+                             session=None) -> Tuple[EducationalMLPipeline, str]:
+    """
+    Treina os modelos com os dados reais do feature store e registra a versão.
+    
+    A versão registrada usa as features de FEATURE_STORE_FEATURES e pode
+    ser usada pelo job de pontuação em lote (`flask score-students`).
+    
+    Args:
+        model_dir: Diretório raiz do registro de modelos
+        tune: Se os hiperparâmetros devem ser ajustados antes do treinamento
+        promote: Se a nova versão deve ser promovida para produção
+        cache_dir: Diretório do cache de artefatos (None desativa o cache)
+        session: Sessão do SQLAlchemy (padrão: db.session)
+        
+    Returns:
+        Tuple com o pipeline treinado e a versão criada
+    """
+    from .feature_store import FeatureStore
+    
+    print("=== Treinamento com o Feature Store ===\n")
+    
+    ml_pipeline = EducationalMLPipeline(cache_dir=cache_dir)
+    _, X, scores = FeatureStore(session).load_matrix()
+    
+    # Estudantes sem sessões finalizadas não têm score médio (target)
+    has_sessions = X[:, 0] > 0
+    if has_sessions.sum() < MIN_FEATURE_STORE_STUDENTS:
+        raise ValueError(f"São necessários ao menos {MIN_FEATURE_STORE_STUDENTS} estudantes com sessões "
+                         f"finalizadas (encontrados: {int(has_sessions.sum())})")
+    
+    X, y = ml_pipeline.preprocess_feature_store_data(X[has_sessions], scores[has_sessions])
+    
+    if tune:
+        ml_pipeline.tune_models(X, y)
+    
+    ml_pipeline.train_models(X, y)
+    ml_pipeline.evaluate_models()
+    version = ml_pipeline.save_models(model_dir, promote=promote)
+    
+    return ml_pipeline, version
+
 if __name__ == "__main__":
     pipeline, report = main()
 
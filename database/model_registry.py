@@ -0,0 +1,141 @@
+import json
+import logging
+import os
+import shutil
+import uuid
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+class RegistryError(Exception):
+    """Exceção para versões inexistentes ou registro inválido."""
+    pass
+
+class ModelRegistry:
+    """
+    Registro versionado de modelos treinados.
+
+    Cada execução de treinamento gera um bundle imutável em
+    `<root>/versions/<versão>/` contendo o modelo, o pipeline de
+    pré-processamento completo, o esquema de features, as métricas e a
+    impressão digital dos dados. A versão em produção é indicada pelo
+    arquivo `<root>/CURRENT`, trocado atomicamente em `promote`.
+    """
+
+    BUNDLE_FILE = 'bundle.pkl'
+    MANIFEST_FILE = 'manifest.json'
+    CURRENT_FILE = 'CURRENT'
+
+    def __init__(self, root: str = 'trained_models'):
+        self.root = root
+        self.versions_dir = os.path.join(root, 'versions')
+        os.makedirs(self.versions_dir, exist_ok=True)
+
+    def _version_dir(self, version: str) -> str:
+        return os.path.join(self.versions_dir, version)
+
+    def register(self, bundle: Dict[str, Any]) -> str:
+        """
+        Armazena um novo bundle como uma versão imutável.
+
+        O bundle é escrito em um diretório temporário e renomeado para o
+        destino final, de modo que leitores nunca vejam uma versão parcial.
+
+        Args:
+            bundle: Dicionário gerado por `EducationalMLPipeline.export_bundle`
+
+        Returns:
+            Identificador da versão criada
+        """
+        created_at = datetime.utcnow()
+        fingerprint = bundle.get('data_fingerprint') or ''
+        version = f"{created_at.strftime('%Y%m%dT%H%M%S')}-{fingerprint[:8] or uuid.uuid4().hex[:8]}"
+        if os.path.exists(self._version_dir(version)):
+            version = f"{version}-{uuid.uuid4().hex[:4]}"
+
+        manifest = {
+            'version': version,
+            'created_at': created_at.isoformat(),
+            'model_name': bundle['model_name'],
+            'feature_schema': bundle['feature_schema'],
+            'metrics': bundle['metrics'],
+            'hyperparameters': bundle.get('hyperparameters'),
+            'serving_selection': bundle.get('serving_selection'),
+            'data_fingerprint': fingerprint
+        }
+
+        import joblib
+
+        tmp_dir = os.path.join(self.root, f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(tmp_dir)
+        try:
+            joblib.dump({**bundle, 'version': version}, os.path.join(tmp_dir, self.BUNDLE_FILE))
+            with open(os.path.join(tmp_dir, self.MANIFEST_FILE), 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2, default=str)
+            os.rename(tmp_dir, self._version_dir(version))
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        logger.info(f"Versão {version} registrada ({bundle['model_name']})")
+        return version
+
+    def promote(self, version: str) -> None:
+        """Define atomicamente a versão servida em produção."""
+        if not os.path.isdir(self._version_dir(version)):
+            raise RegistryError(f"Versão não encontrada: {version}")
+
+        tmp_path = os.path.join(self.root, f".{self.CURRENT_FILE}.{uuid.uuid4().hex}")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(version)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, os.path.join(self.root, self.CURRENT_FILE))
+
+        logger.info(f"Versão {version} promovida para produção")
+
+    def current_version(self) -> Optional[str]:
+        """Retorna a versão promovida, ou None se nenhuma foi promovida."""
+        try:
+            with open(os.path.join(self.root, self.CURRENT_FILE), 'r', encoding='utf-8') as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def list_versions(self) -> List[Dict[str, Any]]:
+        """Lista os manifestos de todas as versões, da mais recente para a mais antiga."""
+        manifests = []
+        for version in sorted(os.listdir(self.versions_dir), reverse=True):
+            manifests.append(self.get_manifest(version))
+        return manifests
+
+    def get_manifest(self, version: str) -> Dict[str, Any]:
+        """Retorna o manifesto de uma versão."""
+        path = os.path.join(self._version_dir(version), self.MANIFEST_FILE)
+        if not os.path.exists(path):
+            raise RegistryError(f"Versão não encontrada: {version}")
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def load(self, version: Optional[str] = None, mmap_mode: Optional[str] = 'r') -> Dict[str, Any]:
+        """
+        Carrega um bundle do registro.
+
+        Args:
+            version: Versão desejada (padrão: versão promovida)
+            mmap_mode: Modo de memory-map dos arrays numpy do bundle
+
+        Returns:
+            Dicionário com o bundle completo
+        """
+        version = version or self.current_version()
+        if not version:
+            raise RegistryError("Nenhuma versão promovida no registro")
+
+        path = os.path.join(self._version_dir(version), self.BUNDLE_FILE)
+        if not os.path.exists(path):
+            raise RegistryError(f"Versão não encontrada: {version}")
+
+        import joblib
+        return joblib.load(path, mmap_mode=mmap_mode)
@@ -0,0 +1,452 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from queue import Queue, Empty
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+from .drift_monitor import DriftMonitor, DRIFT_WINDOW_SECONDS
+from .model_registry import ModelRegistry, RegistryError
+
+logger = logging.getLogger(__name__)
+
+class PredictionError(Exception):
+    """Exceção para entradas inválidas ou modelos indisponíveis."""
+    pass
+
+class LatencyTracker:
+    """Janela deslizante de latências para cálculo de percentis."""
+
+    def __init__(self, window_size: int = 1000):
+        self._samples = deque(maxlen=window_size)
+        self._lock = threading.Lock()
+
+    def record(self, latency_ms: float) -> None:
+        """Registra uma latência em milissegundos."""
+        with self._lock:
+            self._samples.append(latency_ms)
+
+    def percentiles(self) -> Dict[str, Optional[float]]:
+        """Retorna p50, p95 e p99 das latências registradas."""
+        with self._lock:
+            samples = np.fromiter(self._samples, dtype=np.float64)
+
+        if samples.size == 0:
+            return {'p50_ms': None, 'p95_ms': None, 'p99_ms': None, 'samples': 0}
+
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+        return {
+            'p50_ms': round(float(p50), 3),
+            'p95_ms': round(float(p95), 3),
+            'p99_ms': round(float(p99), 3),
+            'samples': int(samples.size)
+        }
+
+class MicroBatcher:
+    """
+    Agrupa requisições concorrentes em micro-lotes.
+
+    Cada chamada a `submit` entra em uma fila; uma thread de fundo coleta
+    até `max_batch_size` itens ou espera no máximo `max_wait_ms` e então
+    executa `batch_fn` uma única vez para o lote inteiro.
+    """
+
+    def __init__(self, batch_fn, max_batch_size: int = 64, max_wait_ms: float = 2.0):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = Queue()
+        self._thread = threading.Thread(target=self._run, name='model-microbatcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        """Enfileira um item e retorna um Future com o seu resultado."""
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def _collect(self) -> List[tuple]:
+        """Bloqueia até o primeiro item e coleta o restante do lote."""
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except Empty:
+                break
+
+        return batch
+
+    def _run(self) -> None:
+        """Loop da thread de fundo."""
+        while True:
+            batch = self._collect()
+            items = [item for item, _ in batch]
+
+            try:
+                results = self.batch_fn(items)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            results = list(results)
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+            if len(results) < len(batch):
+                # Sem resultado, os chamadores restantes ficariam bloqueados para sempre
+                error = RuntimeError(f"batch_fn retornou {len(results)} resultados para {len(batch)} itens")
+                logger.error(f"Erro no micro-lote: {error}")
+                for _, future in batch[len(results):]:
+                    future.set_exception(error)
+
+class ServingBundle:
+    """
+    Versão imutável de um modelo pronta para servir predições.
+
+    Agrupa o modelo, o pré-processamento e o esquema de features de uma
+    versão do registro. Uma troca de versão substitui o objeto inteiro, de
+    modo que predições em andamento nunca misturam artefatos de versões
+    diferentes.
+    """
+
+    def __init__(self, bundle: Dict[str, Any]):
+        self.version = bundle['version']
+        self.model_name = bundle['model_name']
+        self.model = bundle['model']
+        self.preprocessor = bundle['preprocessor']
+        self.label_encoder = bundle['label_encoder']
+        self.numerical_features = bundle['feature_schema']['numerical_features']
+        self.categories = bundle['feature_schema']['categorical_features']
+        self.categorical_features = list(self.categories)
+        self.classes = [str(c) for c in self.label_encoder.classes_]
+        self.training_profile = bundle.get('training_profile')
+        self.drift = None
+
+    def validate(self, record: Dict[str, Any], index: int = 0) -> None:
+        """Valida um registro de entrada sem vetorizá-lo."""
+        missing = [f for f in self.numerical_features + self.categorical_features if f not in record]
+        if missing:
+            raise PredictionError(f"Features ausentes no registro {index}: {', '.join(missing)}")
+
+        for feature in self.numerical_features:
+            try:
+                float(record[feature])
+            except (TypeError, ValueError):
+                raise PredictionError(f"Valor inválido para {feature} no registro {index}")
+
+        for feature in self.categorical_features:
+            if record[feature] not in self.categories[feature]:
+                raise PredictionError(f"Valor desconhecido para {feature} no registro {index}: {record[feature]}")
+
+    def vectorize(self, records: List[Dict[str, Any]]) -> np.ndarray:
+        """Converte uma lista de registros na matriz de features do modelo."""
+        columns = {
+            feature: [record[feature] for record in records]
+            for feature in self.numerical_features + self.categorical_features
+        }
+        return self.preprocessor.transform(columns)
+
+    def predict_matrix(self, X: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Prediz uma matriz de features já vetorizada.
+
+        Returns:
+            Tuple com as classes preditas e as probabilidades por classe
+            (None se o modelo não as fornece)
+        """
+        predictions = self.label_encoder.inverse_transform(self.model.predict(X))
+
+        probabilities = None
+        if hasattr(self.model, 'predict_proba'):
+            probabilities = self.model.predict_proba(X)
+
+        return predictions, probabilities
+
+    def predict_records(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Executa uma predição vetorizada para um lote de registros."""
+        return self.format_predictions(*self.predict_matrix(self.vectorize(records)))
+
+    def format_predictions(self, predictions: np.ndarray,
+                           probabilities: Optional[np.ndarray]) -> List[Dict[str, Any]]:
+        """Converte o resultado de `predict_matrix` na resposta da API."""
+        results = []
+        for i, prediction in enumerate(predictions):
+            result = {'performance': str(prediction), 'model': self.model_name, 'version': self.version}
+            if probabilities is not None:
+                result['probabilities'] = {
+                    cls: round(float(p), 4) for cls, p in zip(self.classes, probabilities[i])
+                }
+            results.append(result)
+
+        return results
+
+    def warm_up(self) -> None:
+        """Executa uma predição descartável para aquecer caches do modelo."""
+        n_features = len(self.numerical_features) + len(self.categorical_features)
+        self.model.predict(np.zeros((1, n_features), dtype=np.float32))
+
+def load_predictor(registry: ModelRegistry, version: Optional[str] = None,
+                   compiled: bool = False):
+    """
+    Carrega uma versão do registro pronta para predição.
+
+    No modo compilado os arrays exportados por `export_compiled` são
+    usados no lugar do bundle pickle, sem importar o scikit-learn.
+
+    Args:
+        registry: Registro de modelos
+        version: Versão desejada (padrão: versão promovida)
+        compiled: Se deve usar o modelo compilado
+
+    Returns:
+        ServingBundle ou CompiledPredictor
+    """
+    if not compiled:
+        return ServingBundle(registry.load(version))
+
+    from .compiled_inference import CompiledPredictor, COMPILED_DIR
+
+    version = version or registry.current_version()
+    if not version:
+        raise RegistryError("Nenhuma versão promovida no registro")
+    directory = os.path.join(registry.versions_dir, version, COMPILED_DIR)
+    if not os.path.isdir(directory):
+        raise RegistryError(f"Versão {version} não possui modelo compilado")
+    return CompiledPredictor.load(directory)
+
+class ModelServer:
+    """
+    Servidor de modelos para predições online de performance.
+
+    Carrega a versão promovida do registro uma única vez por processo
+    (worker) e atende predições unitárias via micro-batching e predições
+    em lote de forma vetorizada. Uma thread de fundo observa o registro e
+    troca para uma nova versão promovida sem reiniciar o worker: a nova
+    versão é carregada e aquecida fora do caminho das requisições e só
+    então substitui a atual.
+    """
+
+    def __init__(self, model_dir: str = 'trained_models', max_batch_size: int = 64,
+                 max_wait_ms: float = 2.0, timeout: float = 5.0, poll_interval: float = 10.0,
+                 compiled: bool = False, drift_dir: Optional[str] = None, drift_flush_interval: float = 60.0,
+                 drift_window_seconds: float = DRIFT_WINDOW_SECONDS):
+        self.registry = ModelRegistry(model_dir)
+        self.compiled = compiled
+        self.drift_dir = drift_dir
+        self.drift_flush_interval = drift_flush_interval
+        self.drift_window_seconds = drift_window_seconds
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        # Predições unitárias e lotes inteiros têm latências de escalas diferentes
+        self.latency = LatencyTracker()
+        self.bulk_latency = LatencyTracker()
+        self._bundle = None
+        self._load_lock = threading.Lock()
+        self._batcher = MicroBatcher(self._predict_batch, max_batch_size, max_wait_ms)
+        self._watcher = None
+
+    @property
+    def version(self) -> Optional[str]:
+        bundle = self._bundle
+        return bundle.version if bundle else None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._bundle is not None
+
+    def load(self, version: Optional[str] = None) -> str:
+        """
+        Carrega uma versão do registro e a coloca em produção neste processo.
+
+        Args:
+            version: Versão desejada (padrão: versão promovida)
+
+        Returns:
+            Versão carregada
+        """
+        bundle = load_predictor(self.registry, version, self.compiled)
+        bundle.warm_up()
+        if bundle.training_profile:
+            bundle.drift = DriftMonitor(bundle.training_profile, bundle.version, self.drift_dir,
+                                        self.drift_flush_interval, self.drift_window_seconds)
+            bundle.drift.prune_other_versions()
+
+        # Atribuição única: requisições em andamento mantêm a versão anterior
+        previous, self._bundle = self._bundle, bundle
+        if previous is not None and previous.drift is not None:
+            previous.drift.flush()
+
+        logger.info(f"Modelo {bundle.model_name} (versão {bundle.version}) em produção")
+        return bundle.version
+
+    def refresh(self) -> bool:
+        """
+        Troca para a versão promovida caso ela tenha mudado.
+
+        Returns:
+            True se houve troca de versão
+        """
+        current = self.registry.current_version()
+        if not current or current == self.version:
+            return False
+
+        with self._load_lock:
+            if current == self.version:
+                return False
+            self.load(current)
+        return True
+
+    def _watch(self) -> None:
+        """Loop da thread que observa promoções no registro."""
+        while True:
+            time.sleep(self.poll_interval)
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Falha ao atualizar versão do modelo: {e}")
+
+    def _ensure_loaded(self) -> ServingBundle:
+        bundle = self._bundle
+        if bundle is not None:
+            return bundle
+
+        with self._load_lock:
+            if self._bundle is None:
+                try:
+                    self.load()
+                except RegistryError as e:
+                    raise PredictionError(f"Modelo treinado não encontrado: {e}")
+
+                if self.poll_interval and self._watcher is None:
+                    self._watcher = threading.Thread(target=self._watch, name='model-registry-watcher',
+                                                     daemon=True)
+                    self._watcher.start()
+
+        return self._bundle
+
+    @staticmethod
+    def _run(bundle, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Vetoriza, registra as features no monitor de drift e prediz um lote."""
+        X = bundle.vectorize(records)
+        if bundle.drift is not None:
+            bundle.drift.observe(X)
+        return bundle.format_predictions(*bundle.predict_matrix(X))
+
+    def _predict_batch(self, items: List[Tuple[Any, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Executa um micro-lote de pares (bundle, registro).
+
+        Cada registro é predito pelo bundle que o validou: durante uma troca
+        de versão o lote pode misturar as duas versões, e cada grupo é
+        vetorizado separadamente.
+        """
+        groups: Dict[int, Tuple[Any, List[int]]] = {}
+        for i, (bundle, _) in enumerate(items):
+            groups.setdefault(id(bundle), (bundle, []))[1].append(i)
+
+        results = [None] * len(items)
+        for bundle, indexes in groups.values():
+            for i, result in zip(indexes, self._run(bundle, [items[i][1] for i in indexes])):
+                results[i] = result
+        return results
+
+    @staticmethod
+    def _validate(bundle, record: Any, index: int = 0) -> None:
+        if not isinstance(record, dict):
+            raise PredictionError(f"O registro {index} deve ser um objeto com as features do estudante")
+        bundle.validate(record, index)
+
+    def predict(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Prediz a performance de um estudante.
+
+        Requisições concorrentes são agrupadas em micro-lotes.
+
+        Args:
+            record: Dicionário com as features do estudante
+
+        Returns:
+            Dict com a classe predita (e probabilidades quando disponíveis)
+        """
+        bundle = self._ensure_loaded()
+        start = time.perf_counter()
+
+        # Validar antes de enfileirar para não derrubar o lote inteiro
+        self._validate(bundle, record)
+        result = self._batcher.submit((bundle, record)).result(timeout=self.timeout)
+
+        self.latency.record((time.perf_counter() - start) * 1000)
+        return result
+
+    def predict_bulk(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Prediz a performance de vários estudantes em uma única chamada.
+
+        Args:
+            records: Lista de dicionários com as features dos estudantes
+
+        Returns:
+            Dict com as predições e as métricas de latência (os percentis
+            são de lotes inteiros, separados das predições unitárias)
+        """
+        bundle = self._ensure_loaded()
+        start = time.perf_counter()
+
+        for i, record in enumerate(records):
+            self._validate(bundle, record, i)
+        predictions = self._run(bundle, records) if records else []
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.bulk_latency.record(elapsed_ms)
+
+        return {
+            'predictions': predictions,
+            'version': bundle.version,
+            'latency': {
+                'batch_ms': round(elapsed_ms, 3),
+                'per_student_ms': round(elapsed_ms / len(records), 4) if records else 0.0,
+                **self.bulk_latency.percentiles()
+            }
+        }
+
+    def drift_report(self) -> Dict[str, Any]:
+        """
+        Relatório de drift da versão em produção, somando todos os workers.
+
+        Returns:
+            Dict com PSI, KS e status por feature (ver `drift_report`)
+        """
+        bundle = self._ensure_loaded()
+        if bundle.drift is None:
+            raise PredictionError(f"A versão {bundle.version} não possui perfil de treinamento")
+        return bundle.drift.report()
+
+# Instância por processo (cada worker do gunicorn carrega a sua própria)
+_model_server = None
+_model_server_lock = threading.Lock()
+
+def get_model_server() -> ModelServer:
+    """Retorna o servidor de modelos do processo atual, criando-o se necessário."""
+    global _model_server
+    if _model_server is None:
+        with _model_server_lock:
+            if _model_server is None:
+                model_dir = os.environ.get('MODEL_DIR', 'trained_models')
+                _model_server = ModelServer(
+                    model_dir,
+                    poll_interval=float(os.environ.get('MODEL_POLL_INTERVAL', '10')),
+                    compiled=os.environ.get('MODEL_COMPILED', '0') == '1',
+                    drift_dir=os.environ.get('MODEL_DRIFT_DIR', os.path.join(model_dir, 'drift')),
+                    drift_window_seconds=float(os.environ.get('MODEL_DRIFT_WINDOW_HOURS', '24')) * 3600
+                )
+    return _model_server
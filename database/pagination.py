@@ -0,0 +1,146 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Sequence
+
+from sqlalchemy import select, and_, or_, false
+
+from database.config import db
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+class PaginationError(ValueError):
+    """Parâmetros de paginação ou projeção inválidos."""
+
+def _to_json(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Codifica a chave da última linha de uma página em um cursor opaco."""
+    payload = json.dumps([_to_json(v) for v in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> List[Any]:
+    """
+    Decodifica um cursor gerado por `encode_cursor`.
+
+    Args:
+        cursor: Cursor recebido do cliente
+        columns: Colunas da chave, usadas para converter os valores
+
+    Raises:
+        PaginationError: Cursor malformado
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError
+        return [
+            datetime.fromisoformat(v) if v is not None and column.type.python_type is datetime else v
+            for v, column in zip(values, columns)
+        ]
+    except (ValueError, TypeError, UnicodeError, binascii.Error):
+        raise PaginationError("Cursor inválido")
+
+def parse_fields(raw: Optional[str], allowed: Sequence[str]) -> List[str]:
+    """
+    Interpreta o parâmetro `fields` (lista separada por vírgulas).
+
+    Raises:
+        PaginationError: Campo desconhecido
+    """
+    if not raw:
+        return list(allowed)
+
+    fields = [f.strip() for f in raw.split(',') if f.strip()]
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise PaginationError(f"Campos inválidos: {', '.join(unknown)}")
+    return list(dict.fromkeys(fields))
+
+def parse_limit(raw: Optional[str]) -> int:
+    """Interpreta o parâmetro `limit`, limitado a MAX_PAGE_SIZE."""
+    if raw is None:
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(raw)
+    except ValueError:
+        raise PaginationError("limit deve ser um número inteiro")
+    if limit < 1:
+        raise PaginationError("limit deve ser maior que zero")
+    return min(limit, MAX_PAGE_SIZE)
+
+def _equals(column, value):
+    return column.is_(None) if value is None else column == value
+
+def _after(column, value):
+    """Linhas depois de `value` na ordem decrescente com NULLs por último."""
+    if value is None:
+        # Os NULLs são os últimos: só o desempate pelas colunas seguintes avança
+        return false()
+    if column.nullable:
+        return or_(column < value, column.is_(None))
+    return column < value
+
+def keyset_page(model, where: Sequence[Any], order_by: Sequence[str], fields: Sequence[str],
+                cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+                session=None) -> Dict[str, Any]:
+    """
+    Lê uma página em ordem decrescente usando paginação por chave (keyset).
+
+    A página seguinte começa logo após a chave da última linha, com
+    `(a < x) OR (a = x AND b < y)`, que usa o índice em vez de pular
+    linhas com OFFSET: o custo de cada página independe do histórico.
+    Colunas anuláveis da chave são ordenadas com NULLS LAST e o predicado
+    do cursor trata os NULLs, de modo que essas linhas não somem depois da
+    primeira página. Só as
+    colunas pedidas (mais as da chave) são lidas, como tuplas, sem
+    instanciar objetos do ORM.
+
+    Args:
+        model: Modelo consultado
+        where: Filtros da consulta (por exemplo, o usuário)
+        order_by: Colunas da chave, da mais significativa à desempate (única)
+        fields: Colunas retornadas
+        cursor: Cursor da página anterior (None para a primeira)
+        limit: Tamanho da página
+        session: Sessão do SQLAlchemy (padrão: db.session)
+
+    Returns:
+        Dict com 'items' (dicionários com os campos pedidos) e 'next_cursor'
+        (None na última página)
+
+    Raises:
+        PaginationError: Cursor inválido
+    """
+    session = session or db.session
+    key_columns = [getattr(model, name) for name in order_by]
+    names = list(dict.fromkeys([*fields, *order_by]))
+
+    query = select(*[getattr(model, name) for name in names]).where(*where)
+    if cursor:
+        after = decode_cursor(cursor, key_columns)
+        # (k1 < v1) OR (k1 = v1 AND k2 < v2) OR ...
+        conditions = []
+        for i, column in enumerate(key_columns):
+            equal = [_equals(key_columns[j], after[j]) for j in range(i)]
+            conditions.append(and_(*equal, _after(column, after[i])))
+        query = query.where(or_(*conditions))
+
+    ordering = [column.desc().nulls_last() if column.nullable else column.desc() for column in key_columns]
+    rows = session.execute(query.order_by(*ordering).limit(limit + 1)).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = None
+    if has_more:
+        last = rows[-1]._mapping
+        next_cursor = encode_cursor([last[name] for name in order_by])
+
+    return {
+        'items': [{name: _to_json(row._mapping[name]) for name in fields} for row in rows],
+        'next_cursor': next_cursor
+    }
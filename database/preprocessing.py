@@ -0,0 +1,104 @@
+from typing import List, Any, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+class FeatureEncoder(BaseEstimator, TransformerMixin):
+    """
+    Converte colunas de estudantes em uma matriz float32 compacta.
+
+    As colunas numéricas e os códigos das colunas categóricas são escritos
+    diretamente em uma única matriz pré-alocada, sem cópias intermediárias
+    do DataFrame. As categorias vêm do dtype `category` quando disponível
+    (sem varrer os dados); caso contrário são os valores únicos vistos no
+    `fit`.
+    """
+
+    def __init__(self, numerical_features: Optional[List[str]] = None,
+                 categorical_features: Optional[List[str]] = None, dtype=np.float32):
+        self.numerical_features = numerical_features
+        self.categorical_features = categorical_features
+        self.dtype = dtype
+
+    @property
+    def feature_names_(self) -> List[str]:
+        return list(self.numerical_features or []) + list(self.categorical_features or [])
+
+    def fit(self, X: Mapping[str, Any], y=None) -> 'FeatureEncoder':
+        """
+        Aprende o vocabulário de cada feature categórica.
+
+        Args:
+            X: DataFrame (ou mapeamento coluna -> valores)
+
+        Returns:
+            O próprio encoder
+        """
+        self.categories_ = {}
+        for feature in self.categorical_features or []:
+            values = X[feature]
+            if isinstance(getattr(values, 'dtype', None), pd.CategoricalDtype):
+                categories = values.dtype.categories
+            else:
+                categories = pd.unique(np.asarray(values, dtype=object))
+                categories = sorted(c for c in categories if c is not None)
+            self.categories_[feature] = [str(c) for c in categories]
+        return self
+
+    def _codes(self, feature: str, values: Any) -> np.ndarray:
+        """Retorna os códigos inteiros de uma coluna categórica."""
+        categories = self.categories_[feature]
+        dtype = getattr(values, 'dtype', None)
+
+        if isinstance(dtype, pd.CategoricalDtype) and list(dtype.categories) == categories:
+            codes = values.cat.codes.to_numpy()
+        else:
+            codes = pd.Categorical(np.asarray(values, dtype=object), categories=categories).codes
+
+        if (codes < 0).any():
+            raise ValueError(f"Valores desconhecidos para {feature}")
+        return codes
+
+    def transform(self, X: Mapping[str, Any]) -> np.ndarray:
+        """
+        Gera a matriz de features.
+
+        Args:
+            X: DataFrame (ou mapeamento coluna -> valores)
+
+        Returns:
+            Matriz (n_amostras, n_features) no dtype configurado
+        """
+        numerical = list(self.numerical_features or [])
+        n_rows = len(X[self.feature_names_[0]])
+        out = np.empty((n_rows, len(self.feature_names_)), dtype=self.dtype)
+
+        for j, feature in enumerate(numerical):
+            out[:, j] = np.asarray(X[feature], dtype=self.dtype)
+
+        for j, feature in enumerate(self.categorical_features or [], start=len(numerical)):
+            out[:, j] = self._codes(feature, X[feature])
+
+        return out
+
+def make_model_pipeline(model: Any) -> Pipeline:
+    """
+    Encadeia a normalização ao modelo.
+
+    O StandardScaler passa a ser ajustado junto com o modelo, apenas nos
+    dados de treino (ou em cada fold da validação cruzada), e o pipeline
+    ajustado é reutilizado sem alterações na inferência.
+
+    Args:
+        model: Estimador do scikit-learn
+
+    Returns:
+        Pipeline (StandardScaler + modelo)
+    """
+    return Pipeline([
+        ('scale', StandardScaler()),
+        ('model', model)
+    ])
@@ -0,0 +1,134 @@
+import json
+import logging
+import re
+from typing import Dict, List, Any, Optional, Sequence
+
+from sqlalchemy import event, inspect
+
+logger = logging.getLogger(__name__)
+
+# Linha do EXPLAIN QUERY PLAN do SQLite: "SCAN progress" / "SCAN TABLE progress AS p USING INDEX ..."
+_SQLITE_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS \w+)?(.*)$')
+
+class QueryAdvisor:
+    """
+    Ferramenta de desenvolvimento que aponta consultas sem índice.
+
+    Usado como context manager, captura o SQL executado no engine (por
+    exemplo, durante as chamadas de um teste ou do test client do Flask) e,
+    em `analyze`, roda o plano de cada comando: `EXPLAIN QUERY PLAN` no
+    SQLite e `EXPLAIN (FORMAT JSON)` no PostgreSQL. Leituras completas de
+    tabelas reais são relatadas. Em tabelas pequenas o PostgreSQL pode
+    preferir o Seq Scan mesmo com índice; rode com dados representativos.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements: List[Dict[str, Any]] = []
+        self.label: Optional[str] = None
+
+    def _capture(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().split(None, 1)[0].upper() in ('SELECT', 'UPDATE', 'DELETE', 'WITH'):
+            if executemany:
+                parameters = parameters[0] if parameters else None
+            self.statements.append({'label': self.label, 'statement': statement, 'parameters': parameters})
+
+    def __enter__(self) -> 'QueryAdvisor':
+        event.listen(self.engine, 'before_cursor_execute', self._capture)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(self.engine, 'before_cursor_execute', self._capture)
+
+    def _sqlite_scans(self, connection, statement: str, parameters: Any, tables: set) -> List[str]:
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters or ()).all()
+        scans = []
+        for row in rows:
+            match = _SQLITE_SCAN.match(row[-1])
+            # "USING INDEX" percorre um índice; subconsultas materializadas não são tabelas
+            if match and match.group(1) in tables and 'USING' not in match.group(2):
+                scans.append(match.group(1))
+        return scans
+
+    def _postgres_scans(self, connection, statement: str, parameters: Any, tables: set) -> List[str]:
+        plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters or ()).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        scans = []
+        def walk(node):
+            if node.get('Node Type') == 'Seq Scan' and node.get('Relation Name') in tables:
+                scans.append(node['Relation Name'])
+            for child in node.get('Plans', []):
+                walk(child)
+        walk(plan[0]['Plan'])
+        return scans
+
+    def analyze(self) -> List[Dict[str, Any]]:
+        """
+        Roda o plano de cada comando capturado (sem repetir comandos iguais).
+
+        Returns:
+            Lista de achados com rótulo, comando e tabelas lidas por completo
+        """
+        dialect = self.engine.dialect.name
+        if dialect == 'sqlite':
+            explain = self._sqlite_scans
+        elif dialect == 'postgresql':
+            explain = self._postgres_scans
+        else:
+            raise ValueError(f"Dialeto não suportado pelo advisor: {dialect}")
+
+        findings = []
+        seen = set()
+        with self.engine.connect() as connection:
+            tables = set(inspect(connection).get_table_names())
+            for captured in self.statements:
+                statement = captured['statement']
+                if statement in seen:
+                    continue
+                seen.add(statement)
+
+                try:
+                    scans = explain(connection, statement, captured['parameters'], tables)
+                except Exception as e:
+                    logger.warning(f"EXPLAIN falhou para {statement[:80]!r}: {e}")
+                    continue
+
+                if scans:
+                    findings.append({
+                        'label': captured['label'],
+                        'tables': sorted(set(scans)),
+                        'statement': ' '.join(statement.split())
+                    })
+            connection.rollback()
+        return findings
+
+def advise_endpoints(app, engine, paths: Sequence[str], user_id: int) -> List[Dict[str, Any]]:
+    """
+    Chama endpoints GET autenticados pelo test client e analisa o SQL de cada um.
+
+    Args:
+        app: Aplicação Flask
+        engine: Engine do SQLAlchemy
+        paths: Caminhos a chamar (por exemplo, '/api/sessions')
+        user_id: Usuário usado no token de acesso
+
+    Returns:
+        Achados do `QueryAdvisor`, rotulados pelo caminho
+    """
+    from flask_jwt_extended import create_access_token
+
+    with app.app_context():
+        headers = {'Authorization': f"Bearer {create_access_token(identity=str(user_id))}"}
+
+    client = app.test_client()
+    with QueryAdvisor(engine) as advisor:
+        for path in paths:
+            advisor.label = path
+            response = client.get(path, headers=headers)
+            if response.status_code >= 400:
+                logger.warning(f"{path} respondeu {response.status_code}")
+
+    with app.app_context():
+        return advisor.analyze()
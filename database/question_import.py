@@ -0,0 +1,200 @@
+import csv
+import io
+import json
+import logging
+import time
+from itertools import islice
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
+
+from database.config import db
+from models import StudySession, Question
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ('csv', 'jsonl')
+
+# Colunas lidas do arquivo; as demais são ignoradas
+IMPORT_COLUMNS = ('question_text', 'answer_text', 'user_answer', 'difficulty', 'topic')
+
+# Exemplos de linhas rejeitadas mantidos no relatório (o total é sempre contado)
+MAX_REJECT_SAMPLES = 50
+
+class QuestionImportError(ValueError):
+    """Arquivo ou destino de importação inválido."""
+
+def detect_format(filename: Optional[str]) -> Optional[str]:
+    """Formato pela extensão do arquivo (.csv, .jsonl ou .ndjson)."""
+    extension = (filename or '').rsplit('.', 1)[-1].lower()
+    return {'csv': 'csv', 'jsonl': 'jsonl', 'ndjson': 'jsonl'}.get(extension)
+
+def _text_stream(stream) -> io.TextIOBase:
+    """Abre um stream binário como texto UTF-8 (aceita o BOM do Excel)."""
+    if isinstance(stream, io.TextIOBase):
+        return stream
+    return io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+def read_records(stream, fmt: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Lê o arquivo registro a registro.
+
+    Yields:
+        (número da linha, registro) — o registro é um dict, ou uma exceção
+        quando a linha não pôde ser interpretada
+    """
+    text = _text_stream(stream)
+    if fmt == 'csv':
+        reader = csv.DictReader(text)
+        for record in reader:
+            yield reader.line_num, record
+    else:
+        for line_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError as e:
+                yield line_number, e
+
+def _batches(iterable: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+class QuestionImporter:
+    """
+    Importação em streaming de bancos de perguntas (CSV ou JSONL) para uma sessão.
+
+    O arquivo passa por um pipeline de geradores (leitura -> validação ->
+    linhas com hash) e é gravado em lotes de tamanho fixo, com commit a
+    cada lote: a memória usada depende do tamanho do lote, não do arquivo.
+    As duplicatas (no arquivo ou já importadas na sessão) são descartadas
+    pelo banco, com `ON CONFLICT DO NOTHING` sobre o índice único
+    (session_id, content_hash), sem manter os hashes em memória.
+
+    Perguntas sem `user_answer` são gravadas como material de estudo e não
+    entram nos contadores nem no score da sessão (ver
+    `Question.scored_expression`); apenas as já respondidas contam.
+    """
+
+    def __init__(self, session_id: int, batch_size: int = 1000, session=None):
+        """
+        Args:
+            session_id: Sessão que receberá as perguntas
+            batch_size: Linhas por INSERT/commit
+            session: Sessão do SQLAlchemy (padrão: db.session)
+        """
+        self.session_id = session_id
+        self.batch_size = batch_size
+        self.session = session or db.session
+        self.stats = {
+            'read': 0,
+            'inserted': 0,
+            'answered': 0,
+            'duplicates': 0,
+            'rejected': 0,
+            'rejects': []
+        }
+
+    def _reject(self, line_number: int, error: str) -> None:
+        self.stats['rejected'] += 1
+        if len(self.stats['rejects']) < MAX_REJECT_SAMPLES:
+            self.stats['rejects'].append({'line': line_number, 'error': error})
+
+    def _rows(self, records: Iterable[Tuple[int, Any]]) -> Iterator[Dict[str, Any]]:
+        """Valida os registros e os converte em linhas da tabela questions."""
+        normalize = Question.normalize_answer
+        for line_number, record in records:
+            self.stats['read'] += 1
+            if isinstance(record, Exception):
+                self._reject(line_number, f'JSON inválido: {record}')
+                continue
+
+            if isinstance(record, dict):
+                # Células vazias do CSV equivalem a campos ausentes
+                record = {k: (v if v != '' else None) for k, v in record.items() if k in IMPORT_COLUMNS}
+            error = Question.validate(record)
+            if error:
+                self._reject(line_number, error)
+                continue
+
+            user_answer = record.get('user_answer') or None
+            yield {
+                'session_id': self.session_id,
+                'question_text': record['question_text'],
+                'answer_text': record['answer_text'],
+                'user_answer': user_answer,
+                'is_correct': bool(user_answer) and normalize(user_answer) == normalize(record['answer_text']),
+                'difficulty': record.get('difficulty') or 'medium',
+                'topic': record.get('topic'),
+                'content_hash': Question.compute_content_hash(record['question_text'], record['answer_text'])
+            }
+
+    def _insert(self, rows: List[Dict[str, Any]]) -> Tuple[int, int, int]:
+        """Insere um lote ignorando duplicatas; retorna (inseridas, respondidas, corretas)."""
+        dialect = self.session.get_bind().dialect.name
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        elif dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            raise QuestionImportError(f"Importação não suportada no banco {dialect}")
+
+        # executemany com RETURNING: o SQLAlchemy agrupa as linhas em INSERTs de
+        # vários VALUES, e o comando compilado é reaproveitado entre os lotes
+        table = Question.__table__
+        statement = insert(table).on_conflict_do_nothing(
+            index_elements=['session_id', 'content_hash']
+        ).returning(table.c.user_answer, table.c.is_correct)
+        inserted = self.session.execute(statement, rows).all()
+        answered = sum(1 for user_answer, _ in inserted if user_answer is not None)
+        return len(inserted), answered, sum(1 for _, is_correct in inserted if is_correct)
+
+    def run(self, stream, fmt: str) -> Dict[str, Any]:
+        """
+        Importa um arquivo.
+
+        Args:
+            stream: Arquivo aberto (binário ou texto)
+            fmt: 'csv' ou 'jsonl'
+
+        Returns:
+            Estatísticas: linhas lidas, inseridas (e quantas já respondidas),
+            duplicadas, rejeitadas (com exemplos), tempo e linhas por segundo
+        """
+        if fmt not in IMPORT_FORMATS:
+            raise QuestionImportError(f"Formato não suportado: {fmt}")
+        study_session = self.session.get(StudySession, self.session_id)
+        if study_session is None:
+            raise QuestionImportError(f"Sessão {self.session_id} não encontrada")
+        if study_session.end_time is not None:
+            # As perguntas de uma sessão finalizada já foram somadas ao feature store
+            raise QuestionImportError(f"Sessão {self.session_id} já finalizada")
+
+        start = time.perf_counter()
+        rows = self._rows(read_records(stream, fmt))
+        try:
+            for batch in _batches(rows, self.batch_size):
+                inserted, answered, correct = self._insert(batch)
+                if answered:
+                    StudySession.adjust_counters(self.session_id, questions=answered, correct=correct)
+                self.session.commit()
+
+                self.stats['inserted'] += inserted
+                self.stats['answered'] += answered
+                self.stats['duplicates'] += len(batch) - inserted
+                logger.info(f"Importação na sessão {self.session_id}: {self.stats['read']} linhas lidas, "
+                            f"{self.stats['inserted']} inseridas")
+        except (csv.Error, UnicodeDecodeError) as e:
+            # Os lotes anteriores já foram gravados; uma nova importação os ignora como duplicatas
+            self.session.rollback()
+            raise QuestionImportError(f"Arquivo inválido após {self.stats['read']} linhas: {e}")
+
+        elapsed = time.perf_counter() - start
+        self.stats['seconds'] = round(elapsed, 3)
+        self.stats['rows_per_second'] = round(self.stats['read'] / elapsed, 1) if elapsed > 0 else None
+        logger.info(f"Importação concluída: {self.stats['inserted']} inseridas, {self.stats['duplicates']} "
+                    f"duplicadas, {self.stats['rejected']} rejeitadas em {elapsed:.1f}s")
+        return self.stats
@@ -0,0 +1,108 @@
+import functools
+import itertools
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from flask_sqlalchemy.session import Session
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql.dml import UpdateBase
+
+# Prefixo das binds de réplica em SQLALCHEMY_BINDS ('replica_0', 'replica_1', ...)
+REPLICA_BIND_PREFIX = 'replica_'
+
+# Após uma escrita, as leituras do mesmo usuário vão para o primário por este
+# tempo (deve cobrir o atraso de replicação)
+READ_YOUR_WRITES_SECONDS = float(os.environ.get('READ_YOUR_WRITES_SECONDS', '5'))
+
+class RoutingSession(Session):
+    """
+    Sessão que envia as leituras de handlers somente leitura para uma réplica.
+
+    O handler marcado com `read_only` escolhe a réplica da requisição e a
+    guarda em `session.info['replica']`; todas as leituras da requisição
+    usam essa mesma réplica, e nunca réplicas com atrasos diferentes. Sem
+    ela, e em qualquer escrita (flush, INSERT, UPDATE, DELETE), usa o
+    primário (a bind padrão), como a sessão do Flask-SQLAlchemy.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        replica = self.info.get('replica')
+        if replica is not None and bind is None and not self._flushing \
+                and not isinstance(clause, UpdateBase):
+            return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+_replica_cycle = itertools.count()
+
+def choose_replica(engines: Dict[Optional[str], Engine]) -> Optional[Engine]:
+    """
+    Escolhe em rodízio a réplica de uma requisição.
+
+    Args:
+        engines: Engines por bind (`db.engines`); as réplicas são as binds
+            com o prefixo REPLICA_BIND_PREFIX
+
+    Returns:
+        Engine da réplica, ou None se não houver réplicas configuradas
+    """
+    replicas = [engines[key] for key in sorted(k for k in engines if k and k.startswith(REPLICA_BIND_PREFIX))]
+    if not replicas:
+        return None
+    return replicas[next(_replica_cycle) % len(replicas)]
+
+# Usuários com escrita recente neste processo -> fim da janela read-your-writes
+_recent_writes: Dict[str, float] = {}
+_recent_writes_lock = threading.Lock()
+
+def mark_user_write(user_id, seconds: float = None) -> None:
+    """
+    Faz as próximas leituras do usuário irem ao primário (read-your-writes).
+
+    Deve ser chamado após o commit de uma escrita do próprio usuário. A
+    janela vale para o processo atual; em outro worker, uma leitura logo
+    após a escrita ainda pode vir da réplica.
+    """
+    seconds = READ_YOUR_WRITES_SECONDS if seconds is None else seconds
+    with _recent_writes_lock:
+        now = time.monotonic()
+        _recent_writes[str(user_id)] = now + seconds
+        # Descarta janelas expiradas para o mapa não crescer indefinidamente
+        if len(_recent_writes) > 10000:
+            for key in [k for k, expires in _recent_writes.items() if expires <= now]:
+                del _recent_writes[key]
+
+def has_recent_write(user_id) -> bool:
+    with _recent_writes_lock:
+        expires = _recent_writes.get(str(user_id))
+    return expires is not None and expires > time.monotonic()
+
+def read_only(view):
+    """
+    Marca um handler como somente leitura: suas consultas vão para uma réplica.
+
+    A réplica é escolhida uma vez por requisição (ver `choose_replica`). Se
+    o usuário autenticado escreveu há pouco (ver `mark_user_write`), o
+    handler lê do primário. Deve ficar abaixo de `@jwt_required()`.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        from flask_jwt_extended import get_jwt_identity
+        from database.config import db
+
+        user_id = get_jwt_identity()
+        if user_id is not None and has_recent_write(user_id):
+            return view(*args, **kwargs)
+
+        replica = choose_replica(db.engines)
+        if replica is None:
+            return view(*args, **kwargs)
+
+        session = db.session()
+        session.info['replica'] = replica
+        try:
+            return view(*args, **kwargs)
+        finally:
+            session.info.pop('replica', None)
+    return wrapper
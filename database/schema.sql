@@ -18,6 +18,8 @@ CREATE TABLE study_sessions (
     end_time DATETIME,
     duration INTEGER, -- em segundos
     score INTEGER DEFAULT 0,
+    questions_count INTEGER NOT NULL DEFAULT 0,
+    correct_count INTEGER NOT NULL DEFAULT 0,
     FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
 );
 
@@ -31,6 +33,7 @@ CREATE TABLE questions (
     is_correct BOOLEAN DEFAULT FALSE,
     difficulty VARCHAR(50) DEFAULT 'medium',
     topic VARCHAR(100),
+    content_hash VARCHAR(64), -- preenchido pela importação de bancos de perguntas
     FOREIGN KEY (session_id) REFERENCES study_sessions (id) ON DELETE CASCADE
 );
 
@@ -44,11 +47,49 @@ CREATE TABLE progress (
     FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
 );
 
--- Índices para melhorar performance
-CREATE INDEX idx_users_username ON users(username);
-CREATE INDEX idx_users_email ON users(email);
-CREATE INDEX idx_study_sessions_user_id ON study_sessions(user_id);
+-- Tabela de features agregadas por estudante (feature store)
+CREATE TABLE student_features (
+    user_id INTEGER PRIMARY KEY,
+    sessions_count INTEGER NOT NULL DEFAULT 0,
+    total_duration INTEGER NOT NULL DEFAULT 0, -- em segundos
+    score_sum INTEGER NOT NULL DEFAULT 0,
+    questions_count INTEGER NOT NULL DEFAULT 0,
+    correct_count INTEGER NOT NULL DEFAULT 0,
+    hard_questions_count INTEGER NOT NULL DEFAULT 0,
+    hard_correct_count INTEGER NOT NULL DEFAULT 0,
+    progress_topics_count INTEGER NOT NULL DEFAULT 0,
+    progress_score_sum INTEGER NOT NULL DEFAULT 0,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+
+-- Tabela de predições de performance calculadas em lote
+CREATE TABLE student_predictions (
+    user_id INTEGER PRIMARY KEY,
+    performance VARCHAR(50) NOT NULL,
+    risk_level VARCHAR(20) NOT NULL,
+    probabilities JSON,
+    model_name VARCHAR(50) NOT NULL,
+    model_version VARCHAR(50) NOT NULL,
+    batch_id VARCHAR(80) NOT NULL,
+    scored_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+
+-- Migrações aplicadas (ver database/migrations)
+CREATE TABLE schema_migrations (
+    version VARCHAR(20) PRIMARY KEY,
+    description VARCHAR(200) NOT NULL,
+    applied_at DATETIME NOT NULL
+);
+
+-- Índices para melhorar performance (os mesmos declarados nos modelos)
+-- username e email já são indexados pelas restrições UNIQUE
+CREATE INDEX idx_study_sessions_user_start ON study_sessions(user_id, start_time);
 CREATE INDEX idx_questions_session_id ON questions(session_id);
-CREATE INDEX idx_progress_user_id ON progress(user_id);
+CREATE UNIQUE INDEX idx_questions_session_hash ON questions(session_id, content_hash);
+CREATE UNIQUE INDEX idx_progress_user_topic ON progress(user_id, topic);
+CREATE INDEX idx_progress_user_last_updated ON progress(user_id, last_updated);
 CREATE INDEX idx_progress_topic ON progress(topic);
-
+CREATE INDEX idx_student_predictions_risk_level ON student_predictions(risk_level);
+CREATE INDEX idx_student_predictions_batch_id ON student_predictions(batch_id);
@@ -0,0 +1,89 @@
+import logging
+from typing import Dict, Any, Optional
+
+from sqlalchemy import select, update, func, case, or_
+
+from database.config import db
+from models import StudySession, Question
+
+logger = logging.getLogger(__name__)
+
+def reconcile_session_counters(session=None, fix: bool = True, batch_size: int = 1000) -> Dict[str, Any]:
+    """
+    Confere os contadores desnormalizados das sessões com as perguntas gravadas.
+
+    `questions_count`, `correct_count` e `score` são mantidos de forma
+    incremental a cada pergunta; este job os compara com uma agregação
+    set-based da tabela `questions` (apenas as perguntas que contam no
+    score, ver `Question.scored_expression`) e corrige as divergências (por
+    exemplo, perguntas gravadas por fora da API ou sessões anteriores aos
+    contadores).
+
+    A correção recalcula os valores no próprio UPDATE, com subconsultas
+    correlacionadas, de modo que perguntas adicionadas entre a conferência e
+    a correção não são perdidas.
+
+    Args:
+        session: Sessão do SQLAlchemy (padrão: db.session)
+        fix: Se deve corrigir as divergências (False apenas relata)
+        batch_size: Sessões corrigidas por UPDATE
+
+    Returns:
+        Dict com sessões conferidas, divergentes, corrigidas e exemplos
+    """
+    session = session or db.session
+
+    totals = select(
+        Question.session_id.label('session_id'),
+        func.count(Question.id).label('questions_count'),
+        func.sum(case((Question.is_correct, 1), else_=0)).label('correct_count')
+    ).where(Question.scored_expression()).group_by(Question.session_id).subquery()
+
+    actual_questions = func.coalesce(totals.c.questions_count, 0)
+    actual_correct = func.coalesce(totals.c.correct_count, 0)
+    mismatched_ids = session.scalars(
+        select(StudySession.id).outerjoin(
+            totals, totals.c.session_id == StudySession.id
+        ).where(or_(
+            StudySession.questions_count != actual_questions,
+            StudySession.correct_count != actual_correct,
+            func.coalesce(StudySession.score, -1) != StudySession.score_expression(actual_questions, actual_correct)
+        )).order_by(StudySession.id)
+    ).all()
+
+    checked = session.scalar(select(func.count(StudySession.id)))
+    fixed = 0
+    if fix and mismatched_ids:
+        questions = select(func.count(Question.id)).where(
+            Question.session_id == StudySession.id, Question.scored_expression()
+        ).scalar_subquery()
+        correct = select(func.coalesce(func.sum(case((Question.is_correct, 1), else_=0)), 0)).where(
+            Question.session_id == StudySession.id, Question.scored_expression()
+        ).scalar_subquery()
+
+        for start in range(0, len(mismatched_ids), batch_size):
+            batch = mismatched_ids[start:start + batch_size]
+            session.execute(
+                update(StudySession)
+                .where(StudySession.id.in_(batch))
+                .values(
+                    questions_count=questions,
+                    correct_count=correct,
+                    score=StudySession.score_expression(questions, correct)
+                )
+                .execution_options(synchronize_session=False)
+            )
+            session.commit()
+            fixed += len(batch)
+
+    if mismatched_ids:
+        logger.warning(f"{len(mismatched_ids)} sessões com contadores divergentes ({fixed} corrigidas)")
+    else:
+        logger.info(f"Contadores de {checked} sessões conferidos sem divergências")
+
+    return {
+        'checked': checked,
+        'mismatched': len(mismatched_ids),
+        'fixed': fixed,
+        'sample_ids': mismatched_ids[:20]
+    }
@@ -0,0 +1,110 @@
+"""
+Relatório de tempo de inicialização (importação) de um módulo.
+
+Executa a importação em um processo Python limpo com `-X importtime`,
+agrupa o tempo por pacote e verifica um orçamento de boot para os
+workers. Sai com código 1 se o orçamento for excedido.
+
+Uso:
+    python -m database.startup_report app.app --budget 1.5 --forbid-heavy
+"""
+import argparse
+import json
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Any
+
+# Módulos que não devem ser carregados no boot de um worker web
+HEAVY_MODULES = ('pandas', 'sklearn', 'scipy', 'matplotlib', 'seaborn', 'joblib')
+
+_CHILD_CODE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    'seconds': elapsed,
+    'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'heavy_loaded': [m for m in {heavy!r} if m in sys.modules]
+}}))
+"""
+
+def parse_importtime(output: str) -> Dict[str, float]:
+    """
+    Soma o tempo próprio (self) de cada pacote de nível superior.
+
+    Args:
+        output: Saída de erro de `python -X importtime`
+
+    Returns:
+        Dict de pacote para segundos
+    """
+    totals = defaultdict(float)
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        totals[name.strip().split('.')[0]] += int(self_us) / 1e6
+    return dict(totals)
+
+def profile_import(module: str) -> Dict[str, Any]:
+    """
+    Mede a importação de um módulo em um processo separado.
+
+    Args:
+        module: Nome do módulo (ex.: 'app.app')
+
+    Returns:
+        Dict com tempo total, RSS máximo, módulos pesados carregados e o
+        tempo por pacote
+    """
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _CHILD_CODE.format(module=module, heavy=HEAVY_MODULES)],
+        capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Falha ao importar {module}:\n{completed.stderr[-2000:]}")
+
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result['packages'] = parse_importtime(completed.stderr)
+    return result
+
+def format_report(module: str, result: Dict[str, Any], top: int = 15) -> List[str]:
+    """Formata o relatório como linhas de texto."""
+    lines = [
+        f"Importação de {module}: {result['seconds']:.3f}s, RSS máximo {result['max_rss_mb']:.1f} MB",
+        f"Módulos pesados carregados: {', '.join(result['heavy_loaded']) or 'nenhum'}",
+        "",
+        f"{'Pacote':<30} {'Tempo (s)':>10}"
+    ]
+    packages = sorted(result['packages'].items(), key=lambda item: item[1], reverse=True)
+    for package, seconds in packages[:top]:
+        lines.append(f"{package:<30} {seconds:>10.3f}")
+    return lines
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Relatório de tempo de inicialização')
+    parser.add_argument('module', nargs='?', default='app.app')
+    parser.add_argument('--budget', type=float, help='Tempo máximo de importação em segundos')
+    parser.add_argument('--forbid-heavy', action='store_true',
+                        help='Falha se algum módulo de HEAVY_MODULES for carregado')
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--json', action='store_true', help='Imprime o resultado em JSON')
+    args = parser.parse_args(argv)
+
+    result = profile_import(args.module)
+    print(json.dumps(result, indent=2) if args.json else '\n'.join(format_report(args.module, result, args.top)))
+
+    failures = []
+    if args.budget is not None and result['seconds'] > args.budget:
+        failures.append(f"orçamento de {args.budget:.3f}s excedido ({result['seconds']:.3f}s)")
+    if args.forbid_heavy and result['heavy_loaded']:
+        failures.append(f"módulos pesados carregados: {', '.join(result['heavy_loaded'])}")
+
+    for failure in failures:
+        print(f"FALHA: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -11,3 +11,9 @@ from .question import Question
 
 # Importa a classe Progress do arquivo progress.py
 from .progress import Progress
+
+# Importa a classe StudentFeatures do arquivo student_features.py
+from .student_features import StudentFeatures
+
+# Importa a classe StudentPrediction do arquivo student_prediction.py
+from .student_prediction import StudentPrediction
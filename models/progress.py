@@ -5,6 +5,12 @@ class Progress(db.Model):
     """Modelo para representar o progresso de um usuário em um tópico."""
     
     __tablename__ = 'progress'
+    __table_args__ = (
+        # Um registro por tópico e usuário (também atende a busca por tópico do usuário)
+        db.Index('idx_progress_user_topic', 'user_id', 'topic', unique=True),
+        db.Index('idx_progress_user_last_updated', 'user_id', 'last_updated'),
+        db.Index('idx_progress_topic', 'topic'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -12,6 +18,9 @@ class Progress(db.Model):
     score = db.Column(db.Integer, default=0)
     last_updated = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Campos expostos nas listagens (parâmetro fields=)
+    LIST_FIELDS = ('id', 'user_id', 'topic', 'score', 'last_updated')
+    
     def __init__(self, user_id, topic, score=0):
         """Inicializa um novo registro de progresso."""
         self.user_id = user_id
@@ -41,14 +50,70 @@ class Progress(db.Model):
     
     @staticmethod
     def get_or_create_progress(user_id, topic):
-        """Retorna o progresso existente ou cria um novo."""
+        """Retorna o progresso existente ou cria um novo (na transação corrente)."""
         progress = Progress.query.filter_by(user_id=user_id, topic=topic).first()
         if not progress:
             progress = Progress(user_id=user_id, topic=topic)
             db.session.add(progress)
-            db.session.commit()
+            db.session.flush()
         return progress
     
+    @staticmethod
+    def upsert_scores(user_id, scores):
+        """
+        Grava o score de vários tópicos de um usuário em um único comando.
+        
+        Usa `INSERT ... ON CONFLICT (user_id, topic) DO UPDATE` no SQLite e
+        no PostgreSQL, apoiado no índice único (user_id, topic): requisições
+        simultâneas para o mesmo tópico nunca criam linhas duplicadas. Em
+        outros bancos recorre a `get_or_create_progress` tópico a tópico.
+        Não faz commit.
+        
+        Args:
+            user_id: ID do usuário
+            scores: Dict tópico -> score
+        
+        Returns:
+            Lista de dicionários (formato de `to_dict`) dos registros gravados
+        """
+        if not scores:
+            return []
+        
+        now = datetime.utcnow()
+        dialect = db.session.get_bind().dialect.name
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        elif dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            records = []
+            for topic, score in scores.items():
+                progress = Progress.get_or_create_progress(user_id, topic)
+                progress.update_score(score)
+                records.append(progress)
+            db.session.flush()
+            return [p.to_dict() for p in records]
+        
+        statement = insert(Progress).values([
+            {'user_id': user_id, 'topic': topic, 'score': score, 'last_updated': now}
+            for topic, score in scores.items()
+        ])
+        statement = statement.on_conflict_do_update(
+            index_elements=['user_id', 'topic'],
+            set_={'score': statement.excluded.score, 'last_updated': statement.excluded.last_updated}
+        ).returning(Progress.id, Progress.user_id, Progress.topic, Progress.score, Progress.last_updated)
+        
+        return [
+            {
+                'id': row.id,
+                'user_id': row.user_id,
+                'topic': row.topic,
+                'score': row.score,
+                'last_updated': row.last_updated.isoformat() if row.last_updated else None
+            }
+            for row in db.session.execute(statement)
+        ]
+    
     def __repr__(self):
         return f'<Progress User {self.user_id} - Topic {self.topic}>'
 
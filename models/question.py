@@ -1,9 +1,18 @@
+import hashlib
+
 from database.config import db
+from sqlalchemy import insert, or_
+from .study_session import StudySession
 
 class Question(db.Model):
     """Modelo para representar uma pergunta em uma sessão de estudo."""
     
     __tablename__ = 'questions'
+    __table_args__ = (
+        db.Index('idx_questions_session_id', 'session_id'),
+        # Deduplicação da importação de bancos de perguntas (NULL fora da importação)
+        db.Index('idx_questions_session_hash', 'session_id', 'content_hash', unique=True),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     session_id = db.Column(db.Integer, db.ForeignKey('study_sessions.id'), nullable=False)
@@ -13,6 +22,7 @@ class Question(db.Model):
     is_correct = db.Column(db.Boolean, default=False)
     difficulty = db.Column(db.String(50), default='medium')
     topic = db.Column(db.String(100))
+    content_hash = db.Column(db.String(64))
     
     def __init__(self, session_id, question_text, answer_text, difficulty='medium', topic=None):
         """Inicializa uma nova pergunta."""
@@ -22,13 +32,110 @@ class Question(db.Model):
         self.difficulty = difficulty
         self.topic = topic
     
+    @staticmethod
+    def validate(item):
+        """
+        Valida uma pergunta recebida em lote (API ou importação).
+        
+        Returns:
+            Mensagem de erro, ou None se o item for válido
+        """
+        if not isinstance(item, dict):
+            return 'item deve ser um objeto'
+        for field in ('question_text', 'answer_text'):
+            if not isinstance(item.get(field), str) or not item[field].strip():
+                return f'{field} é obrigatório'
+        if item.get('user_answer') is not None and not isinstance(item['user_answer'], str):
+            return 'user_answer deve ser texto'
+        for field, max_length in (('difficulty', 50), ('topic', 100)):
+            value = item.get(field)
+            if value is not None and (not isinstance(value, str) or len(value) > max_length):
+                return f'{field} deve ser texto com no máximo {max_length} caracteres'
+        return None
+    
+    @staticmethod
+    def compute_content_hash(question_text, answer_text):
+        """Hash do conteúdo normalizado (espaços e caixa) de uma pergunta."""
+        normalized = '\x1f'.join(' '.join(text.split()).lower() for text in (question_text, answer_text))
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def scored_expression():
+        """
+        Expressão SQL das perguntas que entram nos contadores e no score da sessão.
+        
+        Perguntas importadas de um banco (com content_hash) ainda sem resposta
+        do usuário são material de estudo, não tentativas, e ficam de fora.
+        """
+        return or_(Question.content_hash.is_(None), Question.user_answer.isnot(None))
+    
+    @property
+    def is_scored(self):
+        """Equivalente em Python de `scored_expression`."""
+        return self.content_hash is None or self.user_answer is not None
+    
+    @staticmethod
+    def normalize_answer(text):
+        """Forma canônica de uma resposta para comparação."""
+        return text.strip().lower()
+    
     def check_answer(self, user_answer):
         """Verifica se a resposta do usuário está correta."""
+        was_scored = self.is_scored
+        was_correct = bool(self.is_correct)
         self.user_answer = user_answer
         # Comparação simples (pode ser melhorada com IA)
-        self.is_correct = user_answer.strip().lower() == self.answer_text.strip().lower()
+        self.is_correct = Question.normalize_answer(user_answer) == Question.normalize_answer(self.answer_text)
+        
+        # Pergunta já gravada: corrigir os contadores da sessão
+        if self.id is not None:
+            if not was_scored:
+                # Pergunta do banco respondida agora: passa a contar no score
+                StudySession.adjust_counters(self.session_id, questions=1, correct=int(self.is_correct))
+            elif was_correct != self.is_correct:
+                StudySession.adjust_counters(self.session_id, correct=1 if self.is_correct else -1)
         return self.is_correct
     
+    @staticmethod
+    def bulk_create(session_id, items):
+        """
+        Corrige e insere várias perguntas de uma sessão de uma só vez.
+        
+        As respostas são corrigidas em uma única passada, as perguntas são
+        inseridas com um único INSERT em lote (executemany) e os contadores da
+        sessão são atualizados uma única vez. Não faz commit.
+        
+        Args:
+            session_id: ID da sessão (a posse já deve ter sido verificada)
+            items: Dicts já validados com question_text, answer_text e,
+                opcionalmente, user_answer, difficulty e topic
+        
+        Returns:
+            Linhas inseridas (campos de `to_dict`, exceto o id: obter os ids
+            exigiria RETURNING, que desfaz o executemany no SQLite)
+        """
+        if not items:
+            return []
+        
+        normalize = Question.normalize_answer
+        rows = [
+            {
+                'session_id': session_id,
+                'question_text': item['question_text'],
+                'answer_text': item['answer_text'],
+                'user_answer': item.get('user_answer'),
+                'is_correct': bool(item.get('user_answer')) and normalize(item['user_answer']) == normalize(item['answer_text']),
+                'difficulty': item.get('difficulty') or 'medium',
+                'topic': item.get('topic')
+            }
+            for item in items
+        ]
+        
+        # INSERT do Core: o bulk insert do ORM separa em lotes as linhas com valores None
+        db.session.execute(insert(Question.__table__), rows)
+        StudySession.adjust_counters(session_id, questions=len(rows), correct=sum(row['is_correct'] for row in rows))
+        return rows
+    
     def to_dict(self):
         """Converte a pergunta para um dicionário (para JSON)."""
         return {
@@ -0,0 +1,42 @@
+from database.config import db
+from datetime import datetime
+
+class StudentFeatures(db.Model):
+    """Modelo com os agregados de estudo de um usuário usados pelo feature store."""
+
+    __tablename__ = 'student_features'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    sessions_count = db.Column(db.Integer, nullable=False, default=0)
+    total_duration = db.Column(db.Integer, nullable=False, default=0)  # em segundos
+    score_sum = db.Column(db.Integer, nullable=False, default=0)
+    questions_count = db.Column(db.Integer, nullable=False, default=0)
+    correct_count = db.Column(db.Integer, nullable=False, default=0)
+    hard_questions_count = db.Column(db.Integer, nullable=False, default=0)
+    hard_correct_count = db.Column(db.Integer, nullable=False, default=0)
+    progress_topics_count = db.Column(db.Integer, nullable=False, default=0)
+    progress_score_sum = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Colunas somáveis, na ordem em que o feature store as lê
+    AGGREGATE_COLUMNS = [
+        'sessions_count', 'total_duration', 'score_sum', 'questions_count', 'correct_count',
+        'hard_questions_count', 'hard_correct_count', 'progress_topics_count', 'progress_score_sum'
+    ]
+
+    def __init__(self, user_id):
+        """Inicializa os agregados zerados de um usuário."""
+        self.user_id = user_id
+        for column in self.AGGREGATE_COLUMNS:
+            setattr(self, column, 0)
+        self.updated_at = datetime.utcnow()
+
+    def to_dict(self):
+        """Converte os agregados para um dicionário (para JSON)."""
+        data = {'user_id': self.user_id}
+        data.update({column: getattr(self, column) for column in self.AGGREGATE_COLUMNS})
+        data['updated_at'] = self.updated_at.isoformat() if self.updated_at else None
+        return data
+
+    def __repr__(self):
+        return f'<StudentFeatures User {self.user_id}>'
@@ -0,0 +1,35 @@
+from database.config import db
+from datetime import datetime
+
+class StudentPrediction(db.Model):
+    """Modelo com a última predição de performance calculada em lote para um usuário."""
+
+    __tablename__ = 'student_predictions'
+    __table_args__ = (
+        db.Index('idx_student_predictions_risk_level', 'risk_level'),
+        db.Index('idx_student_predictions_batch_id', 'batch_id'),
+    )
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    performance = db.Column(db.String(50), nullable=False)
+    risk_level = db.Column(db.String(20), nullable=False)
+    probabilities = db.Column(db.JSON)
+    model_name = db.Column(db.String(50), nullable=False)
+    model_version = db.Column(db.String(50), nullable=False)
+    batch_id = db.Column(db.String(80), nullable=False)
+    scored_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        """Converte a predição para um dicionário (para JSON)."""
+        return {
+            'user_id': self.user_id,
+            'performance': self.performance,
+            'risk_level': self.risk_level,
+            'probabilities': self.probabilities,
+            'model_name': self.model_name,
+            'model_version': self.model_version,
+            'scored_at': self.scored_at.isoformat() if self.scored_at else None
+        }
+
+    def __repr__(self):
+        return f'<StudentPrediction User {self.user_id}: {self.performance}>'
@@ -1,10 +1,15 @@
 from database.config import db
 from datetime import datetime
+from sqlalchemy import update, case
 
 class StudySession(db.Model):
     """Modelo para representar uma sessão de estudo."""
     
     __tablename__ = 'study_sessions'
+    __table_args__ = (
+        # Listagens e dashboard: sessões do usuário por data
+        db.Index('idx_study_sessions_user_start', 'user_id', 'start_time'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -13,6 +18,14 @@ class StudySession(db.Model):
     duration = db.Column(db.Integer)  # em segundos
     score = db.Column(db.Integer, default=0)
     
+    # Contadores desnormalizados (evitam carregar as perguntas para contá-las)
+    questions_count = db.Column(db.Integer, nullable=False, default=0)
+    correct_count = db.Column(db.Integer, nullable=False, default=0)
+    
+    # Campos expostos nas listagens (parâmetro fields=)
+    LIST_FIELDS = ('id', 'user_id', 'start_time', 'end_time', 'duration', 'score',
+                   'questions_count', 'correct_count')
+    
     # Relacionamentos
     questions = db.relationship('Question', backref='session', lazy=True, cascade='all, delete-orphan')
     
@@ -20,27 +33,68 @@ class StudySession(db.Model):
         """Inicializa uma nova sessão de estudo."""
         self.user_id = user_id
         self.start_time = datetime.utcnow()
+        self.questions_count = 0
+        self.correct_count = 0
     
-    def end_session(self):
-        """Finaliza a sessão de estudo e calcula a duração."""
-        self.end_time = datetime.utcnow()
-        if self.start_time:
-            self.duration = int((self.end_time - self.start_time).total_seconds())
-    
-    def calculate_score(self):
-        """Calcula o score da sessão baseado nas perguntas corretas."""
-        if not self.questions:
-            return 0
+    @staticmethod
+    def score_expression(questions, correct):
+        """Expressão SQL do score (percentual de acertos, 0 sem perguntas)."""
+        return case((questions > 0, correct * 100 // questions), else_=0)
+    
+    @staticmethod
+    def adjust_counters(session_id, questions=0, correct=0):
+        """
+        Soma valores aos contadores de perguntas de uma sessão e recalcula o score.
         
-        correct_answers = sum(1 for q in self.questions if q.is_correct)
-        total_questions = len(self.questions)
+        O incremento é feito no banco (`coluna = coluna + x`), na transação
+        corrente, portanto requisições simultâneas não se sobrescrevem. O
+        score é atualizado no mesmo UPDATE, a partir dos novos contadores.
+        
+        Args:
+            session_id: ID da sessão
+            questions: Variação no número de perguntas
+            correct: Variação no número de respostas corretas
+        """
+        new_questions = StudySession.questions_count + questions
+        new_correct = StudySession.correct_count + correct
+        db.session.execute(
+            update(StudySession)
+            .where(StudySession.id == session_id)
+            .values(
+                questions_count=new_questions,
+                correct_count=new_correct,
+                score=StudySession.score_expression(new_questions, new_correct)
+            )
+        )
+    
+    def add_question(self, question):
+        """Adiciona uma pergunta à sessão e atualiza os contadores."""
+        question.session_id = self.id
+        db.session.add(question)
+        StudySession.adjust_counters(self.id, questions=1, correct=int(bool(question.is_correct)))
+    
+    def end_session(self):
+        """
+        Finaliza a sessão de estudo e calcula a duração.
         
-        if total_questions > 0:
-            self.score = int((correct_answers / total_questions) * 100)
-        else:
-            self.score = 0
+        A finalização é um UPDATE condicional (`end_time IS NULL`) que não
+        toca nos contadores nem no score, mantidos no banco por
+        `adjust_counters`; em seguida a sessão é recarregada com os valores
+        atuais do banco.
         
-        return self.score
+        Returns:
+            True se esta chamada finalizou a sessão, False se ela já estava finalizada
+        """
+        end_time = datetime.utcnow()
+        duration = int((end_time - self.start_time).total_seconds()) if self.start_time else None
+        result = db.session.execute(
+            update(StudySession)
+            .where(StudySession.id == self.id, StudySession.end_time.is_(None))
+            .values(end_time=end_time, duration=duration)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.refresh(self)
+        return result.rowcount == 1
     
     def to_dict(self):
         """Converte a sessão para um dicionário (para JSON)."""
@@ -51,7 +105,8 @@ class StudySession(db.Model):
             'end_time': self.end_time.isoformat() if self.end_time else None,
             'duration': self.duration,
             'score': self.score,
-            'questions_count': len(self.questions) if self.questions else 0
+            'questions_count': self.questions_count,
+            'correct_count': self.correct_count
         }
     
     def __repr__(self):
@@ -0,0 +1,70 @@
+import os
+import sys
+
+import pytest
+
+# app/app.py cria a aplicação ao ser importado; sem DATABASE_URL ela usaria o
+# arquivo de desenvolvimento. Os testes que usam a API criam a sua própria
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+from database.ml_algorithms import EducationalMLPipeline
+
+@pytest.fixture(scope='session')
+def trained_pipeline():
+    """Pipeline treinado uma vez por execução com o dataset de exemplo."""
+    pipeline = EducationalMLPipeline(latency_budget_ms=None, memory_budget_mb=None)
+    df = pipeline.create_sample_educational_dataset(600)
+    pipeline.train_models(*pipeline.preprocess_data(df))
+    return pipeline
+
+@pytest.fixture
+def model_dir(tmp_path, trained_pipeline):
+    """Registro temporário com o pipeline de exemplo promovido para produção."""
+    directory = str(tmp_path / 'trained_models')
+    trained_pipeline.save_models(directory)
+    return directory
+
+@pytest.fixture
+def db_app(tmp_path):
+    """Aplicação mínima com um banco SQLite temporário (sem as rotas da API)."""
+    from flask import Flask
+    from database.config import db
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'test.db'}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+
+@pytest.fixture
+def api_app(tmp_path, monkeypatch):
+    """Aplicação completa (rotas da API) com um banco SQLite temporário."""
+    import database
+    from database.config import DatabaseConfig
+
+    # app/app.py importa a camada de serviços (database/) como `app.services`
+    sys.modules.setdefault('app.services', database)
+    from app import app as app_module
+
+    monkeypatch.setattr(DatabaseConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'api.db'}")
+    app = app_module.create_app()
+    with app.app_context():
+        yield app
+        database.get_dashboard_cache().clear()
+        database.config.db.session.remove()
+
+@pytest.fixture
+def query_advisor(api_app):
+    """
+    Captura o SQL executado durante o teste para análise com `analyze()`.
+
+    Uso: chamar os endpoints e verificar `query_advisor.analyze() == []`
+    (nenhuma leitura completa de tabela).
+    """
+    from database.config import db
+    from database.query_advisor import QueryAdvisor
+
+    with QueryAdvisor(db.engine) as advisor:
+        yield advisor
@@ -0,0 +1,62 @@
+"""Funções auxiliares compartilhadas pelos testes."""
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+def seed_students(n_students, sessions_per_student=3, seed=0, first_user_id=1):
+    """
+    Grava estudantes com sessões finalizadas, perguntas e progresso.
+
+    O score de cada estudante acompanha o seu progresso médio, para que os
+    modelos tenham sinal a aprender sem usar as taxas de acerto.
+    """
+    from datetime import datetime, timedelta
+    import numpy as np
+    from sqlalchemy import insert, select, func
+    from database.config import db
+    from models import User, StudySession, Question, Progress
+
+    rng = np.random.default_rng(seed)
+    now = datetime.utcnow()
+    users, sessions, questions, progress = [], [], [], []
+    session_id = db.session.scalar(select(func.max(StudySession.id))) or 0
+    for user_id in range(first_user_id, first_user_id + n_students):
+        skill = rng.uniform(0.2, 1.0)
+        users.append({'id': user_id, 'username': f'user{user_id}', 'email': f'user{user_id}@example.com',
+                      'password_hash': 'x', 'created_at': now})
+        for _ in range(sessions_per_student):
+            session_id += 1
+            total = int(rng.integers(5, 15))
+            correct = int(rng.binomial(total, skill))
+            sessions.append({'id': session_id, 'user_id': user_id, 'start_time': now - timedelta(hours=1),
+                             'end_time': now, 'duration': int(rng.integers(600, 3600)),
+                             'score': correct * 100 // total, 'questions_count': total, 'correct_count': correct})
+            questions += [{'session_id': session_id, 'question_text': f'q{i}', 'answer_text': 'a',
+                           'is_correct': i < correct, 'difficulty': 'hard' if i % 3 == 0 else 'medium'}
+                          for i in range(total)]
+        progress += [{'user_id': user_id, 'topic': f't{t}', 'score': int(skill * 100), 'last_updated': now}
+                     for t in range(int(rng.integers(1, 4)))]
+
+    for model, rows in ((User, users), (StudySession, sessions), (Question, questions), (Progress, progress)):
+        if rows:
+            db.session.execute(insert(model.__table__), rows)
+    db.session.commit()
+
+def auth_headers(user_id):
+    """Cabeçalho Authorization com um JWT do usuário (requer contexto da aplicação)."""
+    from flask_jwt_extended import create_access_token
+    return {'Authorization': f"Bearer {create_access_token(identity=str(user_id))}"}
+
+@contextmanager
+def count_queries(engine):
+    """Lista os comandos SQL executados no engine dentro do bloco."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
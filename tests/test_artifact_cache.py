@@ -0,0 +1,66 @@
+import os
+import time
+
+import numpy as np
+import pytest
+
+from database import ml_algorithms
+from database.artifact_cache import ArtifactCache
+from database.ml_algorithms import EducationalMLPipeline
+
+def test_get_returns_none_on_miss_and_value_on_hit(tmp_path):
+    cache = ArtifactCache(str(tmp_path))
+    key = cache.make_key('fingerprint', 'Decision_Tree', {'max_depth': 3})
+
+    assert cache.get(key) is None
+    cache.set(key, {'weights': np.arange(5)})
+    np.testing.assert_array_equal(cache.get(key)['weights'], np.arange(5))
+
+    # Qualquer mudança nos parâmetros gera outra chave
+    assert cache.make_key('fingerprint', 'Decision_Tree', {'max_depth': 4}) != key
+
+def test_eviction_removes_least_recently_used(tmp_path):
+    cache = ArtifactCache(str(tmp_path), max_bytes=10 ** 9)
+    payload = np.zeros(10000, dtype=np.uint8)
+    for i, key in enumerate(('a', 'b', 'c')):
+        cache.set(key, payload)
+        os.utime(cache._path(key), (time.time() - 100 + i, time.time() - 100 + i))
+    cache.get('a')  # 'a' passa a ser o mais recente
+
+    cache.max_bytes = cache.size() - 1
+    cache._evict()
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+
+def test_eviction_tolerates_files_removed_by_another_process(tmp_path, monkeypatch):
+    cache = ArtifactCache(str(tmp_path), max_bytes=1)
+    for key in ('a', 'b'):
+        cache.set(key, np.zeros(1000))
+
+    # Outro processo remove o arquivo entre a listagem e a remoção
+    remove = os.remove
+    def remove_twice(path):
+        remove(path)
+        remove(path)
+    monkeypatch.setattr(os, 'remove', remove_twice)
+    cache.set('c', np.zeros(1000))
+
+    monkeypatch.setattr(os, 'remove', remove)
+    assert cache.size() == 0
+    assert cache.clear() == 0
+
+def test_unchanged_training_run_skips_serving_benchmark(tmp_path, monkeypatch):
+    pipeline = EducationalMLPipeline(cache_dir=str(tmp_path), latency_budget_ms=None, memory_budget_mb=None)
+    pipeline.models = {name: pipeline.models[name] for name in ('Naive_Bayes', 'Decision_Tree')}
+    X, y = pipeline.preprocess_data(pipeline.create_sample_educational_dataset(300))
+    first = pipeline.train_models(X, y)
+
+    calls = []
+    monkeypatch.setattr(ml_algorithms, 'measure_serving_cost', lambda *args, **kwargs: calls.append(1))
+    second = pipeline.train_models(X, y)
+
+    assert calls == []
+    for name in first:
+        assert second[name]['serving'] == first[name]['serving']
+        assert second[name]['accuracy'] == first[name]['accuracy']
@@ -0,0 +1,97 @@
+import pytest
+from sqlalchemy import insert
+
+from database import bulk_scoring
+from database.bulk_scoring import BulkScoringJob, INSUFFICIENT_DATA
+from database.config import db
+from database.feature_store import FeatureStore
+from database.ml_algorithms import train_from_feature_store
+from database.model_server import PredictionError
+from models import User, StudentPrediction
+
+from .helpers import seed_students
+
+@pytest.fixture
+def scoring_model(db_app, tmp_path):
+    """120 estudantes com sessões, 10 sem nenhuma e um modelo do feature store promovido."""
+    seed_students(120)
+    db.session.execute(insert(User.__table__), [
+        {'id': user_id, 'username': f'new{user_id}', 'email': f'new{user_id}@example.com', 'password_hash': 'x'}
+        for user_id in range(121, 131)
+    ])
+    db.session.commit()
+    FeatureStore().rebuild()
+    model_dir = str(tmp_path / 'models')
+    _, version = train_from_feature_store(model_dir, cache_dir=None)
+    return model_dir, version
+
+def predictions_by_user():
+    return {p.user_id: p for p in db.session.query(StudentPrediction).all()}
+
+def test_scores_every_student_with_a_feature_store_model(scoring_model):
+    model_dir, version = scoring_model
+
+    result = BulkScoringJob(model_dir, chunk_size=50, n_workers=0).run()
+
+    assert result['version'] == version
+    assert (result['scored'], result['insufficient_data']) == (130, 10)
+    predictions = predictions_by_user()
+    assert len(predictions) == 130
+    assert {p.model_version for p in predictions.values()} == {version}
+    assert all(predictions[user_id].risk_level in ('low', 'medium', 'high') for user_id in range(1, 121))
+
+    # Uma nova execução do mesmo batch retoma após o último usuário gravado
+    assert BulkScoringJob(model_dir, chunk_size=50, n_workers=0).run()['scored'] == 0
+
+def test_students_without_sessions_are_not_given_a_class(scoring_model):
+    model_dir, _ = scoring_model
+
+    BulkScoringJob(model_dir, chunk_size=50, n_workers=0).run()
+
+    predictions = predictions_by_user()
+    for user_id in range(121, 131):
+        assert predictions[user_id].performance == INSUFFICIENT_DATA
+        assert predictions[user_id].risk_level == 'unknown'
+        assert predictions[user_id].probabilities is None
+
+def test_process_pool_matches_in_process_scoring(scoring_model):
+    model_dir, _ = scoring_model
+
+    BulkScoringJob(model_dir, chunk_size=20, n_workers=0, batch_id='serial').run()
+    serial = {user_id: (p.performance, p.probabilities) for user_id, p in predictions_by_user().items()}
+
+    result = BulkScoringJob(model_dir, chunk_size=20, n_workers=2, batch_id='pool').run()
+    db.session.expire_all()
+    pooled = {user_id: (p.performance, p.probabilities) for user_id, p in predictions_by_user().items()}
+
+    assert (result['scored'], result['insufficient_data']) == (130, 10)
+    assert pooled == serial
+    assert {p.batch_id for p in predictions_by_user().values()} == {'pool'}
+
+def test_interrupted_run_resumes_from_the_checkpoint(scoring_model, monkeypatch):
+    model_dir, _ = scoring_model
+    upsert = bulk_scoring.upsert_predictions
+    calls = []
+
+    def failing_upsert(session, rows):
+        calls.append(len(rows))
+        if len(calls) == 3:
+            raise RuntimeError('conexão perdida')
+        upsert(session, rows)
+
+    monkeypatch.setattr(bulk_scoring, 'upsert_predictions', failing_upsert)
+    with pytest.raises(RuntimeError):
+        BulkScoringJob(model_dir, chunk_size=30, n_workers=0, batch_id='nightly').run()
+    db.session.rollback()
+    assert len(predictions_by_user()) == 60
+
+    monkeypatch.setattr(bulk_scoring, 'upsert_predictions', upsert)
+    result = BulkScoringJob(model_dir, chunk_size=30, n_workers=0, batch_id='nightly').run()
+
+    assert result['resumed_after_user_id'] == 60
+    assert result['scored'] == 70
+    assert len(predictions_by_user()) == 130
+
+def test_rejects_a_model_trained_on_other_features(db_app, model_dir):
+    with pytest.raises(PredictionError, match='flask train-model'):
+        BulkScoringJob(model_dir, n_workers=0).run()
@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+
+from database.compiled_inference import CompiledPredictor, compile_model
+
+@pytest.fixture(scope='module')
+def parity_data(trained_pipeline):
+    df = trained_pipeline.create_sample_educational_dataset(20000)
+    return trained_pipeline.preprocessor.transform(df)
+
+@pytest.mark.parametrize('model_name', ['Decision_Tree', 'Naive_Bayes'])
+def test_compiled_predictions_match_sklearn(trained_pipeline, parity_data, model_name):
+    bundle = trained_pipeline.export_bundle()
+    bundle.update(version='test', model_name=model_name, model=trained_pipeline.trained_models[model_name]['model'])
+    compiled = compile_model(bundle)
+    predictor = CompiledPredictor(compiled['meta'], compiled['arrays'])
+
+    expected = trained_pipeline.label_encoder.inverse_transform(bundle['model'].predict(parity_data))
+    predictions, probabilities = predictor.predict_matrix(parity_data)
+
+    np.testing.assert_array_equal(predictions, expected.astype(str))
+    # As probabilidades do GaussianNB do scikit-learn saem em float32
+    np.testing.assert_allclose(probabilities, bundle['model'].predict_proba(parity_data), atol=1e-5)
@@ -0,0 +1,94 @@
+from datetime import datetime
+
+from sqlalchemy import insert, select, func
+
+from database import dashboard as dashboard_module
+from database.config import db
+from database.dashboard import DashboardCache, build_dashboard, RECENT_SESSIONS
+from models import StudySession, Question, Progress, StudentPrediction
+
+from .helpers import seed_students, auth_headers
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def test_rollup_matches_per_table_queries(db_app):
+    seed_students(3, sessions_per_student=8)
+    db.session.execute(insert(StudentPrediction.__table__), [{
+        'user_id': 2, 'performance': 'good', 'risk_level': 'low', 'probabilities': {'good': 0.9},
+        'model_name': 'Decision_Tree', 'model_version': 'v1', 'batch_id': 'b', 'scored_at': datetime.utcnow()
+    }])
+    db.session.commit()
+
+    for user_id in (1, 2, 3):
+        dashboard = build_dashboard(user_id)
+
+        sessions = db.session.scalars(
+            select(StudySession).where(StudySession.user_id == user_id)
+            .order_by(StudySession.start_time.desc(), StudySession.id.desc())
+        ).all()
+        questions = db.session.scalar(
+            select(func.count(Question.id)).join(StudySession)
+            .where(StudySession.user_id == user_id, Question.scored_expression())
+        )
+        progress = db.session.scalars(select(Progress).where(Progress.user_id == user_id)).all()
+        prediction = db.session.get(StudentPrediction, user_id)
+
+        assert dashboard['stats'] == {'total_sessions': len(sessions), 'total_questions': questions}
+        assert dashboard['recent_sessions'] == [s.to_dict() for s in sessions[:RECENT_SESSIONS]]
+        assert sorted(dashboard['progress'], key=lambda p: p['id']) == \
+            sorted((p.to_dict() for p in progress), key=lambda p: p['id'])
+        assert dashboard['prediction'] == (prediction.to_dict() if prediction else None)
+
+def test_entries_expire_after_ttl(db_app, monkeypatch):
+    seed_students(1)
+    clock = FakeClock()
+    monkeypatch.setattr(dashboard_module.time, 'monotonic', clock)
+    cache = DashboardCache(ttl=30)
+
+    cache.get(1)
+    clock.now += 29
+    cache.get(1)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    clock.now += 2
+    cache.get(1)
+    assert (cache.hits, cache.misses) == (1, 2)
+
+def test_result_built_before_a_concurrent_write_is_not_cached(db_app, monkeypatch):
+    seed_students(1)
+    cache = DashboardCache(ttl=30)
+    build = dashboard_module.build_dashboard
+
+    def build_with_concurrent_write(user_id, session=None):
+        result = build(user_id, session)
+        # Outra requisição grava e invalida enquanto esta consulta terminava
+        cache.invalidate(user_id)
+        return result
+
+    monkeypatch.setattr(dashboard_module, 'build_dashboard', build_with_concurrent_write)
+    cache.get(1)
+    monkeypatch.setattr(dashboard_module, 'build_dashboard', build)
+
+    cache.get(1)
+    assert (cache.hits, cache.misses) == (0, 2)
+    cache.get(1)
+    assert cache.hits == 1
+
+def test_write_through_the_api_invalidates_the_dashboard(api_app):
+    seed_students(1, sessions_per_student=1)
+    client, headers = api_app.test_client(), auth_headers(1)
+
+    before = client.get('/api/dashboard', headers=headers).get_json()
+    session_id = client.post('/api/sessions', headers=headers).get_json()['session']['id']
+    client.post(f'/api/sessions/{session_id}/questions', headers=headers,
+                json={'question_text': 'q', 'answer_text': 'a', 'user_answer': 'a'})
+    after = client.get('/api/dashboard', headers=headers).get_json()
+
+    assert after['stats']['total_sessions'] == before['stats']['total_sessions'] + 1
+    assert after['stats']['total_questions'] == before['stats']['total_questions'] + 1
+    assert after['recent_sessions'][0]['id'] == session_id
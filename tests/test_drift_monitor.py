@@ -0,0 +1,75 @@
+import os
+import time
+
+import numpy as np
+
+from database.drift_monitor import DriftMonitor, build_training_profile
+
+FEATURES = ['score', 'hours']
+
+def make_monitor(directory=None, **kwargs):
+    rng = np.random.default_rng(0)
+    profile = build_training_profile(rng.normal(size=(2000, 2)), FEATURES, {})
+    return DriftMonitor(profile, 'v1', directory, flush_interval=0, **kwargs)
+
+def test_few_observations_are_insufficient_data():
+    monitor = make_monitor()
+    monitor.observe(np.full((4, 2), 5.0))
+
+    report = monitor.report()
+
+    assert report['status'] == 'insufficient_data'
+    assert all(f['status'] == 'insufficient_data' for f in report['features'].values())
+
+def test_shifted_traffic_is_reported_as_drift():
+    monitor = make_monitor()
+    monitor.observe(np.random.default_rng(1).normal(loc=3.0, size=(500, 2)))
+
+    assert monitor.report()['status'] == 'drift'
+
+def test_only_buckets_inside_the_window_are_reported(tmp_path, monkeypatch):
+    monitor = make_monitor(str(tmp_path), window_seconds=3600, bucket_seconds=600)
+    stale = DriftMonitor(monitor.profile, 'v1', str(tmp_path), flush_interval=0,
+                         window_seconds=3600, bucket_seconds=600)
+
+    # Tráfego com drift gravado por outro worker há duas horas
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now - 7200)
+    stale.observe(np.random.default_rng(1).normal(loc=3.0, size=(500, 2)))
+    monkeypatch.setattr(time, 'time', lambda: now)
+    stale_files = os.listdir(tmp_path / 'v1')
+
+    monitor.observe(np.random.default_rng(2).normal(size=(500, 2)))
+    report = monitor.report()
+
+    assert report['observations'] == 500
+    assert report['status'] == 'ok'
+    assert not set(stale_files) & set(os.listdir(tmp_path / 'v1'))
+
+def test_flush_during_merge_does_not_count_observations_twice(tmp_path, monkeypatch):
+    monitor = make_monitor(str(tmp_path), window_seconds=3600, bucket_seconds=600)
+    monitor.flush_interval = float('inf')
+
+    # Observações em um bloco que fecha antes do relatório
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now - 600)
+    monitor.observe(np.ones((300, 2)))
+    monkeypatch.setattr(time, 'time', lambda: now)
+
+    # Outro thread grava e descarta o bloco fechado logo que merged() solta o lock
+    class FlushOnRelease:
+        def __init__(self, lock):
+            self.lock, self.pending = lock, True
+        def __enter__(self):
+            return self.lock.__enter__()
+        def __exit__(self, *exc):
+            self.lock.__exit__(*exc)
+            if self.pending:
+                self.pending = False
+                monitor.flush()
+
+    lock = monitor._lock
+    monitor._lock = FlushOnRelease(lock)
+    assert monitor.merged().count == 300
+    monitor._lock = lock
+    assert monitor.merged().count == 300
@@ -0,0 +1,86 @@
+import io
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+
+from database.config import db
+from database.feature_store import FeatureStore, FEATURE_STORE_FEATURES
+from database.ml_algorithms import train_from_feature_store
+from database.model_registry import ModelRegistry
+
+from database.question_import import QuestionImporter, QuestionImportError
+from models import StudySession, StudentFeatures
+
+from .helpers import seed_students, auth_headers
+
+def test_matrix_does_not_contain_the_target(db_app):
+    seed_students(20)
+    FeatureStore().rebuild()
+
+    _, X, scores = FeatureStore().load_matrix()
+
+    assert X.shape == (20, len(FEATURE_STORE_FEATURES))
+    assert 'accuracy_rate' not in FEATURE_STORE_FEATURES
+    assert 'hard_accuracy_rate' not in FEATURE_STORE_FEATURES
+    assert scores.min() >= 0 and scores.max() <= 100
+
+def test_train_from_feature_store_registers_feature_store_schema(db_app, tmp_path):
+    seed_students(200)
+    FeatureStore().rebuild()
+
+    _, version = train_from_feature_store(str(tmp_path / 'models'), cache_dir=None)
+
+    registry = ModelRegistry(str(tmp_path / 'models'))
+    schema = registry.get_manifest(version)['feature_schema']
+    assert registry.current_version() == version
+    assert schema['numerical_features'] == FEATURE_STORE_FEATURES
+    assert schema['categorical_features'] == {}
+
+def test_apply_session_adds_to_row_created_by_another_transaction(db_app):
+    seed_students(1, sessions_per_student=2)
+    first, second = db.session.scalars(select(StudySession).order_by(StudySession.id)).all()
+
+    # Outra requisição criou a linha do usuário (finalizando outra sessão)
+    other = create_engine(db.engine.url)
+    with other.begin() as connection:
+        connection.execute(insert(StudentFeatures.__table__), {
+            'user_id': first.user_id, **{column: 0 for column in StudentFeatures.AGGREGATE_COLUMNS}
+        })
+    other.dispose()
+
+    FeatureStore().apply_session(first)
+    FeatureStore().apply_session(second)
+    db.session.commit()
+
+    features = db.session.get(StudentFeatures, first.user_id)
+    assert features.sessions_count == 2
+    assert features.questions_count == first.questions_count + second.questions_count
+    assert features.score_sum == first.score + second.score
+
+def test_progress_refresh_creates_missing_row(db_app):
+    seed_students(1)
+    FeatureStore().refresh_progress(1)
+    FeatureStore().refresh_progress(1)
+    db.session.commit()
+
+    features = db.session.get(StudentFeatures, 1)
+    assert features.sessions_count == 0
+    assert features.progress_topics_count >= 1
+
+def test_questions_cannot_be_added_after_the_session_ended(api_app):
+    seed_students(1, sessions_per_student=1)
+    session = db.session.scalar(select(StudySession))
+    client = api_app.test_client()
+    headers = auth_headers(session.user_id)
+    question = {'question_text': 'q', 'answer_text': 'a', 'user_answer': 'a'}
+
+    response = client.post(f'/api/sessions/{session.id}/questions', json=question, headers=headers)
+    assert response.status_code == 409
+    response = client.post(f'/api/sessions/{session.id}/questions/bulk', json={'questions': [question]},
+                           headers=headers)
+    assert response.status_code == 409
+    with pytest.raises(QuestionImportError):
+        QuestionImporter(session.id).run(io.BytesIO(b'{"question_text": "q", "answer_text": "a"}\n'), 'jsonl')
+
+    db.session.expire_all()
+    assert db.session.get(StudySession, session.id).questions_count == session.questions_count
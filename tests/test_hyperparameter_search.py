@@ -0,0 +1,27 @@
+import numpy as np
+from sklearn.naive_bayes import GaussianNB
+from sklearn.tree import DecisionTreeClassifier
+
+from database.hyperparameter_search import FoldResultCache, SuccessiveHalvingSearch
+
+def test_fold_key_covers_base_estimator_and_seed():
+    key = lambda base, seed: FoldResultCache.make_key('Decision_Tree', {'max_depth': 4}, 'data', 100, 0, 5,
+                                                      base.get_params(), seed)
+
+    base = key(DecisionTreeClassifier(random_state=42), 42)
+    assert base == key(DecisionTreeClassifier(random_state=42), 42)
+    assert base != key(DecisionTreeClassifier(random_state=7), 42)
+    assert base != key(DecisionTreeClassifier(random_state=42, min_samples_split=4), 42)
+    assert base != key(DecisionTreeClassifier(random_state=42), 7)
+
+def test_search_with_a_rare_class_at_the_smallest_budget(tmp_path):
+    rng = np.random.default_rng(0)
+    y = np.repeat([0, 1, 2], [400, 400, 8])
+    X = (rng.normal(size=(len(y), 3)) + y[:, None]).astype(np.float32)
+
+    search = SuccessiveHalvingSearch(eta=3, min_resources=100, n_jobs=1,
+                                     cache=FoldResultCache(str(tmp_path)))
+    result = search.search('Naive_Bayes', GaussianNB(), {'var_smoothing': [1e-9, 1e-5]}, X, y, 'rare')
+
+    assert result['history'][0]['budget'] == 100
+    assert result['best_params']['var_smoothing'] in (1e-9, 1e-5)
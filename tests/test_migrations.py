@@ -0,0 +1,43 @@
+from sqlalchemy import create_engine, insert, inspect, text
+
+from database.config import db
+from models import User, Progress
+
+def make_legacy_database(path):
+    """Banco anterior ao índice único (user_id, topic), com tópicos duplicados."""
+    engine = create_engine(f"sqlite:///{path}")
+    db.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX idx_progress_user_topic"))
+        connection.execute(insert(User.__table__), [{'id': 1, 'username': 'a', 'email': 'a@x', 'password_hash': 'x'}])
+        connection.execute(insert(Progress.__table__), [
+            {'id': i, 'user_id': 1, 'topic': 'algebra', 'score': 10 * i} for i in (1, 2, 3)
+        ])
+    engine.dispose()
+
+def progress_ids():
+    return [row[0] for row in db.session.execute(text("SELECT id FROM progress ORDER BY id"))]
+
+def test_app_start_does_not_run_migrations(tmp_path, request, caplog):
+    make_legacy_database(tmp_path / 'api.db')
+
+    request.getfixturevalue('api_app')
+
+    assert progress_ids() == [1, 2, 3]
+    assert 'flask db-migrate' in caplog.text
+    assert 'idx_progress_user_topic' not in {i['name'] for i in inspect(db.engine).get_indexes('progress')}
+
+def test_db_migrate_keeps_removed_duplicates_in_a_backup_table(tmp_path, request):
+    make_legacy_database(tmp_path / 'api.db')
+    app = request.getfixturevalue('api_app')
+
+    result = app.test_cli_runner().invoke(args=['db-migrate'])
+    assert result.exit_code == 0, result.output
+
+    assert progress_ids() == [3]
+    backup = db.session.execute(text("SELECT id, score FROM progress_duplicates_0002 ORDER BY id")).all()
+    assert [tuple(row) for row in backup] == [(1, 10), (2, 20)]
+    assert 'idx_progress_user_topic' in {i['name'] for i in inspect(db.engine).get_indexes('progress')}
+
+    # Uma nova execução não tem nada a aplicar
+    assert '0 migrações aplicadas' in app.test_cli_runner().invoke(args=['db-migrate']).output
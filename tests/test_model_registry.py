@@ -0,0 +1,72 @@
+import os
+
+import numpy as np
+import pytest
+
+from database.model_registry import ModelRegistry, RegistryError
+
+def make_bundle(fingerprint, weights=None):
+    return {
+        'model_name': 'Decision Tree',
+        'model': {'weights': np.arange(1000, dtype=np.float32) if weights is None else weights},
+        'feature_schema': {'numerical_features': ['x'], 'categorical_features': {}},
+        'metrics': {'Decision Tree': {'accuracy': 0.9}},
+        'data_fingerprint': fingerprint
+    }
+
+@pytest.fixture
+def registry(tmp_path):
+    return ModelRegistry(str(tmp_path / 'registry'))
+
+def test_failed_register_leaves_no_partial_version(registry, monkeypatch):
+    import joblib
+
+    def failing_dump(*args, **kwargs):
+        raise OSError('disco cheio')
+
+    monkeypatch.setattr(joblib, 'dump', failing_dump)
+    with pytest.raises(OSError):
+        registry.register(make_bundle('aaaaaaaa'))
+
+    assert registry.list_versions() == []
+    assert [name for name in os.listdir(registry.root) if name.startswith('.tmp-')] == []
+
+def test_promote_and_rollback_switch_current(registry):
+    first = registry.register(make_bundle('aaaaaaaa'))
+    second = registry.register(make_bundle('bbbbbbbb'))
+    assert first != second
+    assert registry.current_version() is None
+
+    registry.promote(second)
+    assert registry.current_version() == second
+    assert registry.load()['version'] == second
+
+    # Rollback: promover de novo a versão anterior, que continua intacta
+    registry.promote(first)
+    assert registry.current_version() == first
+    assert registry.load()['version'] == first
+    assert [m['version'] for m in registry.list_versions()] == sorted([first, second], reverse=True)
+    assert [name for name in os.listdir(registry.root) if name.startswith('.CURRENT')] == []
+
+def test_promote_unknown_version_keeps_current(registry):
+    version = registry.register(make_bundle('aaaaaaaa'))
+    registry.promote(version)
+
+    with pytest.raises(RegistryError):
+        registry.promote('inexistente')
+    assert registry.current_version() == version
+
+def test_load_memory_maps_numpy_arrays(registry):
+    weights = np.linspace(0, 1, 5000, dtype=np.float32)
+    registry.promote(registry.register(make_bundle('aaaaaaaa', weights)))
+
+    loaded = registry.load()['model']['weights']
+    assert isinstance(loaded, np.memmap)
+    assert loaded.mode == 'r'
+    np.testing.assert_array_equal(loaded, weights)
+
+    assert not isinstance(registry.load(mmap_mode=None)['model']['weights'], np.memmap)
+
+def test_load_without_promoted_version_raises(registry):
+    with pytest.raises(RegistryError):
+        registry.load()
@@ -0,0 +1,53 @@
+import pytest
+
+from database.model_registry import ModelRegistry
+from database.model_server import ModelServer, ServingBundle, PredictionError, MicroBatcher
+from database.ml_algorithms import NUMERICAL_FEATURES
+
+def make_record(**overrides):
+    record = {feature: 50 for feature in NUMERICAL_FEATURES}
+    record.update(difficulty_preference='medium', learning_style='visual', age=20)
+    record.update(overrides)
+    return record
+
+@pytest.fixture
+def server(model_dir, tmp_path):
+    return ModelServer(model_dir, poll_interval=0, drift_dir=str(tmp_path / 'drift'))
+
+def test_predict_bulk_rejects_non_object_items(server):
+    with pytest.raises(PredictionError, match='registro 1'):
+        server.predict_bulk([make_record(), 1])
+
+def test_predict_rejects_non_object_record(server):
+    with pytest.raises(PredictionError):
+        server.predict(['not', 'a', 'record'])
+
+def test_single_and_bulk_latencies_are_tracked_separately(server):
+    server.predict(make_record())
+    result = server.predict_bulk([make_record() for _ in range(20)])
+
+    assert server.latency.percentiles()['samples'] == 1
+    assert server.bulk_latency.percentiles()['samples'] == 1
+    assert result['latency']['samples'] == 1
+
+def test_micro_batch_uses_the_bundle_that_validated_each_record(server, trained_pipeline):
+    registry = ModelRegistry(server.registry.root)
+    old = ServingBundle(registry.load())
+    new = ServingBundle(registry.load(trained_pipeline.save_models(registry.root)))
+
+    results = server._predict_batch([(old, make_record()), (new, make_record()), (old, make_record())])
+
+    assert [r['version'] for r in results] == [old.version, new.version, old.version]
+
+def test_micro_batcher_fails_requests_left_without_result():
+    # Devolve um resultado a menos em todo lote, qualquer que seja o agrupamento
+    batcher = MicroBatcher(lambda items: items[1:], max_batch_size=8, max_wait_ms=50)
+    futures = [batcher.submit(i) for i in range(3)]
+
+    outcomes = []
+    for future in futures:
+        try:
+            outcomes.append(future.result(timeout=5))
+        except RuntimeError:
+            outcomes.append('error')
+    assert outcomes.count('error') >= 1
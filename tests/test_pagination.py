@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from database.config import db
+from models import User, Progress
+
+from .helpers import auth_headers
+
+def test_following_next_cursor_returns_every_progress_row(api_app):
+    now = datetime.utcnow()
+    db.session.execute(insert(User.__table__), [{'id': 1, 'username': 'a', 'email': 'a@x', 'password_hash': 'x'}])
+    # Vários tópicos com o mesmo last_updated: o desempate é pelo id
+    db.session.execute(insert(Progress.__table__), [
+        {'user_id': 1, 'topic': f't{i}', 'score': i % 100, 'last_updated': now - timedelta(minutes=i // 3)}
+        for i in range(120)
+    ])
+    db.session.commit()
+    client, headers = api_app.test_client(), auth_headers(1)
+
+    topics, cursor, pages = [], None, 0
+    while True:
+        params = {'fields': 'topic,score'}
+        if cursor:
+            params['cursor'] = cursor
+        response = client.get('/api/progress', headers=headers, query_string=params)
+        assert response.status_code == 200
+        data = response.get_json()
+        topics += [item['topic'] for item in data['progress']]
+        assert all(set(item) == {'topic', 'score'} for item in data['progress'])
+        pages += 1
+        cursor = data['next_cursor']
+        if not cursor:
+            break
+
+    assert pages == 3
+    assert sorted(topics) == sorted(f't{i}' for i in range(120))
+
+def test_rows_without_last_updated_are_paged_last(api_app):
+    now = datetime.utcnow()
+    db.session.execute(insert(User.__table__), [{'id': 1, 'username': 'a', 'email': 'a@x', 'password_hash': 'x'}])
+    # Registros antigos sem last_updated, intercalados por id com os datados
+    db.session.execute(insert(Progress.__table__), [
+        {'user_id': 1, 'topic': f't{i}', 'score': 0,
+         'last_updated': None if i % 3 == 0 else now - timedelta(minutes=i)}
+        for i in range(30)
+    ])
+    db.session.commit()
+    client, headers = api_app.test_client(), auth_headers(1)
+
+    items, cursor = [], None
+    while True:
+        params = {'fields': 'topic,last_updated', 'limit': 4}
+        if cursor:
+            params['cursor'] = cursor
+        data = client.get('/api/progress', headers=headers, query_string=params).get_json()
+        items += data['progress']
+        cursor = data['next_cursor']
+        if not cursor:
+            break
+
+    topics = [item['topic'] for item in items]
+    assert sorted(topics) == sorted(f't{i}' for i in range(30))
+    assert len(topics) == len(set(topics))
+    nulls = [item['last_updated'] is None for item in items]
+    assert nulls == sorted(nulls)
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import LabelEncoder
+
+from database.ml_algorithms import EducationalMLPipeline, NUMERICAL_FEATURES, CATEGORICAL_FEATURES
+from database.preprocessing import FeatureEncoder
+
+def legacy_encode(df):
+    """Codificação anterior ao FeatureEncoder (cópia do DataFrame + LabelEncoder por coluna)."""
+    df_processed = df.copy()
+    encoders = {}
+    for feature in CATEGORICAL_FEATURES:
+        encoder = LabelEncoder()
+        df_processed[feature + '_encoded'] = encoder.fit_transform(df_processed[feature])
+        encoders[feature] = encoder
+    columns = NUMERICAL_FEATURES + [f + '_encoded' for f in CATEGORICAL_FEATURES]
+    return df_processed[columns].values, encoders
+
+@pytest.fixture(scope='module')
+def sample_df():
+    return EducationalMLPipeline().create_sample_educational_dataset(2000)
+
+def test_matches_legacy_encoding_for_object_columns(sample_df):
+    df = sample_df.astype({feature: object for feature in CATEGORICAL_FEATURES})
+    expected, _ = legacy_encode(df)
+
+    X = FeatureEncoder(NUMERICAL_FEATURES, CATEGORICAL_FEATURES).fit(df).transform(df)
+
+    assert X.dtype == np.float32 and X.flags['C_CONTIGUOUS']
+    np.testing.assert_array_equal(X[:, len(NUMERICAL_FEATURES):], expected[:, len(NUMERICAL_FEATURES):])
+    np.testing.assert_allclose(X, expected.astype(np.float64), rtol=1e-6)
+
+def test_category_dtype_uses_declared_order(sample_df):
+    encoder = FeatureEncoder(NUMERICAL_FEATURES, CATEGORICAL_FEATURES).fit(sample_df)
+    X = encoder.transform(sample_df)
+
+    for j, feature in enumerate(CATEGORICAL_FEATURES, start=len(NUMERICAL_FEATURES)):
+        assert encoder.categories_[feature] == list(sample_df[feature].cat.categories)
+        np.testing.assert_array_equal(X[:, j], sample_df[feature].cat.codes)
+
+    # Mesmas linhas sem o dtype category (ex.: registros da API) geram a mesma matriz
+    records = {feature: sample_df[feature].tolist() for feature in encoder.feature_names_}
+    np.testing.assert_array_equal(encoder.transform(records), X)
+
+def test_declared_category_unseen_at_fit_time_is_encoded(sample_df):
+    fit_df = sample_df[sample_df['difficulty_preference'] != 'hard']
+    assert 'hard' not in set(fit_df['difficulty_preference'])
+
+    encoder = FeatureEncoder(NUMERICAL_FEATURES, CATEGORICAL_FEATURES).fit(fit_df)
+    X = encoder.transform(sample_df[sample_df['difficulty_preference'] == 'hard'])
+
+    j = len(NUMERICAL_FEATURES)
+    assert (X[:, j] == encoder.categories_['difficulty_preference'].index('hard')).all()
+
+def test_unknown_category_raises_like_label_encoder(sample_df):
+    df = sample_df.astype({feature: object for feature in CATEGORICAL_FEATURES})
+    _, legacy = legacy_encode(df)
+    encoder = FeatureEncoder(NUMERICAL_FEATURES, CATEGORICAL_FEATURES).fit(df)
+
+    unseen = df.head(3).copy()
+    unseen.loc[unseen.index[1], 'learning_style'] = 'reading'
+
+    with pytest.raises(ValueError):
+        legacy['learning_style'].transform(unseen['learning_style'])
+    with pytest.raises(ValueError, match='learning_style'):
+        encoder.transform(unseen)
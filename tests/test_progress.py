@@ -0,0 +1,88 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import postgresql
+
+from database.config import db
+from models import Progress
+
+from .helpers import seed_students, auth_headers
+
+@pytest.fixture
+def user(api_app):
+    seed_students(1)
+    db.session.execute(text("DELETE FROM progress"))
+    db.session.commit()
+    return 1
+
+def committed_progress():
+    """Progresso visto por outra conexão (apenas o que foi commitado)."""
+    engine = create_engine(db.engine.url)
+    with engine.connect() as connection:
+        rows = connection.execute(text("SELECT id, topic, score FROM progress ORDER BY id")).all()
+    engine.dispose()
+    return [tuple(row) for row in rows]
+
+def test_upsert_keeps_the_id_of_an_existing_topic(user):
+    first = Progress.upsert_scores(user, {'algebra': 10, 'history': 20})
+    db.session.commit()
+    second = Progress.upsert_scores(user, {'algebra': 90, 'physics': 30})
+    db.session.commit()
+
+    ids = {p['topic']: p['id'] for p in first}
+    assert {p['topic']: p['id'] for p in second}['algebra'] == ids['algebra']
+    assert committed_progress()[:2] == [(ids['algebra'], 'algebra', 90), (ids['history'], 'history', 20)]
+    assert [row[1:] for row in committed_progress()] == [('algebra', 90), ('history', 20), ('physics', 30)]
+
+def test_generic_fallback_has_the_same_semantics(user, monkeypatch):
+    Progress.upsert_scores(user, {'algebra': 10})
+    db.session.commit()
+    algebra_id = committed_progress()[0][0]
+
+    monkeypatch.setattr(db.session, 'get_bind', lambda *args, **kwargs: SimpleNamespace(
+        dialect=SimpleNamespace(name='mysql')))
+    records = Progress.upsert_scores(user, {'algebra': 50, 'physics': 30})
+    monkeypatch.undo()
+    db.session.commit()
+
+    assert [(r['topic'], r['score']) for r in records] == [('algebra', 50), ('physics', 30)]
+    assert records[0]['id'] == algebra_id
+    assert [row[1:] for row in committed_progress()] == [('algebra', 50), ('physics', 30)]
+
+def test_postgresql_statement_upserts_and_returns_rows(user, monkeypatch):
+    captured = []
+
+    def execute(statement, *args, **kwargs):
+        captured.append(str(statement.compile(dialect=postgresql.dialect())))
+        return [SimpleNamespace(id=7, user_id=user, topic='algebra', score=90, last_updated=None)]
+
+    monkeypatch.setattr(db.session, 'get_bind', lambda *args, **kwargs: SimpleNamespace(
+        dialect=SimpleNamespace(name='postgresql')))
+    monkeypatch.setattr(db.session, 'execute', execute)
+    records = Progress.upsert_scores(user, {'algebra': 90})
+    monkeypatch.undo()
+
+    sql = ' '.join(captured[0].split())
+    assert 'ON CONFLICT (user_id, topic) DO UPDATE SET score = excluded.score' in sql
+    assert 'RETURNING progress.id' in sql
+    assert records == [{'id': 7, 'user_id': user, 'topic': 'algebra', 'score': 90, 'last_updated': None}]
+
+def test_bulk_endpoint_last_duplicate_topic_wins_and_commits(api_app, user):
+    client, headers = api_app.test_client(), auth_headers(user)
+
+    response = client.post('/api/progress/bulk', headers=headers, json={'progress': [
+        {'topic': 'algebra', 'score': 10}, {'topic': 'physics', 'score': 40}, {'topic': 'algebra', 'score': 70}
+    ]})
+    assert response.status_code == 200
+    assert [(p['topic'], p['score']) for p in response.get_json()['progress']] == [('algebra', 70), ('physics', 40)]
+    assert [row[1:] for row in committed_progress()] == [('algebra', 70), ('physics', 40)]
+
+def test_single_endpoint_updates_in_place_and_commits(api_app, user):
+    client, headers = api_app.test_client(), auth_headers(user)
+
+    created = client.post('/api/progress', headers=headers, json={'topic': 'algebra', 'score': 10}).get_json()
+    updated = client.post('/api/progress', headers=headers, json={'topic': 'algebra', 'score': 80}).get_json()
+
+    assert updated['progress']['id'] == created['progress']['id']
+    assert committed_progress() == [(created['progress']['id'], 'algebra', 80)]
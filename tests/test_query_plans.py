@@ -0,0 +1,30 @@
+import pytest
+
+from database.feature_store import FeatureStore
+
+from .helpers import seed_students, auth_headers
+
+@pytest.mark.parametrize('path', ['/api/sessions', '/api/progress', '/api/dashboard',
+                                  '/api/sessions?fields=id,score&limit=5'])
+def test_listing_endpoints_do_not_scan_tables(api_app, query_advisor, path):
+    seed_students(30, sessions_per_student=5)
+    FeatureStore().rebuild()
+    headers = auth_headers(7)
+    query_advisor.statements.clear()
+
+    query_advisor.label = path
+    response = api_app.test_client().get(path, headers=headers)
+
+    assert response.status_code == 200
+    assert query_advisor.statements
+    assert query_advisor.analyze() == []
+
+def test_advisor_reports_unindexed_filters(api_app, query_advisor):
+    from database.config import db
+    from models import Question
+
+    seed_students(2)
+    query_advisor.statements.clear()
+    db.session.query(Question).filter(Question.answer_text == 'a').all()
+
+    assert [finding['tables'] for finding in query_advisor.analyze()] == [['questions']]
@@ -0,0 +1,85 @@
+import io
+import json
+
+import pytest
+from sqlalchemy import insert, select, text, update
+
+from database.config import db
+from database.migrations import run_migrations
+from database.question_import import QuestionImporter, QuestionImportError
+from database.session_counters import reconcile_session_counters
+from models import StudySession, Question
+
+from .helpers import seed_students
+
+def _jsonl(records):
+    return io.BytesIO(''.join(json.dumps(r) + '\n' for r in records).encode())
+
+def _counters(session_id):
+    db.session.expire_all()
+    session = db.session.get(StudySession, session_id)
+    return session.questions_count, session.correct_count, session.score
+
+@pytest.fixture
+def empty_session(api_app):
+    seed_students(1, sessions_per_student=1)
+    session_id = db.session.scalar(select(StudySession.id))
+    db.session.execute(update(StudySession).values(questions_count=0, correct_count=0, score=0, end_time=None))
+    db.session.execute(Question.__table__.delete())
+    db.session.commit()
+    return session_id
+
+def test_unanswered_bank_questions_do_not_count_in_score(empty_session):
+    stats = QuestionImporter(empty_session).run(_jsonl([
+        {'question_text': 'q1', 'answer_text': 'a'},
+        {'question_text': 'q2', 'answer_text': 'b'},
+    ]), 'jsonl')
+
+    assert (stats['inserted'], stats['answered']) == (2, 0)
+    assert _counters(empty_session) == (0, 0, 0)
+
+    # A reconciliação usa o mesmo critério e não volta a contá-las
+    assert reconcile_session_counters()['mismatched'] == 0
+    assert _counters(empty_session) == (0, 0, 0)
+
+def test_answered_bank_questions_count_on_import_and_when_answered_later(empty_session):
+    QuestionImporter(empty_session).run(_jsonl([
+        {'question_text': 'q1', 'answer_text': 'a', 'user_answer': 'a'},
+        {'question_text': 'q2', 'answer_text': 'b', 'user_answer': 'x'},
+        {'question_text': 'q3', 'answer_text': 'c'},
+    ]), 'jsonl')
+    assert _counters(empty_session) == (2, 1, 50)
+
+    question = db.session.scalar(select(Question).where(Question.question_text == 'q3'))
+    question.check_answer('c')
+    db.session.commit()
+    assert _counters(empty_session) == (3, 2, 66)
+    assert reconcile_session_counters()['mismatched'] == 0
+
+def test_migration_removes_unanswered_bank_questions_from_counters(empty_session):
+    db.session.execute(insert(Question.__table__), [
+        {'session_id': empty_session, 'question_text': f'q{i}', 'answer_text': 'a',
+         'is_correct': i == 0, 'user_answer': 'a' if i == 0 else None, 'content_hash': f'h{i}'}
+        for i in range(4)
+    ])
+    # Contadores inflados pela versão anterior da importação
+    db.session.execute(update(StudySession).values(questions_count=4, correct_count=1, score=25))
+    db.session.execute(text("DELETE FROM schema_migrations WHERE version = '0004'"))
+    db.session.commit()
+
+    run_migrations(db.engine)
+    assert _counters(empty_session) == (1, 1, 100)
+
+def test_import_cli_reports_errors_without_traceback(api_app, empty_session, tmp_path):
+    path = tmp_path / 'bank.jsonl'
+    path.write_text(json.dumps({'question_text': 'q1', 'answer_text': 'a'}) + '\n')
+    runner = api_app.test_cli_runner()
+
+    result = runner.invoke(args=['import-questions', str(path), '--session-id', '999'])
+    assert result.exit_code == 1
+    assert 'Sessão 999 não encontrada' in result.output
+    assert result.exception is None or isinstance(result.exception, SystemExit)
+
+    result = runner.invoke(args=['import-questions', str(path), '--session-id', str(empty_session)])
+    assert result.exit_code == 0, result.output
+    assert '1 inseridas (0 respondidas)' in result.output
@@ -0,0 +1,62 @@
+from sqlalchemy import select, func
+
+from database.config import db
+from models import StudySession, Question
+
+from .helpers import seed_students, auth_headers, count_queries
+
+def open_session(client, headers):
+    return client.post('/api/sessions', headers=headers).get_json()['session']['id']
+
+def test_bulk_questions_report_invalid_items_and_insert_the_rest(api_app):
+    seed_students(1, sessions_per_student=0)
+    client, headers = api_app.test_client(), auth_headers(1)
+    session_id = open_session(client, headers)
+
+    response = client.post(f'/api/sessions/{session_id}/questions/bulk', headers=headers, json={'questions': [
+        {'question_text': 'q0', 'answer_text': 'a', 'user_answer': ' A '},
+        {'question_text': '', 'answer_text': 'a'},
+        'não é um objeto',
+        {'question_text': 'q3', 'answer_text': 'b', 'user_answer': 'x', 'topic': 'álgebra'},
+        {'question_text': 'q4', 'answer_text': 'c', 'user_answer': 42},
+        {'question_text': 'q5', 'answer_text': 'd', 'difficulty': 'x' * 51},
+        {'question_text': 'q6', 'answer_text': 'e'},
+    ]})
+
+    assert response.status_code == 201
+    data = response.get_json()
+    assert [e['index'] for e in data['errors']] == [1, 2, 4, 5]
+    assert [(q['index'], q['is_correct']) for q in data['questions']] == [(0, True), (3, False), (6, False)]
+    assert db.session.scalar(select(func.count(Question.id)).where(Question.session_id == session_id)) == 3
+
+def test_bulk_questions_without_valid_items_are_rejected(api_app):
+    seed_students(1, sessions_per_student=0)
+    client, headers = api_app.test_client(), auth_headers(1)
+    session_id = open_session(client, headers)
+
+    response = client.post(f'/api/sessions/{session_id}/questions/bulk', headers=headers,
+                           json={'questions': [{'question_text': 'q'}, 7]})
+
+    assert response.status_code == 400
+    assert [e['index'] for e in response.get_json()['errors']] == [0, 1]
+    db.session.expire_all()
+    assert db.session.get(StudySession, session_id).questions_count == 0
+
+def test_bulk_questions_use_one_insert_and_one_counter_update(api_app):
+    seed_students(1, sessions_per_student=0)
+    client, headers = api_app.test_client(), auth_headers(1)
+    session_id = open_session(client, headers)
+    questions = [{'question_text': f'q{i}', 'answer_text': 'a', 'user_answer': 'a' if i % 4 else 'b'}
+                 for i in range(100)]
+
+    with count_queries(db.engine) as statements:
+        response = client.post(f'/api/sessions/{session_id}/questions/bulk', headers=headers,
+                               json={'questions': questions})
+    assert response.status_code == 201
+
+    writes = [s.split()[0:3] for s in statements if s.lstrip().upper().startswith(('INSERT', 'UPDATE'))]
+    assert writes == [['INSERT', 'INTO', 'questions'], ['UPDATE', 'study_sessions', 'SET']]
+
+    db.session.expire_all()
+    session = db.session.get(StudySession, session_id)
+    assert (session.questions_count, session.correct_count, session.score) == (100, 75, 75)
@@ -0,0 +1,69 @@
+import pytest
+from sqlalchemy import select, func
+
+from .helpers import seed_students, auth_headers, count_queries
+
+@pytest.fixture
+def replicated_app(tmp_path, monkeypatch, request):
+    """API com o primário e duas réplicas em arquivos SQLite separados (réplicas vazias = atrasadas)."""
+    from database.config import DatabaseConfig, db
+    from database import routing
+
+    monkeypatch.setattr(DatabaseConfig, 'REPLICA_DATABASE_URIS',
+                        [f"sqlite:///{tmp_path / 'replica_0.db'}", f"sqlite:///{tmp_path / 'replica_1.db'}"])
+    monkeypatch.setattr(routing, '_recent_writes', {})
+    app = request.getfixturevalue('api_app')
+    for key in ('replica_0', 'replica_1'):
+        db.metadata.create_all(db.engines[key])
+    return app
+
+def _expire_write_window(user_id):
+    from database.routing import mark_user_write
+    mark_user_write(user_id, seconds=0)
+
+def test_read_after_write_goes_to_primary_then_replica(replicated_app):
+    client = replicated_app.test_client()
+    seed_students(1, sessions_per_student=0)
+    headers = auth_headers(1)
+
+    assert client.post('/api/sessions', headers=headers).status_code == 201
+
+    # Logo após a escrita: primário, que já tem a sessão
+    response = client.get('/api/sessions', headers=headers)
+    assert len(response.get_json()['sessions']) == 1
+
+    # Fora da janela: a réplica (vazia) responde
+    _expire_write_window(1)
+    response = client.get('/api/sessions', headers=headers)
+    assert response.get_json()['sessions'] == []
+
+def test_replica_is_chosen_once_per_request(replicated_app):
+    from flask_jwt_extended import verify_jwt_in_request
+    from database.config import db
+    from database.routing import read_only
+    from models import StudySession
+
+    @read_only
+    def view():
+        return [db.session.scalar(select(func.count(StudySession.id))) for _ in range(3)]
+
+    engines = [db.engines['replica_0'], db.engines['replica_1']]
+    for _ in range(4):
+        with count_queries(engines[0]) as first, count_queries(engines[1]) as second:
+            with replicated_app.test_request_context(headers=auth_headers(1)):
+                verify_jwt_in_request()
+                assert view() == [0, 0, 0]
+        # As três leituras da requisição usam uma só réplica
+        assert sorted([len(first), len(second)]) == [0, 3]
+        # Depois da requisição, a sessão volta ao primário
+        assert 'replica' not in db.session.info
+
+def test_dashboard_is_built_on_primary(replicated_app):
+    client = replicated_app.test_client()
+    seed_students(1, sessions_per_student=2)
+    headers = auth_headers(1)
+    _expire_write_window(1)
+
+    # Fora da janela de escrita, o cache ainda é montado a partir do primário
+    response = client.get('/api/dashboard', headers=headers)
+    assert response.get_json()['stats']['total_sessions'] == 2
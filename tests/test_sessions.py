@@ -0,0 +1,85 @@
+from sqlalchemy import insert, inspect, text
+
+from database.config import db
+from database.migrations import run_migrations
+from models import Question
+
+from .helpers import seed_students, auth_headers, count_queries
+
+def test_session_listing_query_count_does_not_grow_with_sessions(api_app):
+    seed_students(1, sessions_per_student=1)
+    seed_students(1, sessions_per_student=40, seed=1, first_user_id=2)
+    client = api_app.test_client()
+
+    counts = {}
+    for user_id, expected_sessions in ((1, 1), (2, 40)):
+        headers = auth_headers(user_id)
+        with count_queries(db.engine) as statements:
+            response = client.get('/api/sessions', headers=headers)
+        assert response.status_code == 200
+        sessions = response.get_json()['sessions']
+        assert len(sessions) == expected_sessions
+        assert all(s['questions_count'] >= 5 for s in sessions)
+        counts[user_id] = len(statements)
+
+    assert counts[1] == counts[2] > 0
+
+def test_migration_adds_and_backfills_counters_on_existing_databases(tmp_path):
+    from sqlalchemy import create_engine
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    db.metadata.create_all(engine)
+    with engine.begin() as connection:
+        # Schema anterior aos contadores
+        connection.execute(text("ALTER TABLE study_sessions DROP COLUMN questions_count"))
+        connection.execute(text("ALTER TABLE study_sessions DROP COLUMN correct_count"))
+        connection.execute(text("INSERT INTO users (id, username, email, password_hash) VALUES (1, 'a', 'a@x', 'x')"))
+        connection.execute(text("INSERT INTO study_sessions (id, user_id, start_time, score) "
+                                "VALUES (1, 1, CURRENT_TIMESTAMP, 0)"))
+        connection.execute(insert(Question.__table__), [
+            {'session_id': 1, 'question_text': f'q{i}', 'answer_text': 'a', 'is_correct': i < 3}
+            for i in range(4)
+        ])
+
+    run_migrations(engine)
+
+    assert {'questions_count', 'correct_count'} <= {c['name'] for c in inspect(engine).get_columns('study_sessions')}
+    with engine.connect() as connection:
+        row = connection.execute(text("SELECT questions_count, correct_count, score FROM study_sessions")).one()
+    assert tuple(row) == (4, 3, 75)
+
+def test_ending_a_session_keeps_counters_written_concurrently(api_app):
+    from sqlalchemy import create_engine, select
+    from models import StudySession, StudentFeatures
+
+    client = api_app.test_client()
+    seed_students(1, sessions_per_student=0)
+    headers = auth_headers(1)
+    session_id = client.post('/api/sessions', headers=headers).get_json()['session']['id']
+    client.post(f'/api/sessions/{session_id}/questions', headers=headers,
+                json={'question_text': 'q', 'answer_text': 'a', 'user_answer': 'a'})
+
+    # A requisição de finalização carrega a sessão com 1 pergunta (100%)...
+    session = db.session.get(StudySession, session_id)
+    assert (session.questions_count, session.score) == (1, 100)
+
+    # ...enquanto outra requisição grava uma resposta errada
+    other = create_engine(db.engine.url)
+    with other.begin() as connection:
+        connection.execute(text("UPDATE study_sessions SET questions_count = 2, score = 50 WHERE id = :id"),
+                           {'id': session_id})
+    other.dispose()
+
+    assert session.end_session() is True
+    db.session.commit()
+    assert session.end_session() is False
+
+    row = db.session.execute(
+        select(StudySession.questions_count, StudySession.correct_count, StudySession.score)
+        .where(StudySession.id == session_id)
+    ).one()
+    assert tuple(row) == (2, 1, 50)
+
+    response = client.put(f'/api/sessions/{session_id}/end', headers=headers)
+    assert response.get_json()['session']['score'] == 50
+    assert db.session.get(StudentFeatures, 1) is None
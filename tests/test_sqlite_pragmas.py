@@ -0,0 +1,40 @@
+from sqlalchemy import create_engine, text
+
+from database.config import db, apply_sqlite_pragmas, DatabaseConfig
+
+def read_pragmas(engine):
+    with engine.connect() as connection:
+        return {name: connection.execute(text(f"PRAGMA {name}")).scalar()
+                for name in ('journal_mode', 'busy_timeout', 'synchronous')}
+
+def test_app_connections_use_the_concurrency_profile(api_app):
+    # Descarta o pool: a leitura é feita em uma conexão nova
+    db.engine.dispose()
+
+    assert read_pragmas(db.engine) == {
+        'journal_mode': 'wal',
+        'busy_timeout': DatabaseConfig.SQLITE_PRAGMAS['busy_timeout'],
+        'synchronous': 1  # NORMAL
+    }
+
+def test_pragmas_are_applied_to_every_new_connection(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'x.db'}")
+    apply_sqlite_pragmas(engine, {'journal_mode': 'WAL', 'busy_timeout': 1234, 'synchronous': 'NORMAL'})
+
+    connections = [engine.connect() for _ in range(2)]
+    try:
+        for connection in connections:
+            assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+            assert connection.execute(text("PRAGMA journal_mode")).scalar() == 'wal'
+    finally:
+        for connection in connections:
+            connection.close()
+        engine.dispose()
+
+def test_default_engine_without_profile_keeps_sqlite_defaults(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'y.db'}")
+    pragmas = read_pragmas(engine)
+    engine.dispose()
+
+    assert pragmas['journal_mode'] == 'delete'
+    assert pragmas['synchronous'] == 2  # FULL